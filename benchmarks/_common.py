@@ -0,0 +1,80 @@
+"""
+Shared helpers for the stand-alone benchmark scripts in this folder.
+
+The scripts are run directly (``python benchmarks/bench_fetch.py``) and are
+not collected by pytest.  Everything here works offline.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from typing import Callable, Iterator, Sequence
+
+from tabulate import tabulate
+
+AMINO_ACIDS = "ACDEFGHIKLMNPQRSTVWY"
+
+
+def synthetic_sequences(
+    n: int, length: tuple[int, int] = (150, 2000), seed: int = 0
+) -> Iterator[str]:
+    """Yield *n* random protein sequences with lengths drawn from *length*."""
+    rng = random.Random(seed)
+    for _ in range(n):
+        yield "".join(rng.choices(AMINO_ACIDS, k=rng.randint(*length)))
+
+
+def best_of(fn: Callable[[], object], repeat: int = 3) -> float:
+    """Return the fastest wall-clock time (seconds) of *repeat* calls."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def print_table(rows: Sequence[dict], title: str) -> None:
+    print(f"\n{title}")
+    print(tabulate(rows, headers="keys", floatfmt=".3f"))
+
+
+def synthetic_records(
+    n: int,
+    length: tuple[int, int] = (150, 2000),
+    mutation_rate: float = 0.1,
+    seed: int = 0,
+):
+    """
+    Return a Human reference followed by *n* species mutated from it.
+
+    Each species mutates a *mutation_rate* share of the positions of one
+    reference (length drawn from *length*): mostly substitutions, some
+    insertions and deletions.  Distances and masks therefore look like those
+    of real orthologues rather than of unrelated random strings.
+    """
+    from species_similarity.config import SequenceRecord, Species
+
+    rng = random.Random(seed)
+    (reference,) = synthetic_sequences(1, length, seed)
+    records = [SequenceRecord(Species("Human", "Homo sapiens", 9606), reference)]
+    for i in range(n):
+        # Only the mutated positions are visited, so 10^5 × 2000 stays fast
+        hits = sorted(
+            rng.sample(range(len(reference)), int(mutation_rate * len(reference)))
+        )
+        out, pos = [], 0
+        for hit in hits:
+            out.append(reference[pos:hit])
+            roll = rng.random()
+            if roll < 0.8:  # substitution
+                out.append(rng.choice(AMINO_ACIDS))
+            elif roll < 0.9:  # insertion
+                out += (reference[hit], rng.choice(AMINO_ACIDS))
+            # else: deletion
+            pos = hit + 1
+        out.append(reference[pos:])
+        species = Species(f"Species {i}", f"Genus species{i}", 100000 + i)
+        records.append(SequenceRecord(species, "".join(out)))
+    return records
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""
+HTML diff colorisation: one span per mismatch vs. merged runs in a batch.
+
+The baseline aligns every sequence and wraps each mismatched character in
+its own ``<span>``, as `diff.html_colorise` did before runs were merged.
+The batched call reuses masks that were computed once (as the pipeline
+stores them in the ``different`` column).
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+
+from _common import AMINO_ACIDS, best_of, print_table, synthetic_sequences
+
+from species_similarity import diff
+from species_similarity.similarity import difference_mask
+
+
+def _per_char(sequence: str, reference: str) -> str:
+    mask = difference_mask(reference, sequence)
+    return "".join(
+        f'<span style="color:red">{c}</span>' if bit == "1" else c
+        for c, bit in zip(sequence, mask)
+    )
+
+
+def _mutate(seq: str, rate: float, rng: random.Random) -> str:
+    return "".join(rng.choice(AMINO_ACIDS) if rng.random() < rate else c for c in seq)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sequences", type=int, default=500)
+    parser.add_argument("--length", type=int, default=500)
+    parser.add_argument("--rates", default="0.05,0.3,0.7")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    (reference,) = synthetic_sequences(1, (args.length, args.length))
+    rows = []
+    for rate in (float(r) for r in args.rates.split(",")):
+        seqs = [_mutate(reference, rate, rng) for _ in range(args.sequences)]
+        masks = [difference_mask(reference, s) for s in seqs]
+        old = [_per_char(s, reference) for s in seqs]
+        new = diff.html_colorise_many(seqs, reference, masks)
+        loop = best_of(lambda: [_per_char(s, reference) for s in seqs], args.repeat)
+        align = best_of(lambda: diff.html_colorise_many(seqs, reference), args.repeat)
+        reuse = best_of(
+            lambda: diff.html_colorise_many(seqs, reference, masks), args.repeat
+        )
+        rows.append(
+            {
+                "mutation rate": rate,
+                "per-char s": loop,
+                "batched s": align,
+                "batched (masks) s": reuse,
+                "per-char MB": sum(map(len, old)) / 1e6,
+                "merged MB": sum(map(len, new)) / 1e6,
+            }
+        )
+    print_table(rows, f"Colorising {args.sequences} sequences of length {args.length}")
+
+
+if __name__ == "__main__":
+    main()
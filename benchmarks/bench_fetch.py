@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""
+Sequential vs. prefetching UniProt pagination against a local stub server.
+
+The stub answers every page after a fixed delay, mimicking the round-trip
+to rest.uniprot.org, and serves realistic JSON pages so parsing and writing
+the records to disk cost about as much as one request.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from _common import best_of, print_table, synthetic_sequences
+
+from species_similarity import config, fetch, pipeline
+
+
+def _make_server(pages: int, page_size: int, latency: float) -> ThreadingHTTPServer:
+    rows = [
+        {
+            "organism": {
+                "commonName": f"Species {i}",
+                "scientificName": f"Genus species{i}",
+                "taxonId": i,
+            },
+            "sequence": {"value": seq, "length": len(seq)},
+        }
+        for i, seq in enumerate(synthetic_sequences(page_size, (300, 600)))
+    ]
+    body = json.dumps({"results": rows}).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:  # noqa: N802 - http.server API
+            params = parse_qs(urlsplit(self.path).query)
+            cursor = int(params.get("cursor", ["0"])[0])
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            if cursor + 1 < pages:
+                host, port = self.server.server_address[:2]
+                query = params["query"][0]
+                nxt = f"http://{host}:{port}/search?query={query}&cursor={cursor + 1}"
+                self.send_header("Link", f'<{nxt}>; rel="next"')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    return ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    httpd = _make_server(args.pages, args.page_size, args.latency)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    host, port = httpd.server_address[:2]
+    fetch.UNIPROT_URL = f"http://{host}:{port}/search"
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        # The HTTP cache is installed under DATA_RAW on the first fetch; keep
+        # the synthetic pages out of the real UniProt cache.
+        config.DATA_RAW = Path(tmp) / "raw"
+        out = Path(tmp) / "records.csv"
+        for prefetch in (0, 1, 2, 4):
+
+            def run() -> None:
+                # A fresh query per call keeps requests_cache out of the way.
+                gene = uuid.uuid4().hex
+                pipeline._save_records(
+                    fetch.iter_gene_sequences(gene, args.page_size, prefetch), out
+                )
+
+            rows.append({"prefetch": prefetch, "seconds": best_of(run, args.repeat)})
+    httpd.shutdown()
+
+    baseline = rows[0]["seconds"]
+    for row in rows:
+        row["speedup"] = baseline / row["seconds"]
+    print_table(
+        rows,
+        f"{args.pages} pages × {args.page_size} records, "
+        f"{args.latency * 1000:.0f} ms simulated latency",
+    )
+
+
+if __name__ == "__main__":
+    main()
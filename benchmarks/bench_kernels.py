@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+"""
+Reference-vs-many Hamming distance: per-pair Python loop vs. NumPy kernel.
+
+The baseline is the generator expression `similarity.hamming` used before
+the vectorised kernels existed.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from _common import best_of, print_table, synthetic_sequences
+
+from species_similarity import kernels
+
+
+def _python_hamming(a: str, b: str) -> int:
+    return sum(c1 != c2 for c1, c2 in zip(a, b))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--length", type=int, default=150)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = []
+    for n in (int(s) for s in args.sizes.split(",")):
+        seqs = list(synthetic_sequences(n + 1, (args.length, args.length)))
+        ref, seqs = seqs[0], seqs[1:]
+        loop = best_of(lambda: [_python_hamming(ref, s) for s in seqs], args.repeat)
+        encoded = kernels.encode(seqs)
+        vec = best_of(lambda: kernels.hamming_many(ref, seqs), args.repeat)
+        pre = best_of(lambda: kernels.hamming_many(ref, encoded), args.repeat)
+        rows.append(
+            {
+                "sequences": n,
+                "python s": loop,
+                "numpy s": vec,
+                "numpy (pre-encoded) s": pre,
+                "speedup": loop / vec,
+            }
+        )
+    print_table(rows, f"Hamming distance to one reference, length {args.length}")
+
+
+if __name__ == "__main__":
+    main()
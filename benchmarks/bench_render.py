@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""
+Concentric report layout: grouped per-row loop vs. vectorised NumPy columns.
+
+The baseline is the ``groupby(...).apply(to_dict)`` + ``math.cos``/``sin``
+loop `render._prepare_positions` used before the layout was vectorised.
+Full renders (layout + streamed template) are timed as well.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+from _common import best_of, print_table
+
+from species_similarity import render
+
+
+def _frame(n: int, max_distance: int = 150, seed: int = 0) -> pd.DataFrame:
+    rng = random.Random(seed)
+    return pd.DataFrame(
+        {
+            "name": ["Human"] + [f"Species {i}" for i in range(n)],
+            "hamming_distance": [0] + [rng.randint(1, max_distance) for _ in range(n)],
+            "image_url": ["N/A"] * (n + 1),
+        }
+    )
+
+
+def _loop_positions(df: pd.DataFrame, size: int, ring_spacing: int) -> list[dict]:
+    others = df.loc[df["name"].str.lower() != "human"]
+    rings = (
+        others.groupby("hamming_distance", sort=True)
+        .apply(lambda g: g.to_dict("records"), include_groups=False)
+        .to_dict()
+    )
+    centre = size / 2
+    out = []
+    for ring_idx, (dist, rows) in enumerate(rings.items(), start=1):
+        radius = ring_idx * ring_spacing
+        step = 360 / len(rows)
+        for i, row in enumerate(rows):
+            rad = math.radians(i * step)
+            row.update(
+                {
+                    "x": centre + radius * math.cos(rad),
+                    "y": centre + radius * math.sin(rad),
+                    "dist": dist,
+                }
+            )
+            out.append(row)
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp) / "report.html"
+        for n in (int(s) for s in args.sizes.split(",")):
+            df = _frame(n)
+            loop = best_of(lambda: _loop_positions(df, 800, 120), args.repeat)
+            vec = best_of(
+                lambda: list(render._prepare_positions(df, 800, 120)[1]), args.repeat
+            )
+            full = best_of(lambda: render.render_concentric(df, out), args.repeat)
+            rows.append(
+                {
+                    "species": n,
+                    "loop s": loop,
+                    "numpy s": vec,
+                    "speedup": loop / vec,
+                    "full render s": full,
+                    "html MB": out.stat().st_size / 1e6,
+                }
+            )
+    print_table(rows, "Concentric layout of the close-species report")
+
+
+if __name__ == "__main__":
+    main()
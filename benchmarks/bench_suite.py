@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+"""
+Benchmark suite for the similarity, rendering and I/O hot paths.
+
+Every case runs on synthetic protein sets (see `_common.synthetic_records`)
+for each combination of ``--sizes`` and ``--lengths``, and the timings are
+stored as JSON (with the git commit and library versions) so runs can be
+compared across commits::
+
+    python benchmarks/bench_suite.py --output before.json
+    git checkout feature && python benchmarks/bench_suite.py --compare before.json
+
+Nothing touches the network: the end-to-end ``pipeline.run`` case replaces
+the UniProt fetch and iNaturalist lookups with stubs and keeps every cache
+in a temporary directory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from importlib.metadata import version
+from pathlib import Path
+from typing import Callable
+from unittest import mock
+
+import networkx as nx
+import pandas as pd
+from _common import best_of, print_table, synthetic_records
+
+from species_similarity import config, diff, layout, nx_vis, pipeline
+from species_similarity.cache import KeyValueCache
+from species_similarity.render import render_concentric
+from species_similarity.similarity import compute_distances, difference_mask
+
+HERE = Path(__file__).resolve().parent
+RESULTS = HERE / "results"
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=HERE,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _frame(records, dists) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "name": [r.species.common_name for r in records],
+            "hamming_distance": dists,
+            "image_url": "N/A",
+        }
+    )
+
+
+def _run_offline(records, tmp: Path) -> None:
+    """`pipeline.run` end to end with fetch and images stubbed, in *tmp*."""
+    tmp.mkdir()
+    with ExitStack() as stack:
+        patch = stack.enter_context
+        patch(mock.patch.object(config, "DATA_RAW", tmp))
+        patch(mock.patch.object(pipeline, "DATA_PROCESSED", tmp))
+        patch(mock.patch.object(pipeline, "GRAPH_JSON", tmp / "force.json"))
+        patch(mock.patch.object(pipeline, "iter_gene_sequences", lambda _: records))
+        patch(
+            mock.patch.object(
+                pipeline, "image_urls", lambda names, **_: {n: None for n in names}
+            )
+        )
+        patch(
+            mock.patch.object(pipeline, "cache_stats", lambda: {"hits": 0, "misses": 0})
+        )
+        alignments = KeyValueCache(
+            tmp / "alignments.sqlite", ttl=None, negative_ttl=None
+        )
+        patch(mock.patch.object(pipeline, "_alignment_cache", lambda: alignments))
+        pipeline.run(gene="BENCH", csv_all=tmp / "all.csv", csv_close=tmp / "close.csv")
+
+
+def _cases(records, tmp: Path) -> dict[str, Callable[[], object]]:
+    ref = records[0].sequence
+    seqs = [r.sequence for r in records[1:]]
+    dists = [d for _, d in compute_distances(records)]
+    masks = [difference_mask(ref, s) for s in seqs]
+    df = _frame(records, dists)
+    graph = pipeline.build_distance_graph(zip(records, dists))
+    pos = layout.radial_layout(graph, "Human")
+    store = tmp / "records.csv"
+    pipeline._save_records(records, store)
+    runs = iter(range(10**6))
+
+    return {
+        "compute_distances": lambda: compute_distances(records),
+        "difference_mask": lambda: [difference_mask(ref, s) for s in seqs],
+        "html_colorise": lambda: [diff.html_colorise(s, ref) for s in seqs],
+        "html_colorise_many (masks)": lambda: diff.html_colorise_many(seqs, ref, masks),
+        "_save_records": lambda: pipeline._save_records(records, store),
+        "_load_records": lambda: pipeline._load_records(store),
+        "render_concentric": lambda: render_concentric(df, tmp / "report.html"),
+        "nx_vis.render_html": lambda: nx_vis.render_html(
+            graph, tmp / "graph.html", pos=pos
+        ),
+        "pipeline.run (offline)": lambda: _run_offline(
+            records, tmp / f"run{next(runs)}"
+        ),
+    }
+
+
+def _compare(rows: list[dict], baseline: Path) -> list[dict]:
+    base = {
+        (r["case"], r["sequences"], r["length"]): r["seconds"]
+        for r in json.loads(baseline.read_text(encoding="utf-8"))["results"]
+    }
+    for row in rows:
+        before = base.get((row["case"], row["sequences"], row["length"]))
+        row["baseline s"] = before
+        row["speedup"] = before / row["seconds"] if before else None
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", default="100,1000,10000")
+    parser.add_argument("--lengths", default="150,2000")
+    parser.add_argument("--mutation-rate", type=float, default=0.1)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--cases", help="Comma-separated subset of case names")
+    parser.add_argument(
+        "--output", type=Path, help="JSON file (default: results/<commit>.json)"
+    )
+    parser.add_argument("--compare", type=Path, help="Earlier JSON to compare to")
+    args = parser.parse_args()
+
+    commit = _git_commit()
+    wanted = set(args.cases.split(",")) if args.cases else None
+    rows = []
+    for length in (int(s) for s in args.lengths.split(",")):
+        for n in (int(s) for s in args.sizes.split(",")):
+            records = synthetic_records(n, (length, length), args.mutation_rate)
+            with tempfile.TemporaryDirectory() as tmp:
+                for case, fn in _cases(records, Path(tmp)).items():
+                    if wanted and case not in wanted:
+                        continue
+                    seconds = best_of(fn, args.repeat)
+                    rows.append(
+                        {
+                            "case": case,
+                            "sequences": n,
+                            "length": length,
+                            "seconds": seconds,
+                            "per_seq_us": seconds / n * 1e6,
+                        }
+                    )
+                    print(f"{case:>28}  n={n:<7} L={length:<5} {seconds:.3f}s")
+
+    output = args.output or RESULTS / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    meta = {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "versions": {
+            lib: version(lib) for lib in ("numpy", "pandas", "rapidfuzz", "jinja2")
+        },
+        "networkx": nx.__version__,
+        "args": {k: str(v) for k, v in vars(args).items()},
+    }
+    output.write_text(
+        json.dumps({"meta": meta, "results": rows}, indent=2), encoding="utf-8"
+    )
+
+    if args.compare:
+        rows = _compare(rows, args.compare)
+    print_table(rows, f"Benchmark suite @ {commit} → {output}")
+
+
+if __name__ == "__main__":
+    main()
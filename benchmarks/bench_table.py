@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+"""
+Memory footprint of list[SequenceRecord] vs. SequenceTable.
+
+Both containers are built from the same synthetic record stream while
+``tracemalloc`` tracks the bytes that remain allocated afterwards.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import tracemalloc
+from typing import Callable
+
+from _common import print_table, synthetic_sequences
+
+from species_similarity.config import SequenceRecord, Species
+from species_similarity.table import SequenceTable
+
+
+def _records(n: int, length: tuple[int, int]):
+    for i, seq in enumerate(synthetic_sequences(n, length)):
+        yield SequenceRecord(Species(f"Species {i}", f"Genus species{i}", i), seq)
+
+
+def _retained_mb(build: Callable[[], object]) -> float:
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return current / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="10000,100000")
+    parser.add_argument("--min-length", type=int, default=150)
+    parser.add_argument("--max-length", type=int, default=400)
+    args = parser.parse_args()
+    length = (args.min_length, args.max_length)
+
+    rows = []
+    for n in (int(s) for s in args.sizes.split(",")):
+        as_list = _retained_mb(lambda: list(_records(n, length)))
+        as_table = _retained_mb(lambda: SequenceTable.from_records(_records(n, length)))
+        rows.append(
+            {
+                "records": n,
+                "list MB": as_list,
+                "table MB": as_table,
+                "saving": 1 - as_table / as_list,
+            }
+        )
+    print_table(rows, f"Retained memory, sequence length {length[0]}–{length[1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+// Canvas renderer for the binary graph written by graph_export.write_binary.
+// Positions are precomputed in Python, so there is no simulation here: the
+// typed arrays are viewed straight out of the response buffer and drawn in
+// two batched paths (edges, then nodes).  Wheel zooms, drag pans.
+// Load another gene with ?graph=<GENE>_force.bin
+
+var canvas = document.querySelector("canvas"),
+    ctx = canvas.getContext("2d"),
+    tooltip = document.getElementById("tooltip"),
+    file = new URLSearchParams(location.search).get("graph") || "force.bin";
+
+var graph = null,
+    view = {scale: 1, x: 0, y: 0},
+    radius = 3,
+    pending = false;
+
+function parse(buffer) {
+    var header = new Uint32Array(buffer, 0, 5),
+        magic = String.fromCharCode.apply(null, new Uint8Array(buffer, 0, 4));
+    if (magic !== "SPGB" || header[1] !== 1) throw new Error("Unsupported graph file");
+    var n = header[2], e = header[3], labelLength = header[4], offset = 20;
+    var positions = new Float32Array(buffer, offset, 2 * n);
+    offset += positions.byteLength;
+    var edges = new Uint32Array(buffer, offset, 2 * e);
+    offset += edges.byteLength;
+    var weights = new Float32Array(buffer, offset, e);
+    offset += weights.byteLength;
+    var labels = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, offset, labelLength)));
+    return {n: n, e: e, positions: positions, edges: edges, weights: weights, labels: labels};
+}
+
+function fit() {
+    var p = graph.positions, minX = Infinity, minY = Infinity, maxX = -Infinity, maxY = -Infinity;
+    for (var i = 0; i < p.length; i += 2) {
+        minX = Math.min(minX, p[i]); maxX = Math.max(maxX, p[i]);
+        minY = Math.min(minY, p[i + 1]); maxY = Math.max(maxY, p[i + 1]);
+    }
+    var pad = 20;
+    view.scale = Math.min((canvas.width - 2 * pad) / (maxX - minX || 1),
+                          (canvas.height - 2 * pad) / (maxY - minY || 1));
+    view.x = pad - minX * view.scale + (canvas.width - 2 * pad - (maxX - minX) * view.scale) / 2;
+    view.y = pad - minY * view.scale + (canvas.height - 2 * pad - (maxY - minY) * view.scale) / 2;
+}
+
+function draw() {
+    pending = false;
+    var p = graph.positions, edges = graph.edges, s = view.scale, ox = view.x, oy = view.y;
+    ctx.clearRect(0, 0, canvas.width, canvas.height);
+
+    ctx.beginPath();
+    for (var k = 0; k < edges.length; k += 2) {
+        var a = 2 * edges[k], b = 2 * edges[k + 1];
+        ctx.moveTo(p[a] * s + ox, p[a + 1] * s + oy);
+        ctx.lineTo(p[b] * s + ox, p[b + 1] * s + oy);
+    }
+    ctx.strokeStyle = "rgba(158, 202, 225, 0.6)";
+    ctx.lineWidth = 0.5;
+    ctx.stroke();
+
+    ctx.beginPath();
+    for (var i = 0; i < p.length; i += 2) {
+        var x = p[i] * s + ox, y = p[i + 1] * s + oy;
+        ctx.moveTo(x + radius, y);
+        ctx.arc(x, y, radius, 0, 2 * Math.PI);
+    }
+    ctx.fillStyle = "#ff3399";
+    ctx.fill();
+}
+
+function redraw() {
+    if (!pending) {
+        pending = true;
+        requestAnimationFrame(draw);
+    }
+}
+
+function nearest(mx, my) {
+    var p = graph.positions, best = -1, bestD = (radius + 2) * (radius + 2);
+    for (var i = 0; i < p.length; i += 2) {
+        var dx = p[i] * view.scale + view.x - mx, dy = p[i + 1] * view.scale + view.y - my,
+            d = dx * dx + dy * dy;
+        if (d < bestD) { bestD = d; best = i / 2; }
+    }
+    return best;
+}
+
+var drag = null;
+
+canvas.addEventListener("mousedown", function (event) {
+    drag = {x: event.offsetX - view.x, y: event.offsetY - view.y};
+});
+window.addEventListener("mouseup", function () { drag = null; });
+canvas.addEventListener("mousemove", function (event) {
+    if (!graph) return;
+    if (drag) {
+        view.x = event.offsetX - drag.x;
+        view.y = event.offsetY - drag.y;
+        tooltip.style.display = "none";
+        redraw();
+        return;
+    }
+    var i = nearest(event.offsetX, event.offsetY);
+    if (i < 0) {
+        tooltip.style.display = "none";
+        return;
+    }
+    tooltip.textContent = graph.labels[i];
+    tooltip.style.left = event.pageX + 10 + "px";
+    tooltip.style.top = event.pageY + 10 + "px";
+    tooltip.style.display = "block";
+});
+canvas.addEventListener("wheel", function (event) {
+    event.preventDefault();
+    var factor = Math.exp(-event.deltaY * 0.001);
+    view.x = event.offsetX - (event.offsetX - view.x) * factor;
+    view.y = event.offsetY - (event.offsetY - view.y) * factor;
+    view.scale *= factor;
+    redraw();
+}, {passive: false});
+
+fetch("force/" + encodeURIComponent(file))
+    .then(function (response) {
+        if (!response.ok) throw new Error(response.status + " " + response.statusText);
+        return response.arrayBuffer();
+    })
+    .then(function (buffer) {
+        graph = parse(buffer);
+        fit();
+        redraw();
+    });
@@ -2,9 +2,36 @@
 from pathlib import Path
 import webbrowser
 import argparse
+import json
 import logging
 
-from species_similarity.pipeline import run, DEFAULT_GENE
+from tabulate import tabulate
+
+from species_similarity.config import REFERENCE
+from species_similarity.fetch import DEFAULT_GENE
+from species_similarity.layout import ENGINES
+
+
+def _batch_genes(args: argparse.Namespace) -> list[str]:
+    genes = [g.strip() for g in (args.genes or "").split(",") if g.strip()]
+    if args.genes_file:
+        for line in args.genes_file.read_text(encoding="utf-8").splitlines():
+            line = line.split("#", 1)[0].strip()
+            if line:
+                genes.append(line)
+    return genes
+
+
+def _print_profile(out: Path) -> None:
+    from species_similarity.profiling import report_path
+
+    report = json.loads(report_path(out).read_text(encoding="utf-8"))
+    rows = [
+        {k: v for k, v in stage.items() if not isinstance(v, dict)}
+        for stage in report["stages"]
+    ]
+    print(tabulate(rows, headers="keys", floatfmt=".3f"))
+    print(f"\nRun report → {report_path(out)}")
 
 
 def main() -> None:
@@ -21,11 +48,100 @@ def main() -> None:
         default=DEFAULT_GENE,
         help="Gene identifier to download (default: HBB)",
     )
+    parser.add_argument(
+        "--max-distance",
+        type=int,
+        default=None,
+        help="Only report species within this edit distance of the reference",
+    )
+    parser.add_argument(
+        "--reference",
+        default=REFERENCE,
+        help="Reference species common name(s), comma-separated; several "
+        f"references share one batched distance pass (default: {REFERENCE})",
+    )
+    parser.add_argument(
+        "--genes",
+        help="Comma-separated genes to process in one batch, e.g. HBB,HBA1,CYTB",
+    )
+    parser.add_argument(
+        "--genes-file",
+        type=Path,
+        help="File with one gene per line ('#' starts a comment) for a batch run",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processes used by a batch run (default: one per gene, up to CPUs)",
+    )
+    parser.add_argument(
+        "--layout",
+        choices=ENGINES,
+        default="auto",
+        help="Graph layout engine; 'auto' switches to radial for large graphs",
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=None,
+        help="Species per report page before it is split into distance bands "
+        "(0 keeps a single page)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Trace per-stage Python memory too and print the run report",
+    )
     args = parser.parse_args()
+    references = [r.strip() for r in args.reference.split(",") if r.strip()]
+    genes = _batch_genes(args)
+    if args.page_size is not None and args.page_size < 0:
+        parser.error("--page-size must be 0 or a positive number of species")
+    if not references:
+        parser.error("--reference needs at least one species")
+    if genes and len(references) > 1:
+        parser.error("a batch run (--genes) takes a single --reference")
+
+    # The pipeline pulls in pandas, networkx, jinja2, ...; keep --help fast
+    from species_similarity.pipeline import run, run_many, run_references
+
+    options = dict(
+        max_distance=args.max_distance, layout=args.layout, profile=args.profile
+    )
+    if args.page_size is not None:
+        options["report_page_size"] = args.page_size or None
+
+    if genes:
+        summary = run_many(
+            genes,
+            workers=args.workers,
+            force_refresh=args.refresh,
+            reference=references[0],
+            **options,
+        )
+        print(tabulate(json.loads(summary.read_text()), headers="keys"))
+        print(f"\n✅  Batch summary → {summary}")
+        return
 
-    out: Path = run(force_refresh=args.refresh, gene=args.gene)
-    print(f"\n✅  Report generated → {out}")
-    webbrowser.open(out.as_uri())
+    if len(references) > 1:
+        reports = run_references(
+            references, force_refresh=args.refresh, gene=args.gene, **options
+        )
+    else:
+        reports = {
+            references[0]: run(
+                force_refresh=args.refresh,
+                gene=args.gene,
+                reference=references[0],
+                **options,
+            )
+        }
+    for reference, out in reports.items():
+        if args.profile:
+            _print_profile(out)
+        print(f"\n✅  Report for {reference} generated → {out}")
+    webbrowser.open(next(iter(reports.values())).as_uri())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+"""Serve similarity queries for one gene from memory (see `service`)."""
+
+import argparse
+import logging
+
+from species_similarity.config import REFERENCE
+from species_similarity.fetch import DEFAULT_GENE
+
+
+def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    parser = argparse.ArgumentParser("species-similarity – query service")
+    parser.add_argument(
+        "--gene",
+        default=DEFAULT_GENE,
+        help="Gene whose records are served (fetched first if not cached)",
+    )
+    parser.add_argument(
+        "--reference",
+        default=REFERENCE,
+        help="Species the precomputed distances and masks refer to",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=4, help="Threads for alignment queries"
+    )
+    parser.add_argument(
+        "--cache-size", type=int, default=4096, help="Entries per result cache"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    args = parser.parse_args()
+
+    from species_similarity.pipeline import ensure_records
+    from species_similarity.service import SimilarityIndex, create_app
+
+    store_path = ensure_records(args.gene)
+    index = SimilarityIndex.from_path(
+        store_path, reference=args.reference, cache_size=args.cache_size
+    )
+    app = create_app(index, workers=args.workers)
+
+    base = f"http://{args.host}:{args.port}"
+    print(f"\nServing {len(index.table)} {args.gene} records on {base}")
+    print(f"  {base}/distance?a=Human&b=Mouse")
+    print(f"  {base}/closest?species=Human&k=10")
+    print(f"  {base}/mask?species=Mouse\n")
+    app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,10 +10,17 @@ GRAPH_JSON: Final[Path] = GRAPH_JSON_FOLDER / "force.json"
 
 app = flask.Flask(__name__, static_folder=str(GRAPH_JSON_FOLDER))
 
+
 @app.route("/")
 def static_proxy():
     return app.send_static_file("force.html")
 
 
-print("\nGo to http://localhost:8000 to see the example\n")
-app.run(port=8000)
\ No newline at end of file
+@app.route("/canvas")
+def canvas_viewer():
+    return app.send_static_file("canvas.html")
+
+
+print("\nGo to http://localhost:8000 to see the example")
+print("Large graphs: http://localhost:8000/canvas (?graph=<GENE>_force.bin)\n")
+app.run(port=8000)
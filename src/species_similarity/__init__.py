@@ -2,10 +2,17 @@
 
 from __future__ import annotations
 
+import importlib
 import logging
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
 
-from . import nx_vis
-
 __all__ = ["nx_vis"]
+
+
+def __getattr__(name: str):
+    # Submodules pull in heavy dependencies (networkx, jinja2), so they are
+    # imported on first attribute access rather than with the package.
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
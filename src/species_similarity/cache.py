@@ -0,0 +1,156 @@
+"""
+Small persistent key → value cache backed by SQLite.
+
+Values are optional strings: ``None`` is stored as a *negative* entry
+("looked up, nothing found") with its own, usually shorter, time-to-live so
+that misses are retried sooner than hits are refreshed.
+
+`shared_cache` hands out one `KeyValueCache` per database file, and
+`install_http_cache` installs the on-disk HTTP response cache shared by the
+UniProt and iNaturalist clients.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Final, Iterable, Mapping, Optional
+
+__all__ = ["KeyValueCache", "install_http_cache", "shared_cache"]
+
+_DAY: Final[float] = 86400.0
+_CHUNK: Final[int] = 500  # stay well below SQLite's bound-parameter limit
+# Seconds a writer waits for another process's lock (`pipeline.run_many`
+# workers share every cache file) before SQLite reports "database is locked"
+BUSY_TIMEOUT: Final[float] = 60.0
+
+
+@lru_cache(maxsize=None)
+def shared_cache(
+    path: Path,
+    ttl: Optional[float] = 30 * _DAY,
+    negative_ttl: Optional[float] = _DAY,
+) -> KeyValueCache:
+    """
+    The process-wide `KeyValueCache` at *path*, opened on first use.
+
+    Memoised on the path, so callers that resolve it from a patched
+    ``config.DATA_RAW`` get a cache in the new directory.
+    """
+    return KeyValueCache(path, ttl=ttl, negative_ttl=negative_ttl)
+
+
+@lru_cache(maxsize=None)
+def install_http_cache(path: Path, expire_after: float = _DAY) -> None:
+    """
+    Install a ``requests_cache`` response cache at *path*, once per path.
+
+    ``requests_cache`` is imported on first use so that importing the HTTP
+    clients stays cheap.  Like `KeyValueCache`, the database uses WAL
+    journaling and a long busy timeout so that concurrent worker processes
+    can share it.
+    """
+    import requests_cache
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    requests_cache.install_cache(
+        str(path),
+        expire_after=expire_after,
+        wal=True,
+        busy_timeout=int(BUSY_TIMEOUT * 1000),
+    )
+
+
+class KeyValueCache:
+    """
+    Thread-safe SQLite key-value store with TTLs and hit/miss counters.
+
+    Parameters
+    ----------
+    path
+        SQLite database file; parent directories are created on demand.
+        Several processes may share it: the database uses WAL journaling and
+        writers wait up to `BUSY_TIMEOUT` seconds for each other.
+    ttl
+        Lifetime (seconds) of positive entries; ``None`` never expires.
+    negative_ttl
+        Lifetime (seconds) of ``None`` entries; ``None`` never expires.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        ttl: Optional[float] = 30 * _DAY,
+        negative_ttl: Optional[float] = _DAY,
+    ) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(path), timeout=BUSY_TIMEOUT, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY, value TEXT, stored_at REAL NOT NULL)"
+            )
+
+    def _fresh(self, value: Optional[str], stored_at: float, now: float) -> bool:
+        ttl = self.ttl if value is not None else self.negative_ttl
+        return ttl is None or now - stored_at < ttl
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, Optional[str]]:
+        """
+        Return the fresh entries among *keys*.
+
+        Keys that are absent or expired are left out of the result and
+        counted as misses; every returned key counts as a hit.
+        """
+        wanted = list(dict.fromkeys(keys))
+        now = time.time()
+        found: dict[str, Optional[str]] = {}
+        with self._lock:
+            for i in range(0, len(wanted), _CHUNK):
+                chunk = wanted[i : i + _CHUNK]
+                rows = self._conn.execute(
+                    "SELECT key, value, stored_at FROM entries"
+                    f" WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+                for key, value, stored_at in rows:
+                    if self._fresh(value, stored_at, now):
+                        found[key] = value
+            self.hits += len(found)
+            self.misses += len(wanted) - len(found)
+        return found
+
+    def set_many(self, items: Mapping[str, Optional[str]]) -> None:
+        """Insert or refresh every ``key → value`` pair in *items*."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO entries (key, value, stored_at)"
+                " VALUES (?, ?, ?)",
+                [(key, value, now) for key, value in items.items()],
+            )
+
+    def stats(self) -> dict[str, float]:
+        """Return hit/miss counters and the hit rate since creation."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
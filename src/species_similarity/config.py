@@ -7,13 +7,20 @@ from typing import Final
 ROOT: Final[Path] = Path(__file__).resolve().parents[2]
 DATA_RAW: Final[Path] = ROOT / "data" / "raw"
 DATA_PROCESSED: Final[Path] = ROOT / "data" / "processed"
-DATA_RAW.mkdir(parents=True, exist_ok=True)
-DATA_PROCESSED.mkdir(parents=True, exist_ok=True)
+# Nothing is created at import; every writer makes its parent directory.
+
+# --- Defaults --------------------------------------------------
+# Species the distances are measured from unless another is given
+REFERENCE: Final[str] = "Human"
+# Template events buffered per write when streaming HTML to disk
+STREAM_BUFFER: Final[int] = 64
 
 
 # --- Data classes ---------------------------------------------
 @dataclass
 class Species:
+    __slots__ = ("common_name", "scientific_name", "taxonomy_id")
+
     common_name: str
     scientific_name: str
     taxonomy_id: int
@@ -21,5 +28,7 @@ class Species:
 
 @dataclass
 class SequenceRecord:
+    __slots__ = ("species", "sequence")
+
     species: Species
     sequence: str
@@ -7,34 +7,163 @@ may deal with HTML/CSS or other presentation concerns.
 
 from __future__ import annotations
 
-from typing import Final
+from typing import Final, Iterable, Optional
 
-from .similarity import difference_mask
+import numpy as np
 
-__all__ = ["html_colorise"]
+from .similarity import difference_mask, mask_run_lengths, mask_runs
+
+__all__ = ["html_colorise", "html_colorise_many"]
 
 _MISMATCH_STYLE: Final[str] = "color:red"
+# Control characters that never occur in sequences, used by the batch path
+_OPEN: Final[str] = "\x00"
+_CLOSE: Final[str] = "\x01"
+_SEPARATOR: Final[str] = "\x02"
+
+
+def _colorise(sequence: str, mask: str, mismatch_style: str) -> str:
+    open_tag = f'<span style="{mismatch_style}">'
+    parts: list[str] = []
+    pos = 0
+    for start, stop in mask_runs(mask):
+        parts += (sequence[pos:start], open_tag, sequence[start:stop], "</span>")
+        pos = stop
+    parts.append(sequence[pos:])
+    return "".join(parts)
 
 
 def html_colorise(
     sequence: str,
     reference: str,
     mismatch_style: str = _MISMATCH_STYLE,
+    mask: Optional[str] = None,
 ) -> str:
     """
     Return an HTML string where nucleotides/amino-acids that differ from the
     *reference* are wrapped in a <span> with the given inline *mismatch_style*.
+    Consecutive mismatches share one span.
+
+    Pass a precomputed *mask* (see `similarity.difference_mask`), plain or
+    run-length encoded (`similarity.encode_mask`), to skip the alignment.
 
     Examples
     --------
     >>> html_colorise("ACGT", "ACGA")
-    'A C G <span style="color:red">T</span>'
+    'ACG<span style="color:red">T</span>'
+    >>> html_colorise("TTGT", "ACGT")
+    '<span style="color:red">TT</span>GT'
+    """
+    if mask is None:
+        mask = difference_mask(reference, sequence)
+    return _colorise(sequence, mask, mismatch_style)
+
+
+def html_colorise_many(
+    sequences: Iterable[str],
+    reference: str,
+    masks: Optional[Iterable[Optional[str]]] = None,
+    mismatch_style: str = _MISMATCH_STYLE,
+) -> list[str]:
+    """
+    `html_colorise` every sequence in *sequences* against one *reference*.
+
+    Parameters
+    ----------
+    masks
+        Precomputed masks, parallel to *sequences* (e.g. the encoded
+        ``different`` column of the close-species table).  A ``None`` entry, or omitting
+        *masks*, aligns that sequence; identical sequences are aligned once.
+
+    All sequences are colorised together: they are joined, mismatch runs are
+    found with NumPy and the span tags are inserted in bulk, so the cost
+    no longer grows with one Python step per mismatch.  Encoded masks are
+    read from their run lengths and never decoded.
+
+    Raises
+    ------
+    ValueError
+        If *masks* and *sequences* differ in number, or a precomputed mask
+        does not match its sequence's length.
     """
-    mask = difference_mask(reference, sequence)
-    out_parts: list[str] = []
-    for char, bit in zip(sequence, mask):
-        if bit == "1":
-            out_parts.append(f'<span style="{mismatch_style}">{char}</span>')
+    sequences = list(sequences)
+    if masks is None:
+        masks = [None] * len(sequences)
+    else:
+        masks = list(masks)
+        if len(masks) != len(sequences):
+            raise ValueError(f"Got {len(masks)} masks for {len(sequences)} sequences")
+    computed: dict[str, str] = {}
+    resolved: list[str] = []
+    # Plain masks are joined and diffed in one go.  Encoded masks are never
+    # decoded: their run lengths are chained into `runs`, alternating
+    # match/mismatch lengths over the joined string (the gap since the
+    # previous encoded row counts as a match).
+    plain: list[str] = []
+    runs: list[int] = []
+    covered = offset = 0
+    for seq, mask in zip(sequences, masks):
+        if mask is None:
+            mask = computed.get(seq)
+            if mask is None:
+                mask = computed[seq] = difference_mask(reference, seq)
+        row_runs = mask_run_lengths(mask)
+        if row_runs is None:
+            length = len(mask)
+            plain.append(mask)
         else:
-            out_parts.append(char)
-    return "".join(out_parts)
+            length = sum(row_runs)
+            plain.append("0" * length)
+            if row_runs:
+                if len(row_runs) % 2:
+                    row_runs.append(0)
+                row_runs[0] += offset - covered
+                runs += row_runs
+                covered = offset + length
+        if length != len(seq):
+            raise ValueError("Each mask must have the length of its sequence")
+        resolved.append(mask)
+        offset += length + len(_SEPARATOR)
+    if not sequences:
+        return []
+
+    joined = _SEPARATOR.join(sequences)
+    if not joined.isascii() or _OPEN in joined or _CLOSE in joined:
+        return [_colorise(q, m, mismatch_style) for q, m in zip(sequences, resolved)]
+    return _colorise_joined(joined, "0".join(plain), runs, mismatch_style).split(
+        _SEPARATOR
+    )
+
+
+def _colorise_joined(
+    joined: str, mask: str, runs: list[int], mismatch_style: str
+) -> str:
+    """
+    Colorise all sequences at once with NumPy.
+
+    Run boundaries come from the diff of the plain *mask* and the cumulative
+    sums of the encoded *runs*; one placeholder byte is inserted at every
+    run start/stop and then expanded into the span tags.
+    """
+    bits = np.frombuffer(mask.encode("ascii"), np.uint8) == ord("1")
+    edges = np.diff(bits.astype(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    stops = np.flatnonzero(edges == -1)
+    if runs:
+        ends = np.cumsum(np.asarray(runs, dtype=np.int64))
+        run_starts, run_stops = ends[0::2], ends[1::2]
+        keep = run_stops > run_starts
+        starts = np.concatenate((starts, run_starts[keep]))
+        stops = np.concatenate((stops, run_stops[keep]))
+    markers = np.repeat(np.array([ord(_OPEN), ord(_CLOSE)], np.uint8), len(starts))
+    out = np.insert(
+        np.frombuffer(joined.encode("ascii"), np.uint8),
+        np.concatenate((starts, stops)),
+        markers,
+    )
+    return (
+        out.tobytes()
+        .decode("ascii")
+        .replace(_OPEN, f'<span style="{mismatch_style}">')
+        .replace(_CLOSE, "</span>")
+    )
@@ -1,66 +1,220 @@
 from __future__ import annotations
-from typing import List
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterator, List, Mapping, Optional
+import json
 import logging
-from tqdm.auto import tqdm
-
-import requests
-import requests_cache
+import queue
+import threading
 from urllib.parse import quote_plus
 
-from .config import SequenceRecord, Species, DATA_RAW
+from . import config
+from .cache import install_http_cache
+from .config import SequenceRecord, Species
+
+if TYPE_CHECKING:
+    import requests
 
-# Cache UniProt responses ~1 day
-requests_cache.install_cache(str(DATA_RAW / "uniprot_cache"), expire_after=86400)
+# requests, requests_cache and tqdm are imported on first use, so importing
+# this module (e.g. for DEFAULT_GENE) stays cheap.
 
 DEFAULT_GENE = "HBB"
 UNIPROT_URL = "https://rest.uniprot.org/uniprotkb/search"
 
+PAGE_SIZE = 500
+PREFETCH_PAGES = 2  # pages buffered ahead of the parser; 0 = fully sequential
+RETRIES = 3
+BACKOFF_FACTOR = 0.5  # seconds; urllib3 doubles it on every retry
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+HTTP_CACHE_TTL = 86400  # cache UniProt responses ~1 day
+
+
+def _install_http_cache() -> None:
+    """Install the on-disk UniProt response cache, once per process."""
+    install_http_cache(config.DATA_RAW / "uniprot_cache", HTTP_CACHE_TTL)
+
+
+@lru_cache(maxsize=None)
+def _session(
+    retries: int = RETRIES, backoff: float = BACKOFF_FACTOR
+) -> requests.Session:
+    """
+    Return a pooled keep-alive session that retries transient failures.
+
+    Sessions are memoised per retry policy so every query reuses the same
+    connection pool.  The response cache is installed first, which swaps
+    ``requests.Session`` for its cached subclass, so responses stay cached.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    _install_http_cache()
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=_RETRY_STATUSES,
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _next_link(headers: Mapping[str, str]) -> Optional[str]:
+    """Extract the ``rel="next"`` cursor URL from a ``Link`` header."""
+    return next(
+        (
+            link.split(";")[0].strip(" <>")
+            for link in headers.get("Link", "").split(",")
+            if 'rel="next"' in link
+        ),
+        None,
+    )
+
+
+def _fetch_pages(
+    url: Optional[str], session: requests.Session, timeout: float = 30
+) -> Iterator[bytes]:
+    """Follow the UniProt cursor from *url*, yielding each raw page body."""
+    logger = logging.getLogger(__name__)
+    while url:
+        logger.debug("Requesting %s", url)
+        try:
+            r = session.get(url, timeout=timeout)
+            r.raise_for_status()
+        except Exception as exc:
+            logger.error("Request failed: %s", exc)
+            raise
+        url = _next_link(r.headers)
+        yield r.content
+
+
+def _prefetch(pages: Iterator[bytes], depth: int) -> Iterator[bytes]:
+    """
+    Drive *pages* on a background thread, keeping up to *depth* bodies
+    buffered.
+
+    The cursor for page N+1 is known from the headers of page N, so the next
+    request is already in flight while the caller parses the current page.
+    Exceptions raised by the producer are re-raised in the caller.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
 
-def _uniprot_query(query: str, page_size: int = 500) -> List[dict]:
+    def put(item: object) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for body in pages:
+                if not put(body):
+                    return
+        except BaseException as exc:  # handed over to the consumer
+            put(exc)
+        else:
+            put(done)
+
+    worker = threading.Thread(target=produce, name="uniprot-prefetch", daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is done:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item  # type: ignore[misc]
+    finally:
+        stop.set()
+
+
+def _iter_uniprot_pages(
+    query: str,
+    page_size: int = PAGE_SIZE,
+    prefetch: int = PREFETCH_PAGES,
+    session: Optional[requests.Session] = None,
+) -> Iterator[List[dict]]:
+    """
+    Yield the ``results`` list of each UniProt page as it arrives.
+
+    Parameters
+    ----------
+    query
+        UniProt query string, e.g. ``"gene:HBB"``.
+    page_size
+        Entries requested per page.
+    prefetch
+        Number of pages downloaded ahead of the parser on a background
+        thread.  ``0`` fetches and parses strictly one after the other.
+    session
+        HTTP session to use; defaults to the shared pooled ``_session()``.
+    """
     logger = logging.getLogger(__name__)
     url = f"{UNIPROT_URL}?query={quote_plus(query)}&format=json&size={page_size}"
     logger.info("Querying UniProt: %s", query)
-    out: List[dict] = []
+    bodies = _fetch_pages(url, session or _session())
+    if prefetch > 0:
+        bodies = _prefetch(bodies, prefetch)
+    from tqdm.auto import tqdm
+
     with tqdm(desc="UniProt pages", unit="page", leave=False) as bar:
-        while url:
-            logger.debug("Requesting %s", url)
-            try:
-                r = requests.get(url, timeout=30)
-                r.raise_for_status()
-            except Exception as exc:
-                logger.error("Request failed: %s", exc)
-                raise
-            payload = r.json()
-            out.extend(payload["results"])
-            url = next(
-                (
-                    link.split(";")[0].strip(" <>")
-                    for link in r.headers.get("Link", "").split(",")
-                    if 'rel="next"' in link
-                ),
-                None,
-            )
+        for body in bodies:
+            payload = json.loads(body)
             bar.update(1)
-    return out
+            yield payload["results"]
 
 
-def fetch_gene_sequences(gene: str = DEFAULT_GENE) -> List[SequenceRecord]:
-    """Return every sequence where ``gene`` matches the UniProt ``gene`` field."""
+def _parse_record(row: dict) -> SequenceRecord:
+    """Convert one raw UniProt result into a ``SequenceRecord``."""
+    organism = row["organism"]
+    species = Species(
+        common_name=organism.get("commonName", organism["scientificName"]),
+        scientific_name=organism["scientificName"],
+        taxonomy_id=int(organism["taxonId"]),
+    )
+    return SequenceRecord(species, row["sequence"]["value"])
+
+
+def iter_gene_sequences(
+    gene: str = DEFAULT_GENE,
+    page_size: int = PAGE_SIZE,
+    prefetch: int = PREFETCH_PAGES,
+) -> Iterator[SequenceRecord]:
+    """
+    Lazily yield every sequence where ``gene`` matches the UniProt ``gene``
+    field.
+
+    Records are parsed page by page, so only the current page (plus up to
+    *prefetch* raw bodies downloaded ahead) is held in memory regardless of
+    how many entries the query matches.
+    """
     logger = logging.getLogger(__name__)
-    raw = _uniprot_query(f"gene:{gene}")
-    logger.info("Converting UniProt records → SequenceRecord")
-    records: List[SequenceRecord] = []
-    for row in raw:
-        organism = row["organism"]
-        seq = row["sequence"]["value"]
-        species = Species(
-            common_name=organism.get("commonName", organism["scientificName"]),
-            scientific_name=organism["scientificName"],
-            taxonomy_id=int(organism["taxonId"]),
-        )
-        logger.debug("Parsed %s", species.common_name)
-        records.append(SequenceRecord(species, seq))
-    return records
+    for page in _iter_uniprot_pages(f"gene:{gene}", page_size, prefetch):
+        logger.debug("Converting %d UniProt records → SequenceRecord", len(page))
+        for row in page:
+            record = _parse_record(row)
+            logger.debug("Parsed %s", record.species.common_name)
+            yield record
+
+
+def fetch_gene_sequences(gene: str = DEFAULT_GENE) -> List[SequenceRecord]:
+    """
+    Return every sequence where ``gene`` matches the UniProt ``gene`` field.
+
+    Public list-returning wrapper around `iter_gene_sequences`, which the
+    pipeline uses to stream records straight into the record store.
+    """
+    return list(iter_gene_sequences(gene))
 
 
 def fetch_all_beta_globin_sequences() -> List[SequenceRecord]:
@@ -1,29 +1,141 @@
 from __future__ import annotations
-from functools import lru_cache
-from typing import Final
+from concurrent.futures import ThreadPoolExecutor
+from typing import Final, Iterable, Optional
 import logging
+import threading
+import time
 
-import requests_cache
+from . import config
+from .cache import KeyValueCache, install_http_cache, shared_cache
 
-from .config import DATA_RAW
+IMAGE_SIZE: Final[str] = "medium"
+MAX_WORKERS: Final[int] = 8
+# iNaturalist asks clients to stay below ~100 requests/minute
+RATE_LIMIT: Final[float] = 1.5  # requests per second
 
-# mypy: ignore-errors
-from pyinaturalist.rest_api import get_observations
-# from pyinaturalist import get_observations
+HTTP_CACHE_TTL: Final[int] = 86400  # cache iNaturalist responses ~1 day
 
-IMAGE_SIZE: Final[str] = "medium"
+# Persistent scientific name → photo URL cache (misses expire after a day)
+URL_CACHE_TTL: Final[float] = 30 * 86400
+URL_CACHE_NEGATIVE_TTL: Final[float] = 86400
 
-# Cache iNaturalist responses ~1 day
-requests_cache.install_cache(str(DATA_RAW / "inat_cache"), expire_after=86400)
 
+def _cache() -> KeyValueCache:
+    return shared_cache(
+        config.DATA_RAW / "image_urls.sqlite",
+        ttl=URL_CACHE_TTL,
+        negative_ttl=URL_CACHE_NEGATIVE_TTL,
+    )
 
-@lru_cache(maxsize=None)
-def image_url(scientific_name: str) -> str | None:
-    logger = logging.getLogger(__name__)
+
+def _install_http_cache() -> None:
+    """Install the on-disk iNaturalist response cache, once per process."""
+    install_http_cache(config.DATA_RAW / "inat_cache", HTTP_CACHE_TTL)
+
+
+def get_observations(**params):
+    """`pyinaturalist.rest_api.get_observations`, imported on first use."""
+    from pyinaturalist.rest_api import get_observations as _get_observations
+
+    return _get_observations(**params)
+
+
+def cache_stats() -> dict[str, float]:
+    """Hit/miss counters of the persistent image URL cache."""
+    return _cache().stats()
+
+
+class _RateLimiter:
+    """Space out call starts so at most *rate* begin per second across threads."""
+
+    def __init__(self, rate: Optional[float]) -> None:
+        self._interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self._interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self._interval
+        time.sleep(start - now)
+
+
+def _fetch_url(scientific_name: str) -> str | None:
+    """
+    Query iNaturalist for one photo of *scientific_name*.
+
+    Returns ``None`` when the taxon has no photographed observation; network
+    and API errors propagate so they are not cached as negative results.
+    """
+    logging.getLogger(__name__).debug("Fetching image for %s", scientific_name)
+    rsp = get_observations(taxon_name=scientific_name, per_page=1)
     try:
-        logger.debug("Fetching image for %s", scientific_name)
-        rsp = get_observations(taxon_name=scientific_name, per_page=1)
         return rsp[0]["photos"][0][f"{IMAGE_SIZE}_url"]  # type: ignore[index]
-    except Exception as exc:
-        logger.warning("Image lookup failed for %s: %s", scientific_name, exc)
+    except (IndexError, KeyError, TypeError):
         return None
+
+
+def image_urls(
+    scientific_names: Iterable[str],
+    max_workers: int = MAX_WORKERS,
+    rate_limit: Optional[float] = RATE_LIMIT,
+    failed: Optional[set[str]] = None,
+) -> dict[str, str | None]:
+    """
+    Resolve a photo URL for every name in *scientific_names*.
+
+    Duplicates are looked up once.  Names found in the persistent URL cache
+    are answered without any HTTP request; the remaining lookups run on a
+    thread pool of at most *max_workers* threads, with request starts spaced
+    to stay under *rate_limit* requests per second (``None`` disables the
+    limit).  Successful lookups and "no photo" answers are written back to
+    the cache; failed requests are not.
+
+    Parameters
+    ----------
+    failed
+        If given, names whose lookup failed (network or API error) are added
+        to this set.  They map to ``None`` like taxa without a photo, but a
+        later call retries them.
+
+    Returns
+    -------
+    dict
+        ``scientific_name → URL`` (``None`` when no photo could be found).
+    """
+    logger = logging.getLogger(__name__)
+    names = list(dict.fromkeys(scientific_names))
+    cache = _cache()
+    resolved = cache.get_many(names)
+    missing = [n for n in names if n not in resolved]
+    if missing:
+        logger.info(
+            "Resolving %d images (%d cached)", len(missing), len(names) - len(missing)
+        )
+        limiter = _RateLimiter(rate_limit)
+        _install_http_cache()
+
+        def resolve(name: str) -> tuple[str, str | None, bool]:
+            limiter.wait()
+            try:
+                return name, _fetch_url(name), True
+            except Exception as exc:
+                logger.warning("Image lookup failed for %s: %s", name, exc)
+                return name, None, False
+
+        workers = max(1, min(max_workers, len(missing)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="inat") as pool:
+            results = list(pool.map(resolve, missing))
+        cache.set_many({name: url for name, url, ok in results if ok})
+        resolved.update((name, url) for name, url, _ in results)
+        if failed is not None:
+            failed.update(name for name, _, ok in results if not ok)
+    return {n: resolved[n] for n in names}
+
+
+def image_url(scientific_name: str) -> str | None:
+    """Return a photo URL for a single species (see `image_urls`)."""
+    return image_urls([scientific_name])[scientific_name]
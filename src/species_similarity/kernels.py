@@ -0,0 +1,104 @@
+"""
+Vectorised comparison kernels over NumPy byte arrays.
+
+Sequences are encoded once as ``uint8`` rows so that one reference can be
+compared against many sequences in a single array operation.  These only
+apply to sequences of the reference's length (ungapped comparison), which
+is the common case for orthologous globins; `hamming_to_reference` routes
+everything else through rapidfuzz.
+"""
+
+from __future__ import annotations
+
+from typing import Final, Sequence
+
+import numpy as np
+from rapidfuzz.distance import Hamming
+
+__all__ = [
+    "encode",
+    "mismatches",
+    "hamming_many",
+    "identity_many",
+    "hamming_to_reference",
+]
+
+# Rows compared per step; bounds the temporary (rows × length) bool matrix
+_CHUNK_ROWS: Final[int] = 8192
+
+
+def encode(sequences: Sequence[str]) -> np.ndarray:
+    """
+    Stack equal-length *sequences* into an ``(N, L)`` ``uint8`` matrix.
+
+    Raises
+    ------
+    ValueError
+        If the sequences do not all have the same length.
+    """
+    if not sequences:
+        return np.empty((0, 0), dtype=np.uint8)
+    length = len(sequences[0])
+    if any(len(s) != length for s in sequences):
+        raise ValueError("Sequences must be equal length")
+    buf = "".join(sequences).encode("latin-1")
+    return np.frombuffer(buf, dtype=np.uint8).reshape(len(sequences), length)
+
+
+def _as_matrix(sequences: Sequence[str] | np.ndarray) -> np.ndarray:
+    return sequences if isinstance(sequences, np.ndarray) else encode(sequences)
+
+
+def _check_reference(reference: str, matrix: np.ndarray) -> np.ndarray:
+    ref = np.frombuffer(reference.encode("latin-1"), dtype=np.uint8)
+    if matrix.size and matrix.shape[1] != ref.size:
+        raise ValueError("Sequences must be equal length")
+    return ref
+
+
+def mismatches(reference: str, sequences: Sequence[str] | np.ndarray) -> np.ndarray:
+    """
+    Return the ``(N, L)`` boolean per-position mismatch matrix of
+    *sequences* (strings or an `encode`-d matrix) against *reference*.
+    """
+    matrix = _as_matrix(sequences)
+    return matrix != _check_reference(reference, matrix)
+
+
+def hamming_many(reference: str, sequences: Sequence[str] | np.ndarray) -> np.ndarray:
+    """Hamming distance of every sequence to *reference* (``int64`` array)."""
+    matrix = _as_matrix(sequences)
+    ref = _check_reference(reference, matrix)
+    out = np.empty(len(matrix), dtype=np.int64)
+    for start in range(0, len(matrix), _CHUNK_ROWS):
+        block = matrix[start : start + _CHUNK_ROWS]
+        out[start : start + len(block)] = np.count_nonzero(block != ref, axis=1)
+    return out
+
+
+def identity_many(reference: str, sequences: Sequence[str] | np.ndarray) -> np.ndarray:
+    """Percent identity of every sequence to *reference* (``float64``)."""
+    if not reference:
+        return np.full(len(sequences), 100.0)
+    distances = hamming_many(reference, sequences)
+    return 100.0 * (1.0 - distances / len(reference))
+
+
+def hamming_to_reference(reference: str, sequences: Sequence[str]) -> np.ndarray:
+    """
+    Hamming distance of every sequence to *reference*, any lengths allowed.
+
+    Sequences of the reference's length take the vectorised path; the rest
+    are compared by rapidfuzz, which counts the length difference as
+    mismatches.
+    """
+    out = np.empty(len(sequences), dtype=np.int64)
+    same = [i for i, s in enumerate(sequences) if len(s) == len(reference)]
+    if same:
+        out[same] = hamming_many(reference, [sequences[i] for i in same])
+    if len(same) != len(sequences):
+        same_set = set(same)
+        for i, seq in enumerate(sequences):
+            if i not in same_set:
+                out[i] = Hamming.distance(reference, seq)
+    return out
@@ -0,0 +1,145 @@
+"""
+Graph layout engines for the species distance graph.
+
+The distance graph is a star around the reference species, so besides the
+generic force-directed ``"spring"`` layout there is a direct ``"radial"``
+layout: every node sits at a radius equal to its edge weight, at an angle
+derived from a stable hash of its name.  It is O(N) and needs no
+iterations.  ``"auto"`` picks radial for graphs too big for a spring
+layout.
+
+Spring positions can be cached on disk between runs.  Nodes that are
+still present with the same distance keep their cached coordinates and are
+held fixed; only new or changed nodes are placed.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import zlib
+from pathlib import Path
+from typing import TYPE_CHECKING, Final, Optional
+
+if TYPE_CHECKING:
+    import networkx as nx
+
+__all__ = ["ENGINES", "compute_layout", "radial_layout"]
+
+ENGINES: Final[tuple[str, ...]] = ("auto", "spring", "radial")
+# Above this many nodes "auto" switches from spring to radial
+SPRING_MAX_NODES: Final[int] = 500
+SPRING_ITERATIONS: Final[int] = 50
+
+Positions = dict[str, tuple[float, float]]
+
+
+def _angle(node: str) -> float:
+    """Stable angle in [0, 2π) for *node*, independent of graph order."""
+    return zlib.crc32(node.encode("utf-8")) / 2**32 * 2 * math.pi
+
+
+def _weight(graph: nx.Graph, center: str, node: str) -> Optional[float]:
+    if node == center or not graph.has_edge(center, node):
+        return None
+    return float(graph.edges[center, node].get("weight", 1))
+
+
+def radial_layout(graph: nx.Graph, center: str) -> Positions:
+    """Place *center* at the origin and every neighbour at radius = weight."""
+    pos: Positions = {center: (0.0, 0.0)}
+    for node in graph.nodes:
+        if node == center:
+            continue
+        radius = _weight(graph, center, node) or 0.0
+        theta = _angle(str(node))
+        pos[node] = (radius * math.cos(theta), radius * math.sin(theta))
+    return pos
+
+
+def _spring_layout(
+    graph: nx.Graph, center: str, cached: Positions, iterations: int
+) -> Positions:
+    init = {n: cached[n] for n in graph.nodes if n in cached}
+    init.setdefault(center, (0.0, 0.0))
+    if len(init) == graph.number_of_nodes():
+        return init
+    import networkx as nx
+
+    pos = nx.spring_layout(
+        graph, pos=init, fixed=list(init), iterations=iterations, seed=0
+    )
+    return {n: (float(p[0]), float(p[1])) for n, p in pos.items()}
+
+
+def _load(path: Optional[Path], engine: str, graph: nx.Graph, center: str) -> Positions:
+    """Cached positions of nodes whose engine and distance are unchanged."""
+    if path is None:
+        return {}
+    try:
+        raw = json.loads(path.read_text("utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {}
+    if raw.get("engine") != engine:
+        return {}
+    return {
+        node: (float(x), float(y))
+        for node, (x, y, w) in raw.get("nodes", {}).items()
+        if graph.has_node(node) and _weight(graph, center, node) == w
+    }
+
+
+def _save(
+    path: Path, engine: str, graph: nx.Graph, center: str, pos: Positions
+) -> None:
+    nodes = {n: (x, y, _weight(graph, center, n)) for n, (x, y) in pos.items()}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"engine": engine, "nodes": nodes}), encoding="utf-8")
+
+
+def compute_layout(
+    graph: nx.Graph,
+    engine: str = "auto",
+    center: str = "Human",
+    iterations: int = SPRING_ITERATIONS,
+    cache_path: Optional[Path] = None,
+) -> Positions:
+    """
+    Return node positions for *graph*.
+
+    Parameters
+    ----------
+    engine
+        One of `ENGINES`.
+    center
+        Node pinned at the origin.
+    iterations
+        Upper bound on spring-layout iterations.
+    cache_path
+        Optional JSON file of spring positions from a previous run.  Nodes
+        found there with an unchanged distance keep their coordinates; the
+        file is updated afterwards.
+
+    Raises
+    ------
+    ValueError
+        If *engine* is unknown.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown layout engine '{engine}', expected one of {ENGINES}")
+    if engine == "auto":
+        engine = "spring" if graph.number_of_nodes() <= SPRING_MAX_NODES else "radial"
+    logger = logging.getLogger(__name__)
+    logger.info("Laying out %d nodes with %s", graph.number_of_nodes(), engine)
+
+    if engine == "radial":
+        # Deterministic per node, so nothing is gained from a cache
+        return radial_layout(graph, center)
+
+    pos = _spring_layout(
+        graph, center, _load(cache_path, engine, graph, center), iterations
+    )
+    if cache_path is not None:
+        _save(cache_path, engine, graph, center, pos)
+    return pos
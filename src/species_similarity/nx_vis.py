@@ -7,6 +7,8 @@ from pathlib import Path
 import jinja2
 import networkx as nx
 
+from .config import STREAM_BUFFER
+
 __all__ = ["render_html"]
 
 _TEMPLATE = jinja2.Template(
@@ -62,18 +64,19 @@ def render_html(
     size: tuple[int, int] = (600, 400),
     pos: dict[str, tuple[float, float]] | None = None,
 ) -> Path:
-    """Render *graph* to an HTML file with an inline SVG."""
+    """Render *graph* to an HTML file with an inline SVG, streamed to disk."""
     width, height = size
     if pos is None:
         pos = nx.spring_layout(graph)
     scaled = _scale_positions(
         {str(n): (p[0], p[1]) for n, p in pos.items()}, width, height
     )
-    edges = [(str(u), str(v)) for u, v in graph.edges()]
-    nodes = [str(n) for n in graph.nodes()]
-    html = _TEMPLATE.render(
+    edges = ((str(u), str(v)) for u, v in graph.edges())
+    nodes = (str(n) for n in graph.nodes())
+    stream = _TEMPLATE.stream(
         width=width, height=height, pos=scaled, edges=edges, nodes=nodes
     )
+    stream.enable_buffering(STREAM_BUFFER)
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(html, encoding="utf-8")
+    stream.dump(str(out_path), encoding="utf-8")
     return out_path
@@ -1,20 +1,28 @@
 from __future__ import annotations
+import hashlib
 import json
+import os
+import re
+import time
 
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
 from pathlib import Path
-from typing import Final, Iterable, Optional
+from typing import Final, Iterable, Iterator, NamedTuple, Optional, Sequence
 import logging
 
 import networkx as nx
 
 import pandas as pd
 
-from .config import DATA_PROCESSED, SequenceRecord, Species
-from .fetch import fetch_gene_sequences, DEFAULT_GENE
-from .similarity import compute_distances, difference_mask
-from .images import image_url
-from .render import render_concentric as render_html
-from . import nx_vis
+from .cache import KeyValueCache, shared_cache
+from .config import DATA_PROCESSED, REFERENCE, SequenceRecord, Species
+from .fetch import iter_gene_sequences, DEFAULT_GENE
+from .similarity import compute_alignments, encode_mask, reference_distances
+from .images import cache_stats, image_urls
+from .render import REPORT_PAGE_SIZE, render_report
+from .table import SequenceTable
+from . import layout as layouts
+from . import config, graph_export, nx_vis, profiling, stages, store
 
 # --------------------------------------------------------------------- #
 #  Paths                                                                #
@@ -25,52 +33,194 @@ CSV_CLOSE: Final[Path] = DATA_PROCESSED / "close_to_human.csv"
 HTML_OUT: Final[Path] = DATA_PROCESSED / "close_to_human.html"
 GRAPH_HTML: Final[Path] = DATA_PROCESSED / "edit_distance_graph.html"
 GRAPH_JSON: Final[Path] = DATA_PROCESSED / "force" / "force.json"
+BATCH_SUMMARY: Final[Path] = DATA_PROCESSED / "batch_summary.json"
+
+# Bump to invalidate every cached stage after changing how outputs are built
+_STAGE_VERSION: Final[int] = 3
+_METRIC: Final[str] = "levenshtein"
 
 # --------------------------------------------------------------------- #
 #  Helpers for (de)serialising SequenceRecord                           #
 # --------------------------------------------------------------------- #
 
 
-def _save_records(recs: list[SequenceRecord], path: Path) -> None:
-    """Write flat CSV so pandas does not stringify the dataclass."""
+def _save_records(recs: Iterable[SequenceRecord], path: Path) -> int:
+    """
+    Stream records into the record store at *path* (CSV, Parquet or Arrow,
+    by suffix) so pandas does not stringify the dataclass.
+
+    Rows are written as they are produced, so a lazy iterable (e.g.
+    ``fetch.iter_gene_sequences``) never has to be materialised, and an
+    interrupted fetch never leaves a truncated cache behind.
+
+    Returns
+    -------
+    int
+        Number of records written.
+    """
     logger = logging.getLogger(__name__)
-    rows = [
-        {
-            "common_name": r.species.common_name,
-            "scientific_name": r.species.scientific_name,
-            "taxonomy_id": r.species.taxonomy_id,
-            "sequence": r.sequence,
-        }
-        for r in recs
-    ]
-    path.parent.mkdir(parents=True, exist_ok=True)
     logger.info("Saving records to %s", path)
-    pd.DataFrame(rows).to_csv(path, index=False)
+    count = store.write_records(recs, path)
+    logger.info("Saved %d records", count)
+    return count
 
 
 def _load_records(path: Path) -> list[SequenceRecord]:
-    """Recreate SequenceRecord objects from the flat CSV."""
+    """Recreate SequenceRecord objects from the record store."""
     logger = logging.getLogger(__name__)
     logger.info("Loading records from %s", path)
-    df = pd.read_csv(path)
-    return [
-        SequenceRecord(
-            Species(row.common_name, row.scientific_name, int(row.taxonomy_id)),
-            row.sequence,
-        )
-        for row in df.itertuples(index=False)
-    ]
+    return store.load_records(path)
 
 
-def build_distance_graph(distances: Iterable[tuple[SequenceRecord, int]]) -> nx.Graph:
-    """Return a graph with edges weighted by edit distance to Human."""
-    g = nx.Graph()
-    g.add_node("Human")
-    for rec, dist in distances:
-        name = rec.species.common_name
+def _load_table(path: Path) -> SequenceTable:
+    """Load the record store into a compact `SequenceTable`."""
+    logger = logging.getLogger(__name__)
+    logger.info("Loading record table from %s", path)
+    return store.load_table(path)
+
+
+def _distances_from_frame(
+    df: pd.DataFrame,
+) -> Iterator[tuple[SequenceRecord, int]]:
+    """Rebuild ``(record, distance)`` pairs from a close-species table."""
+    for name, scientific, taxon, seq, dist in zip(
+        df["name"].tolist(),
+        df["scientific_name"].tolist(),
+        df["taxonomy_id"].tolist(),
+        df["sequence"].tolist(),
+        df["hamming_distance"].tolist(),
+    ):
+        yield SequenceRecord(Species(name, scientific, int(taxon)), seq), int(dist)
+
+
+# --------------------------------------------------------------------- #
+#  Incremental alignment                                                #
+# --------------------------------------------------------------------- #
+
+
+def _alignment_cache() -> KeyValueCache:
+    """Per-sequence alignment results, keyed by content and shared by runs."""
+    return shared_cache(
+        config.DATA_RAW / "alignments.sqlite", ttl=None, negative_ttl=None
+    )
+
+
+def _reusable(cached: str, max_distance: Optional[int]) -> bool:
+    """Whether a cached alignment answers a query with *max_distance*."""
+    if not cached.startswith("far "):
+        return True
+    return max_distance is not None and max_distance <= int(cached[4:])
+
+
+def _analyse(
+    records: Sequence[SequenceRecord],
+    reference: str = REFERENCE,
+    max_distance: Optional[int] = None,
+    distances: Optional[Sequence[int]] = None,
+) -> list[tuple[SequenceRecord, Optional[int], Optional[str]]]:
+    """
+    Return ``(record, distance, difference mask)`` against *reference*.
+    Masks are run-length encoded (`similarity.encode_mask`).
+
+    Records further than *max_distance* are reported "far" as ``(record,
+    None, None)`` without being aligned in full.  With *distances* (one row
+    of `similarity.reference_distances`, parallel to *records*) they are
+    recognised from those without even the banded check, and sequences
+    identical to the reference get an all-match mask without an alignment.
+
+    Results are cached by the content of the reference and the record
+    sequence, so after a fetch that only adds records just the new
+    sequences are aligned.  A cached entry is either ``"<dist> <mask>"`` or
+    ``"far <cutoff>"`` (distance known to exceed *cutoff*); the latter is
+    only reused while the requested cutoff is no larger.
+
+    Raises
+    ------
+    ValueError
+        If the reference species is not present in ``records``.
+    """
+    logger = logging.getLogger(__name__)
+    recs = list(records)
+    ref = next(
+        (r for r in recs if r.species.common_name.lower() == reference.lower()),
+        None,
+    )
+    if ref is None:
+        raise ValueError(f"Reference species '{reference}' not present")
+
+    base = hashlib.sha1(f"{_METRIC}\0{ref.sequence}\0".encode("utf-8"))
+    keys = []
+    for r in recs:
+        h = base.copy()
+        h.update(r.sequence.encode("utf-8"))
+        keys.append(h.hexdigest())
+
+    cache = _alignment_cache()
+    results = {
+        key: value
+        for key, value in cache.get_many(keys).items()
+        if _reusable(value, max_distance)  # type: ignore[arg-type]
+    }
+    todo = {k: r for k, r in zip(keys, recs) if k not in results}
+    cutoff = max_distance
+    if distances is not None:
+        known = dict(zip(keys, distances))
+        settled: dict[str, str] = {}
+        for key, rec in todo.items():
+            if max_distance is not None and known[key] > max_distance:
+                settled[key] = f"far {max_distance}"
+            elif known[key] == 0:
+                settled[key] = f"0 {encode_mask('0' * len(rec.sequence))}"
+        cache.set_many(settled)
+        results.update(settled)
+        todo = {k: r for k, r in todo.items() if k not in settled}
+        cutoff = None
+    logger.info(
+        "Aligning %d new sequences (%d cached)", len(todo), len(keys) - len(todo)
+    )
+    if todo:
+        alignments = compute_alignments(
+            [ref, *todo.values()], reference, max_distance=cutoff
+        )[1:]
+        fresh = {
+            key: (
+                f"far {max_distance}"
+                if aln is None
+                else f"{aln.distance} {encode_mask(aln.mask)}"
+            )
+            for key, (_, aln) in zip(todo, alignments)
+        }
+        cache.set_many(fresh)
+        results.update(fresh)
+
+    out: list[tuple[SequenceRecord, Optional[int], Optional[str]]] = []
+    for rec, key in zip(recs, keys):
+        head, _, tail = results[key].partition(" ")  # type: ignore[union-attr]
+        if head == "far" or (max_distance is not None and int(head) > max_distance):
+            out.append((rec, None, None))
+        else:
+            # Older entries hold plain or "="-prefixed masks; re-encode them
+            out.append((rec, int(head), encode_mask(tail)))
+    return out
+
+
+def build_distance_graph(
+    distances: Iterable[tuple[SequenceRecord, int]], reference: str = REFERENCE
+) -> nx.Graph:
+    """
+    Return a star graph with edges weighted by edit distance to *reference*.
+
+    The centre node is named as the reference is spelled in the records
+    (matched case-insensitively) and stored as ``graph.graph["reference"]``.
+    """
+    pairs = [(rec.species.common_name, dist) for rec, dist in distances]
+    centre = next((n for n, _ in pairs if n.lower() == reference.lower()), reference)
+    g = nx.Graph(reference=centre)
+    g.add_node(centre)
+    for name, dist in pairs:
         g.add_node(name)
-        if name.lower() != "human":
-            g.add_edge("Human", name, weight=dist)
+        if name.lower() != reference.lower():
+            g.add_edge(centre, name, weight=dist)
     return g
 
 
@@ -79,12 +229,108 @@ def build_distance_graph(distances: Iterable[tuple[SequenceRecord, int]]) -> nx.
 # --------------------------------------------------------------------- #
 
 
+class Artifacts(NamedTuple):
+    """Files produced by one pipeline run."""
+
+    csv_all: Path
+    csv_close: Path
+    html_out: Path
+    graph_html: Path
+    graph_json: Path
+
+
+def artifact_paths(
+    gene: str = DEFAULT_GENE,
+    store_format: Optional[str] = None,
+    csv_all: Optional[Path] = None,
+    csv_close: Optional[Path] = None,
+    html_out: Optional[Path] = None,
+    reference: str = REFERENCE,
+) -> Artifacts:
+    """
+    Resolve the default artefact locations for *gene* (see `run`).
+
+    Artefacts for a reference other than Human carry its name, e.g.
+    ``close_to_mouse.csv`` and ``force_mouse.json``; the record store is
+    shared by all references.
+    """
+    fmt = store_format or store.default_format()
+    default = gene == DEFAULT_GENE
+    slug = _slug(reference)
+    tag = "" if reference.lower() == REFERENCE.lower() else f"_{slug}"
+    standard = default and not tag
+    prefix = "" if default else f"{gene}_"
+    return Artifacts(
+        csv_all=csv_all
+        or store.with_format(
+            CSV_ALL if default else DATA_PROCESSED / f"{gene}_all_sequences.csv",
+            fmt,
+        ),
+        csv_close=csv_close
+        or store.with_format(
+            CSV_CLOSE if standard else DATA_PROCESSED / f"{prefix}close_to_{slug}.csv",
+            fmt,
+        ),
+        html_out=html_out
+        or (HTML_OUT if standard else DATA_PROCESSED / f"{prefix}close_to_{slug}.html"),
+        graph_html=(
+            GRAPH_HTML
+            if standard
+            else DATA_PROCESSED / f"{prefix}edit_distance_graph{tag}.html"
+        ),
+        graph_json=GRAPH_JSON
+        if standard
+        else GRAPH_JSON.with_name(f"{prefix}force{tag}.json"),
+    )
+
+
+def _slug(name: str) -> str:
+    """File-name form of a species name: ``"Sea lamprey"`` → ``sea_lamprey``."""
+    return re.sub(r"[^0-9a-z]+", "_", name.lower()).strip("_")
+
+
+def _ensure_records(gene: str, csv_all: Path, force_refresh: bool = False) -> Path:
+    """Fetch *gene* into *csv_all* unless a usable record store exists."""
+    logger = logging.getLogger(__name__)
+    legacy_csv = csv_all.with_suffix(".csv")
+    if not force_refresh and not csv_all.exists() and legacy_csv.exists():
+        logger.info("Migrating %s to %s", legacy_csv, csv_all)
+        _save_records(_load_table(legacy_csv), csv_all)
+    if force_refresh or not csv_all.exists():
+        logger.info("Fetching %s sequences from UniProt", gene)
+        _save_records(iter_gene_sequences(gene), csv_all)
+    return csv_all
+
+
+def ensure_records(
+    gene: str = DEFAULT_GENE,
+    force_refresh: bool = False,
+    store_format: Optional[str] = None,
+) -> Path:
+    """
+    Path of *gene*'s record store, fetched from UniProt first if needed.
+
+    This is the store `run` reads; load it with `store.load_table`.
+    """
+    return _ensure_records(
+        gene, artifact_paths(gene, store_format).csv_all, force_refresh
+    )
+
+
 def run(
     force_refresh: bool = False,
     gene: str = DEFAULT_GENE,
     csv_all: Optional[Path] = None,
     csv_close: Optional[Path] = None,
     html_out: Optional[Path] = None,
+    store_format: Optional[str] = None,
+    max_distance: Optional[int] = None,
+    layout: str = "auto",
+    report_page_size: Optional[int] = REPORT_PAGE_SIZE,
+    profile: bool = False,
+    reference: str = REFERENCE,
+    distances: Optional[Sequence[int]] = None,
+    records: Optional[SequenceTable] = None,
 ) -> Path:
     """
     End-to-end pipeline.
@@ -92,7 +338,42 @@ def run(
     Parameters
     ----------
     force_refresh
-        Ignore cached CSV and fetch from UniProt again.
+        Ignore cached CSV and fetch from UniProt again.  Later stages still
+        only rerun if the fetched records differ from the cached ones.
+    store_format
+        ``"csv"``, ``"parquet"`` or ``"arrow"`` for the default record and
+        close-species tables; defaults to Parquet when ``pyarrow`` is
+        installed.  Explicit ``csv_all``/``csv_close`` paths keep their own
+        suffix.  An existing CSV cache is migrated instead of re-fetched.
+    max_distance
+        Only keep species within this edit distance of the reference in the
+        close-species table, graph and report.  More distant sequences are
+        rejected by a banded check instead of being aligned in full.
+    layout
+        Graph layout engine, one of `layout.ENGINES`.  Spring positions are
+        cached next to the graph JSON, so species already placed on a
+        previous run keep their coordinates.
+    report_page_size
+        Split the HTML report into distance-band pages of at most this many
+        species once it holds more; ``None`` always writes a single page.
+    profile
+        Also trace the peak Python heap of every stage (slower).  Wall/CPU
+        time, peak RSS, record counts and cache hit rates are always written
+        to the run report next to the HTML report (see
+        `profiling.report_path`).
+    reference
+        Common name of the species every distance and mask is measured
+        against; it sits at the centre of the graph and the report.  Non-Human
+        references get their own artefacts (see `artifact_paths`).
+    distances
+        Distances of the stored records to *reference*, in store order, as
+        computed by `run_references`.  Records beyond *max_distance* are
+        dropped, and records identical to the reference are kept, without
+        aligning them.
+    records
+        The record store, already loaded by the caller (`run_references`
+        loads it once for all references); it is then neither fetched nor
+        read again.
 
     Returns
     -------
@@ -102,59 +383,377 @@ def run(
     logger = logging.getLogger(__name__)
     logger.info("Starting pipeline")
 
-    csv_all = csv_all or (
-        CSV_ALL
-        if gene == DEFAULT_GENE
-        else DATA_PROCESSED / f"{gene}_all_sequences.csv"
+    csv_all, csv_close, html_out, graph_html, graph_json = artifact_paths(
+        gene, store_format, csv_all, csv_close, html_out, reference
     )
-    csv_close = csv_close or (
-        CSV_CLOSE
-        if gene == DEFAULT_GENE
-        else DATA_PROCESSED / f"{gene}_close_to_human.csv"
+
+    with profiling.RunProfile(trace_memory=profile) as prof:
+        prof.info.update(
+            gene=gene, reference=reference, max_distance=max_distance, layout=layout
+        )
+
+        # 1) Fetch or use cached data
+        with prof.stage("fetch") as stats:
+            if records is None:
+                _ensure_records(gene, csv_all, force_refresh)
+            stats["store_bytes"] = csv_all.stat().st_size
+
+        # Every later stage is skipped when its inputs hash to the same key as
+        # on the previous run and its outputs are still on disk.
+        manifest = stages.StageManifest(
+            csv_close.with_name(f".{csv_close.name}.stages.json")
+        )
+        analysis_key = stages.digest(
+            _STAGE_VERSION,
+            stages.file_digest(csv_all),
+            gene,
+            reference,
+            _METRIC,
+            max_distance,
+        )
+        df: Optional[pd.DataFrame] = None
+
+        # 2) Similarity scores
+        if manifest.is_fresh("analysis", analysis_key, [csv_close]):
+            logger.info("Records unchanged, reusing %s", csv_close)
+            for name in ("align", "images", "close_table"):
+                prof.skip(name)
+        else:
+            with prof.stage("align") as stats:
+                if records is None:
+                    records = _load_table(csv_all)
+                logger.info("Computing similarity distances")
+                before = _alignment_cache().stats()
+                results = [
+                    row
+                    for row in _analyse(records, reference, max_distance, distances)
+                    if row[1] is not None
+                ]
+                stats.update(records=len(records), kept=len(results))
+                stats["cache"] = profiling.cache_delta(
+                    before, _alignment_cache().stats()
+                )
+                if max_distance is not None:
+                    logger.info(
+                        "%d of %d species within distance %d",
+                        len(results),
+                        len(records),
+                        max_distance,
+                    )
+
+            with prof.stage("images") as stats:
+                logger.info("Resolving species images")
+                before = cache_stats()
+                failed: set[str] = set()
+                urls = image_urls(
+                    (r.species.scientific_name for r, _, _ in results), failed=failed
+                )
+                stats.update(species=len(urls), failed=len(failed))
+                stats["cache"] = profiling.cache_delta(before, cache_stats())
+
+            with prof.stage("close_table") as stats:
+                df = pd.DataFrame(
+                    {
+                        "name": r.species.common_name,
+                        "scientific_name": r.species.scientific_name,
+                        "taxonomy_id": r.species.taxonomy_id,
+                        "sequence": r.sequence,
+                        "sequence_length": len(r.sequence),
+                        "hamming_distance": dist,
+                        "image_url": urls[r.species.scientific_name] or "N/A",
+                        "different": mask,
+                    }
+                    for r, dist, mask in results
+                )
+
+                logger.info("Writing close species table to %s", csv_close)
+                store.write_table(df, csv_close)
+                stats.update(rows=len(df), bytes=csv_close.stat().st_size)
+                # Failed image lookups are not cached; record a key the next run
+                # will not match so it retries them instead of reusing "N/A".
+                if failed:
+                    logger.warning("%d image lookups failed, will retry", len(failed))
+                manifest.record(
+                    "analysis",
+                    stages.digest(analysis_key, sorted(failed))
+                    if failed
+                    else analysis_key,
+                    [csv_close],
+                )
+
+        outputs_key = stages.digest(_STAGE_VERSION, stages.file_digest(csv_close))
+
+        # 3) Distance graph
+        graph_key = stages.digest(outputs_key, layout)
+        # Precomputed positions as typed arrays for the Canvas viewer
+        graph_bin = graph_json.with_suffix(".bin")
+        graph_outputs = [graph_json, graph_bin, graph_html]
+        if manifest.is_fresh("graph", graph_key, graph_outputs):
+            logger.info("Distance graph up to date")
+            prof.skip("layout")
+            prof.skip("graph")
+        else:
+            with prof.stage("layout") as stats:
+                df = df if df is not None else store.read_table(csv_close)
+                graph = build_distance_graph(_distances_from_frame(df), reference)
+                pos = layouts.compute_layout(
+                    graph,
+                    layout,
+                    center=graph.graph["reference"],
+                    cache_path=graph_json.with_suffix(".positions.json"),
+                )
+                stats.update(
+                    nodes=graph.number_of_nodes(), edges=graph.number_of_edges()
+                )
+            with prof.stage("graph"):
+                graph_json.parent.mkdir(parents=True, exist_ok=True)
+                with graph_json.open("w", encoding="utf-8") as fh:
+                    json.dump(nx.json_graph.node_link_data(graph), fh)
+                graph_export.write_binary(graph, pos, graph_bin)
+                nx_vis.render_html(graph, graph_html, pos=pos)
+                manifest.record("graph", graph_key, graph_outputs)
+
+        # 4) Render concentric-circle HTML
+        report_key = stages.digest(outputs_key, report_page_size)
+        # A paged report also wrote band pages; check those recorded last time
+        recorded = manifest.outputs("report")
+        report_outputs = recorded if recorded[:1] == [html_out] else [html_out]
+        if manifest.is_fresh("report", report_key, report_outputs):
+            logger.info("HTML report up to date: %s", html_out)
+            prof.skip("report")
+        else:
+            with prof.stage("report") as stats:
+                df = df if df is not None else store.read_table(csv_close)
+                logger.info("Rendering HTML report to %s", html_out)
+                written = render_report(
+                    df.sort_values("hamming_distance"),
+                    html_out,
+                    report_page_size,
+                    reference=reference,
+                )
+                stats.update(
+                    files=len(written), bytes=sum(p.stat().st_size for p in written)
+                )
+                manifest.record("report", report_key, written)
+
+        prof.write(profiling.report_path(html_out))
+    return html_out
+
+
+# --------------------------------------------------------------------- #
+#  Multi-reference runs                                                 #
+# --------------------------------------------------------------------- #
+
+
+def run_references(
+    references: Iterable[str],
+    gene: str = DEFAULT_GENE,
+    force_refresh: bool = False,
+    store_format: Optional[str] = None,
+    max_distance: Optional[int] = None,
+    matrix_path: Optional[Path] = None,
+    **options,
+) -> dict[str, Path]:
+    """
+    Run the pipeline for *gene* against several reference species.
+
+    The records are fetched and loaded once, and their distances to every
+    reference come from one batched `similarity.reference_distances` pass.
+    That matrix is written to *matrix_path* (default:
+    ``[<gene>_]reference_distances`` in the record store format) with one
+    column per reference; cells beyond *max_distance* are left empty.  Each
+    reference then gets the usual artefacts under its own name (see
+    `artifact_paths`), reusing the precomputed distances.
+
+    Remaining keyword arguments are passed on to `run`.
+
+    Returns
+    -------
+    dict[str, Path]
+        HTML report per reference.
+
+    Raises
+    ------
+    ValueError
+        If a reference species is not among the records.
+    """
+    logger = logging.getLogger(__name__)
+    references = list(dict.fromkeys(references))
+    records = _load_table(ensure_records(gene, force_refresh, store_format))
+    matrix = reference_distances(records, references, max_distance=max_distance)
+
+    columns = {
+        "name": [r.species.common_name for r in records],
+        "scientific_name": [r.species.scientific_name for r in records],
+        "taxonomy_id": records.taxonomy_ids,
+    }
+    for ref, row in zip(references, matrix):
+        column = pd.Series(row)
+        if max_distance is not None:
+            column = column.where(column <= max_distance)
+        columns[ref] = column.astype("Int64")
+    matrix_path = matrix_path or store.with_format(
+        DATA_PROCESSED
+        / f"{'' if gene == DEFAULT_GENE else f'{gene}_'}reference_distances.csv",
+        store_format or store.default_format(),
     )
-    html_out = html_out or (
-        HTML_OUT
-        if gene == DEFAULT_GENE
-        else DATA_PROCESSED / f"{gene}_close_to_human.html"
+    store.write_table(pd.DataFrame(columns), matrix_path)
+    logger.info(
+        "Distances to %d references written to %s", len(references), matrix_path
     )
-    # 1) Fetch or use cached data
-    if force_refresh or not csv_all.exists():
-        logger.info("Fetching sequences from UniProt")
-        records = fetch_gene_sequences(gene)
-        _save_records(records, csv_all)
 
-    records = _load_records(csv_all)
+    return {
+        ref: run(
+            gene=gene,
+            store_format=store_format,
+            max_distance=max_distance,
+            reference=ref,
+            distances=row,
+            records=records,
+            **options,
+        )
+        for ref, row in zip(references, matrix.tolist())
+    }
+
 
-    # 2) Similarity scores
-    logger.info("Computing similarity distances")
-    distances = compute_distances(records)
-    human_seq = next(
-        r.sequence for r in records if r.species.common_name.lower() == "human"
-    )
+# --------------------------------------------------------------------- #
+#  Multi-gene batch runs                                                #
+# --------------------------------------------------------------------- #
 
-    df = pd.DataFrame(
-        {
-            "name": r.species.common_name,
-            "scientific_name": r.species.scientific_name,
-            "taxonomy_id": r.species.taxonomy_id,
-            "sequence": r.sequence,
-            "sequence_length": len(r.sequence),
-            "hamming_distance": dist,
-            "image_url": image_url(r.species.scientific_name) or "N/A",
-            "different": difference_mask(human_seq, r.sequence),
+
+def _run_gene(gene: str, options: dict) -> dict:
+    """Run the pipeline for one gene and summarise it (pool worker)."""
+    logger = logging.getLogger(__name__)
+    start = time.perf_counter()
+    try:
+        report = run(gene=gene, **options)
+    except Exception as exc:
+        logger.exception("Pipeline failed for %s", gene)
+        return {
+            "gene": gene,
+            "status": f"failed: {exc}",
+            "seconds": time.perf_counter() - start,
         }
-        for r, dist in distances
+    reference = options.get("reference", REFERENCE)
+    close = store.read_table(
+        artifact_paths(
+            gene, options.get("store_format"), reference=reference
+        ).csv_close,
+        ["name", "hamming_distance"],
     )
+    others = close[close["name"].str.lower() != reference.lower()]
+    nearest = others.nsmallest(1, "hamming_distance")
+    return {
+        "gene": gene,
+        "status": "ok",
+        "species": len(close),
+        "nearest": nearest["name"].iloc[0] if len(nearest) else None,
+        "nearest_distance": (
+            int(nearest["hamming_distance"].iloc[0]) if len(nearest) else None
+        ),
+        "report": str(report),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def run_many(
+    genes: Iterable[str],
+    workers: Optional[int] = None,
+    force_refresh: bool = False,
+    store_format: Optional[str] = None,
+    max_distance: Optional[int] = None,
+    summary_path: Optional[Path] = None,
+    layout: str = "auto",
+    report_page_size: Optional[int] = REPORT_PAGE_SIZE,
+    profile: bool = False,
+    reference: str = REFERENCE,
+) -> Path:
+    """
+    Run the pipeline for several genes in one batch.
+
+    Genes are fetched in parallel first.  The union of their species images
+    is then resolved once in this process, which fills the shared on-disk
+    image cache, so every per-gene run afterwards only sees cache hits.
+    The per-gene analyses and renders finally run in parallel too.  Workers
+    share the HTTP, image and alignment caches, which all live on disk.
+
+    Parameters
+    ----------
+    genes
+        Gene identifiers; duplicates are ignored.
+    workers
+        Size of the process pool (default: one per gene, capped at the CPU
+        count).  ``1`` runs everything in this process.
+    summary_path
+        Where to write the combined JSON summary (default:
+        ``BATCH_SUMMARY``).
+
+    Returns
+    -------
+    Path
+        Location of the JSON summary; per-gene artefacts are written to the
+        usual per-gene paths (see `artifact_paths`).
+    """
+    logger = logging.getLogger(__name__)
+    genes = list(dict.fromkeys(genes))
+    workers = workers or max(1, min(len(genes), os.cpu_count() or 1))
+    logger.info("Batch run of %d genes on %d workers", len(genes), workers)
+    options = {
+        "store_format": store_format,
+        "max_distance": max_distance,
+        "layout": layout,
+        "report_page_size": report_page_size,
+        "profile": profile,
+        "reference": reference,
+    }
+
+    with (
+        ProcessPoolExecutor(max_workers=workers) if workers > 1 else _InlineExecutor()
+    ) as pool:
+        # 1) Fetch (network bound)
+        fetches = {
+            g: pool.submit(ensure_records, g, force_refresh, store_format)
+            for g in genes
+        }
+        summary: list[dict] = []
+        fetched: dict[str, Path] = {}
+        for gene, future in fetches.items():
+            try:
+                fetched[gene] = future.result()
+            except Exception as exc:
+                logger.error("Fetching %s failed: %s", gene, exc)
+                summary.append({"gene": gene, "status": f"fetch failed: {exc}"})
+
+        # 2) Images for every species of every gene, deduplicated.  With a
+        # cutoff most species are dropped, so leave lookups to the workers.
+        if max_distance is None and fetched:
+            names: set[str] = set()
+            for path in fetched.values():
+                names.update(
+                    store.read_table(path, ["scientific_name"])["scientific_name"]
+                )
+            logger.info("Resolving images for %d species across genes", len(names))
+            image_urls(sorted(names))
+
+        # 3) Per-gene analysis and rendering
+        runs = [pool.submit(_run_gene, g, options) for g in fetched]
+        summary.extend(f.result() for f in runs)
+
+    summary_path = summary_path or BATCH_SUMMARY
+    summary_path.parent.mkdir(parents=True, exist_ok=True)
+    summary.sort(key=lambda row: genes.index(row["gene"]))
+    summary_path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    logger.info("Batch summary written to %s", summary_path)
+    return summary_path
+
+
+class _InlineExecutor(Executor):
+    """Executor that runs every task immediately in the calling process."""
 
-    logger.info("Writing close species CSV to %s", csv_close)
-    df.to_csv(csv_close, index=False)
-    # 3) Distance graph
-    graph = build_distance_graph(distances)
-    pos = nx.spring_layout(graph, pos={"Human": (0.0, 0.0)}, fixed=["Human"])
-    d = nx.json_graph.node_link_data(graph)
-    json.dump(d, open(GRAPH_JSON, "w"))
-    nx_vis.render_html(graph, GRAPH_HTML, pos=pos)
-
-    # 4) Render concentric-circle HTML
-    logger.info("Rendering HTML report to %s", HTML_OUT)
-    return render_html(df.sort_values("hamming_distance"), HTML_OUT)
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as exc:
+            future.set_exception(exc)
+        return future
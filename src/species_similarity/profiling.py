@@ -0,0 +1,145 @@
+"""
+Per-stage timing and memory instrumentation for pipeline runs.
+
+A `RunProfile` is threaded through `pipeline.run`; every stage is wrapped in
+``with profile.stage(name) as stats:`` and may add its own counters (record
+counts, cache hits) to *stats*.  The collected report is written as JSON next
+to the run's artefacts.  Use the profile itself as a context manager so that
+memory tracing is stopped even when a stage raises.
+
+Wall and CPU time are always recorded.  Peak RSS comes from
+`resource.getrusage` where available (it is a process-wide high-water mark,
+so it only ever grows across stages).  Python heap peaks per stage need
+`tracemalloc`, which slows allocation-heavy code down noticeably, so they
+are only collected with ``trace_memory=True``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from types import TracebackType
+from typing import Iterator, Mapping, Optional, Type
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+__all__ = ["RunProfile", "cache_delta", "report_path"]
+
+_MB = 1024 * 1024
+
+
+def report_path(html_out: Path) -> Path:
+    """Where the run report for the report at *html_out* is written."""
+    return html_out.with_suffix(".run.json")
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / _MB if sys.platform == "darwin" else peak / 1024
+
+
+def cache_delta(before: Mapping[str, float], after: Mapping[str, float]) -> dict:
+    """Hits, misses and hit rate between two `KeyValueCache.stats` snapshots."""
+    hits = int(after["hits"] - before["hits"])
+    misses = int(after["misses"] - before["misses"])
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / total if total else 0.0,
+    }
+
+
+class RunProfile:
+    """
+    Collects per-stage statistics for one run.
+
+    Parameters
+    ----------
+    trace_memory
+        Also record the peak traced Python heap of every stage.
+    """
+
+    def __init__(self, trace_memory: bool = False) -> None:
+        self.stages: list[dict] = []
+        self.info: dict[str, object] = {}
+        self._started = datetime.now(timezone.utc)
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        self._owns_tracing = trace_memory and not tracemalloc.is_tracing()
+        self.trace_memory = trace_memory
+        if self._owns_tracing:
+            tracemalloc.start()
+
+    def __enter__(self) -> RunProfile:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop memory tracing if this profile started it; idempotent."""
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[dict]:
+        """Time the body of the ``with`` block as stage *name*."""
+        stats: dict = {"stage": name}
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield stats
+        finally:
+            stats["wall_s"] = time.perf_counter() - wall
+            stats["cpu_s"] = time.process_time() - cpu
+            stats["peak_rss_mb"] = _peak_rss_mb()
+            if self.trace_memory:
+                stats["peak_traced_mb"] = tracemalloc.get_traced_memory()[1] / _MB
+            self.stages.append(stats)
+            logging.getLogger(__name__).debug("Stage %s: %s", name, stats)
+
+    def skip(self, name: str, reason: str = "up to date") -> None:
+        """Record that stage *name* did not run."""
+        self.stages.append({"stage": name, "skipped": reason})
+
+    def report(self) -> dict:
+        """Return the run report collected so far."""
+        return {
+            "started": self._started.isoformat(timespec="seconds"),
+            **self.info,
+            "total": {
+                "wall_s": time.perf_counter() - self._wall,
+                "cpu_s": time.process_time() - self._cpu,
+                "peak_rss_mb": _peak_rss_mb(),
+            },
+            "stages": self.stages,
+        }
+
+    def write(self, path: Path) -> Path:
+        """Write `report` as JSON to *path* and stop tracing if we started it."""
+        self.close()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(), indent=2), encoding="utf-8")
+        logging.getLogger(__name__).info("Run report written to %s", path)
+        return path
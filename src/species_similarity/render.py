@@ -1,25 +1,43 @@
 """
-HTML rendering: place *Homo sapiens* at the centre and arrange the remaining
-species on concentric circles whose radii grow with their Hamming distance.
+HTML rendering: place the reference species (*Homo sapiens* by default) at
+the centre and arrange the remaining species on concentric circles whose
+radii grow with their distance to it.
 
 The layout is pure HTML + CSS (no JS).  Each species becomes an absolutely
 positioned `<div>` inside a fixed-size square “radar” container.  Positions
 are pre-computed in Python so the Jinja template only loops and prints.
+They are produced lazily and the template is streamed to disk, so neither
+the per-species rows nor the whole document are held in memory at once.
+
+Large species sets are split by `render_paged` into distance-band pages of
+bounded size, linked from an index page and described by a JSON index.
+Images are loaded lazily either way.
 """
 
 from __future__ import annotations
 
-import math
+import json
+import logging
+import shutil
 from pathlib import Path
-from typing import Iterable
+from typing import Final, Iterable, Iterator, Optional
 
 import jinja2
+import numpy as np
 import pandas as pd
 
+from .config import REFERENCE, STREAM_BUFFER
+
 # --------------------------------------------------------------------------- #
 #  Public API                                                                 #
 # --------------------------------------------------------------------------- #
-__all__ = ["render_concentric"]
+__all__ = ["render_concentric", "render_paged", "render_report"]
+
+# Minimum arc (px) between neighbours on a ring; crowded rings are wrapped
+# into sub-rings spread across the gap to the next ring
+MIN_ARC: Final[float] = 40.0
+# Most species drawn on one report page
+REPORT_PAGE_SIZE: Final[int] = 500
 
 # --------------------------------------------------------------------------- #
 #  Template                                                                   #
@@ -63,18 +81,26 @@ _TEMPLATE = jinja2.Template(
       display: block;
       margin: 0 auto .25rem;
   }
-  .human { font-weight: 600; }
+  .reference { font-weight: 600; }
 </style>
 </head>
 <body>
 <h2 class="mb-4">β-globin similarity (Hamming distance)</h2>
+{% if nav %}
+<p class="mb-4">
+  Distances {{ nav.band }} &nbsp;|&nbsp;
+  {% if nav.prev %}<a href="{{ nav.prev }}">&larr; closer</a> &nbsp;|&nbsp;{% endif %}
+  <a href="{{ nav.index }}">all bands</a>
+  {% if nav.next %}&nbsp;|&nbsp; <a href="{{ nav.next }}">further &rarr;</a>{% endif %}
+</p>
+{% endif %}
 
 <div id="radar">
-  {# Human at centre #}
-  <div class="species human"
+  {# Reference species at centre #}
+  <div class="species reference"
        style="left: {{ center }}px; top: {{ center }}px;">
-    {% if human.image_url %}<img src="{{ human.image_url }}" alt="Human">{% endif %}
-    Human<br><small>(0)</small>
+    {% if reference.image_url %}<img src="{{ reference.image_url }}" alt="{{ reference.name }}" loading="lazy">{% endif %}
+    {{ reference.name }}<br><small>(0)</small>
   </div>
 
   {# Other species #}
@@ -82,7 +108,7 @@ _TEMPLATE = jinja2.Template(
     <div class="species"
          style="left: {{ sp.x }}px; top: {{ sp.y }}px;">
       {% if sp.image_url %}
-        <img src="{{ sp.image_url }}" alt="{{ sp.name }}">
+        <img src="{{ sp.image_url }}" alt="{{ sp.name }}" loading="lazy" decoding="async">
       {% endif %}
       {{ sp.name }}<br><small>({{ sp.dist }})</small>
     </div>
@@ -91,64 +117,120 @@ _TEMPLATE = jinja2.Template(
 
 <p class="mt-4 text-muted">
   Ring spacing&nbsp;=&nbsp;{{ ring_spacing }}px &nbsp;|&nbsp;
-  0&nbsp;=&nbsp;Human
+  0&nbsp;=&nbsp;{{ reference.name }}
 </p>
 </body>
 </html>
 """
 )
 
+_INDEX_TEMPLATE = jinja2.Template(
+    """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8" />
+<title>β-globin similarity – distance bands</title>
+<link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css"
+      rel="stylesheet" />
+</head>
+<body class="p-4">
+<h2 class="mb-4">β-globin similarity (Hamming distance)</h2>
+<p class="text-muted">{{ species }} species in {{ pages|length }} pages</p>
+<table class="table table-sm w-auto mx-auto">
+  <thead><tr><th>Distances</th><th>Species</th></tr></thead>
+  <tbody>
+  {% for page in pages %}
+    <tr>
+      <td><a href="{{ page.page }}">{{ page.min_distance }}–{{ page.max_distance }}</a></td>
+      <td>{{ page.species }}</td>
+    </tr>
+  {% endfor %}
+  </tbody>
+</table>
+</body>
+</html>
+"""
+)
+
 # --------------------------------------------------------------------------- #
 #  Helpers                                                                    #
 # --------------------------------------------------------------------------- #
 
 
-def _polar_to_cart(
-    radius: float, angle_deg: float, centre: float
-) -> tuple[float, float]:
-    """Convert polar coordinates to screen X,Y (top-left origin)."""
-    rad = math.radians(angle_deg)
-    x = centre + radius * math.cos(rad)
-    y = centre + radius * math.sin(rad)
-    return x, y
+def _split_reference(
+    df: pd.DataFrame, reference: str
+) -> tuple[pd.DataFrame, pd.Series]:
+    """Return the first row of *reference* (as a frame) and a mask of the others."""
+    is_ref = df["name"].str.lower() == reference.lower()
+    if not is_ref.any():
+        raise ValueError(f"Reference species '{reference}' not in report data")
+    return df.loc[is_ref].iloc[[0]], ~is_ref
 
 
-def _prepare_positions(df: pd.DataFrame, size: int, ring_spacing: int):
+def _prepare_positions(
+    df: pd.DataFrame,
+    size: int,
+    ring_spacing: int,
+    min_arc: float = MIN_ARC,
+    reference: str = REFERENCE,
+) -> tuple[dict, Iterator[dict]]:
     """
-    Returns dicts for Jinja: *human* entry + list[*others*] with x,y coords.
+    Returns dicts for Jinja: *reference* entry + lazy iterator of *others*
+    with x,y coords.
+
+    Raises
+    ------
+    ValueError
+        If *df* has no row for *reference*.
     """
-    # ------------------------------------------------------------------ #
-    # Split                                                                   #
-    # ------------------------------------------------------------------ #
-    human_row = df.loc[df["name"].str.lower() == "human"].iloc[0]
-    others_df = df.loc[df["name"].str.lower() != "human"].copy()
-
-    # ------------------------------------------------------------------ #
-    # Group by distance → ring index                                       #
-    # ------------------------------------------------------------------ #
-    rings = (
-        others_df.groupby("hamming_distance", sort=True)
-        .apply(lambda g: g.to_dict("records"), include_groups=False)
-        .to_dict()
-    )
+    ref_rows, is_other = _split_reference(df, reference)
+    ref_row = ref_rows.iloc[0]
+    # Only the columns the template prints; a stable sort keeps the input
+    # order within each ring
+    others = df.loc[is_other, ["name", "image_url", "hamming_distance"]]
+    others = others.sort_values("hamming_distance", kind="stable")
 
-    centre = size / 2
-    others_out = []
-
-    for ring_idx, (dist, rows) in enumerate(rings.items(), start=1):
-        radius = ring_idx * ring_spacing
-        step = 360 / len(rows)
-        for i, row in enumerate(rows):
-            angle = i * step
-            x, y = _polar_to_cart(radius, angle, centre)
-            row.update({"x": x, "y": y, "dist": dist})
-            others_out.append(row)
-
-    human = {
-        "name": human_row["name"],
-        "image_url": human_row.get("image_url", ""),
+    dist = others["hamming_distance"].to_numpy()
+    x, y = _ring_layout(dist, size / 2, ring_spacing, min_arc)
+    centre = {
+        "name": ref_row["name"],
+        "image_url": ref_row.get("image_url", ""),
     }
-    return human, others_out
+    rows = zip(
+        others["name"].tolist(), others["image_url"].tolist(), dist.tolist(), x, y
+    )
+    others_out = (
+        {"name": name, "image_url": url, "dist": d, "x": px, "y": py}
+        for name, url, d, px, py in rows
+    )
+    return centre, others_out
+
+
+def _ring_layout(
+    dist: np.ndarray, centre: float, ring_spacing: int, min_arc: float
+) -> tuple[list[float], list[float]]:
+    """
+    Screen coordinates for species sorted by distance, one ring per distance.
+
+    A ring holding more than ``circumference / min_arc`` species is split
+    round-robin into sub-rings evenly spaced between it and the next ring.
+    """
+    _, first, counts = np.unique(dist, return_index=True, return_counts=True)
+    ring = np.repeat(np.arange(1, len(counts) + 1), counts)
+    index = np.arange(len(dist)) - np.repeat(first, counts)
+
+    radius = np.arange(1, len(counts) + 1) * ring_spacing
+    capacity = np.maximum(1, (2 * np.pi * radius // min_arc).astype(np.int64))
+    subrings = np.repeat(-(-counts // capacity), counts)
+    count = np.repeat(counts, counts)
+
+    sub = index % subrings
+    slot = index // subrings
+    sub_size = (count - sub + subrings - 1) // subrings
+    angle = np.radians(slot * (360 / sub_size))
+    r = ring * ring_spacing + sub * (ring_spacing / subrings)
+    return (centre + r * np.cos(angle)).tolist(), (centre + r * np.sin(angle)).tolist()
 
 
 # --------------------------------------------------------------------------- #
@@ -161,6 +243,9 @@ def render_concentric(
     out_path: Path,
     size: int = 800,
     ring_spacing: int = 120,
+    min_arc: float = MIN_ARC,
+    nav: Optional[dict] = None,
+    reference: str = REFERENCE,
 ) -> Path:
     """
     Render *df* (must include columns `name`, `hamming_distance`, `image_url`)
@@ -176,19 +261,175 @@ def render_concentric(
         Width/height of the square radar container (px).
     ring_spacing
         Distance (px) between successive rings.
+    min_arc
+        Minimum spacing (px) between species on one ring before the ring is
+        wrapped into sub-rings.
+    nav
+        Links to the neighbouring pages when rendering one page of
+        `render_paged`.
+    reference
+        Common name of the species drawn at the centre (matched
+        case-insensitively).
     """
     if not isinstance(df, pd.DataFrame):
         df = pd.DataFrame(df)
 
-    human, others = _prepare_positions(df, size, ring_spacing)
-    html = _TEMPLATE.render(
+    centre, others = _prepare_positions(df, size, ring_spacing, min_arc, reference)
+    stream = _TEMPLATE.stream(
         size=size,
         ring_spacing=ring_spacing,
         center=size / 2,
-        human=human,
+        reference=centre,
         others=others,
+        nav=nav,
     )
+    stream.enable_buffering(STREAM_BUFFER)
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(html, encoding="utf-8")
+    stream.dump(str(out_path), encoding="utf-8")
     return out_path
+
+
+def _bands(dist: np.ndarray, page_size: int) -> list[tuple[int, int]]:
+    """
+    Split sorted *dist* into ``[start, stop)`` pages of at most *page_size*.
+
+    Pages end on a change of distance whenever possible; only a single
+    distance shared by more than *page_size* species is split across pages.
+    """
+    _, first = np.unique(dist, return_index=True)
+    bounds = [*first.tolist(), len(dist)]
+    pages: list[tuple[int, int]] = []
+    start = 0
+    for ring_start, ring_stop in zip(bounds, bounds[1:]):
+        if ring_stop - start > page_size and ring_start > start:
+            pages.append((start, ring_start))
+            start = ring_start
+        while ring_stop - start > page_size:
+            pages.append((start, start + page_size))
+            start += page_size
+    if start < len(dist):
+        pages.append((start, len(dist)))
+    return pages
+
+
+def _pages_dir(out_path: Path) -> Path:
+    return out_path.with_name(f"{out_path.stem}_pages")
+
+
+def render_paged(
+    df: pd.DataFrame | Iterable[dict],
+    out_path: Path,
+    page_size: int = REPORT_PAGE_SIZE,
+    size: int = 800,
+    ring_spacing: int = 120,
+    min_arc: float = MIN_ARC,
+    reference: str = REFERENCE,
+) -> list[Path]:
+    """
+    Render *df* as concentric pages of at most *page_size* species each.
+
+    Species are sorted by distance and cut into contiguous distance bands.
+    Each band is drawn around *reference* on its own page in a ``<stem>_pages``
+    folder next to *out_path*.  *out_path* becomes an index page linking to
+    every band, and ``<stem>.json`` lists the bands (page, distance range,
+    species count) for scripts or client-side viewers.
+
+    Returns
+    -------
+    list[Path]
+        Every file written: the index page, the JSON index and the pages.
+
+    Raises
+    ------
+    ValueError
+        If *page_size* is less than 1.
+    """
+    logger = logging.getLogger(__name__)
+    if page_size < 1:
+        raise ValueError(f"page_size must be at least 1, got {page_size}")
+    if not isinstance(df, pd.DataFrame):
+        df = pd.DataFrame(df)
+
+    centre, is_other = _split_reference(df, reference)
+    others = df.loc[is_other].sort_values("hamming_distance", kind="stable")
+    dist = others["hamming_distance"].to_numpy()
+    bands = _bands(dist, page_size)
+
+    pages_dir = _pages_dir(out_path)
+    pages_dir.mkdir(parents=True, exist_ok=True)
+    for stale in pages_dir.glob("page_*.html"):
+        stale.unlink()
+    pages = [pages_dir / f"page_{i:04d}.html" for i in range(1, len(bands) + 1)]
+    logger.info("Rendering %d species on %d pages", len(others), len(pages))
+
+    index = []
+    for i, ((start, stop), page) in enumerate(zip(bands, pages)):
+        band = f"{dist[start]}–{dist[stop - 1]}"
+        nav = {
+            "band": band,
+            "index": f"../{out_path.name}",
+            "prev": pages[i - 1].name if i > 0 else None,
+            "next": pages[i + 1].name if i + 1 < len(pages) else None,
+        }
+        render_concentric(
+            pd.concat([centre, others.iloc[start:stop]]),
+            page,
+            size=size,
+            ring_spacing=ring_spacing,
+            min_arc=min_arc,
+            nav=nav,
+            reference=reference,
+        )
+        index.append(
+            {
+                "page": f"{pages_dir.name}/{page.name}",
+                "min_distance": int(dist[start]),
+                "max_distance": int(dist[stop - 1]),
+                "species": stop - start,
+            }
+        )
+
+    index_json = out_path.with_suffix(".json")
+    index_json.write_text(
+        json.dumps({"species": len(others), "pages": index}, indent=2),
+        encoding="utf-8",
+    )
+    _INDEX_TEMPLATE.stream(species=len(others), pages=index).dump(
+        str(out_path), encoding="utf-8"
+    )
+    return [out_path, index_json, *pages]
+
+
+def render_report(
+    df: pd.DataFrame,
+    out_path: Path,
+    page_size: Optional[int] = REPORT_PAGE_SIZE,
+    reference: str = REFERENCE,
+) -> list[Path]:
+    """
+    Render a single concentric page, or `render_paged` output once *df*
+    holds more than *page_size* species (``None`` never paginates), centred
+    on *reference*.  A single page replaces any earlier paged output: the
+    band pages and the JSON index are removed.
+
+    Returns
+    -------
+    list[Path]
+        Every file written; the first one is *out_path*.
+
+    Raises
+    ------
+    ValueError
+        If *page_size* is less than 1.
+    """
+    if page_size is not None and page_size < 1:
+        raise ValueError(f"page_size must be at least 1, got {page_size}")
+    if page_size is None or len(df) - 1 <= page_size:
+        pages_dir = _pages_dir(out_path)
+        if pages_dir.is_dir():
+            logging.getLogger(__name__).info("Removing stale pages %s", pages_dir)
+            shutil.rmtree(pages_dir)
+            out_path.with_suffix(".json").unlink(missing_ok=True)
+        return [render_concentric(df, out_path, reference=reference)]
+    return render_paged(df, out_path, page_size, reference=reference)
@@ -0,0 +1,315 @@
+"""
+Long-running query service over one gene's records.
+
+The batch pipeline recomputes every artefact per run.  `SimilarityIndex`
+instead loads a record store once, keeps the sequences in a `SequenceTable`
+plus the distance of every record to the reference in memory, and answers
+point queries:
+
+* distance between two species,
+* the *k* species closest to a given one (shortlisted with a MinHash
+  `sketch.SketchIndex`, then confirmed with exact distances),
+* the difference mask of a species against the reference (or any other).
+
+Answers are memoised in a per-index LRU cache keyed by table row, so
+``"Human"``, ``"homo sapiens"`` and ``9606`` share one entry.  `create_app`
+exposes the index over HTTP with Flask; alignment-heavy work runs on a
+bounded thread pool so a burst of requests cannot starve the server.
+"""
+
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Final, Optional, TypeVar, Union
+
+import flask
+import numpy as np
+from rapidfuzz import process
+from rapidfuzz.distance import Levenshtein
+
+from . import store
+from .config import REFERENCE
+from .similarity import align, encode_mask
+from .sketch import SketchIndex, sketch_path
+from .table import SequenceTable
+
+__all__ = ["SimilarityIndex", "UnknownSpecies", "create_app"]
+
+RESULT_CACHE_SIZE: Final[int] = 4096
+MAX_K: Final[int] = 1000
+POOL_WORKERS: Final[int] = 4
+QUERY_TIMEOUT: Final[float] = 30.0
+# Sketch matches aligned exactly per `closest` query
+CANDIDATES: Final[int] = 200
+
+T = TypeVar("T")
+
+
+class UnknownSpecies(KeyError):
+    """Raised when a query names a species that is not in the index."""
+
+
+class SimilarityIndex:
+    """
+    In-memory index over a `SequenceTable`.
+
+    Parameters
+    ----------
+    table
+        Records to serve.
+    reference
+        Common name, scientific name or taxonomy ID of the reference species.
+    cache_size
+        Entries kept by each LRU result cache; ``None`` is unbounded.
+    candidates
+        Rows aligned exactly per `closest` query, chosen by MinHash sketch
+        similarity; ``None`` aligns every row.
+    sketch
+        Prebuilt sketches of *table* (see `from_path`); built on demand.
+
+    Raises
+    ------
+    UnknownSpecies
+        If *reference* is not in *table*.
+    """
+
+    def __init__(
+        self,
+        table: SequenceTable,
+        reference: Union[str, int] = REFERENCE,
+        cache_size: Optional[int] = RESULT_CACHE_SIZE,
+        candidates: Optional[int] = CANDIDATES,
+        sketch: Optional[SketchIndex] = None,
+    ) -> None:
+        logger = logging.getLogger(__name__)
+        self.table = table
+        self._sequences = table.sequences()
+        self._lookup: dict[str, int] = {}
+        for i, record in enumerate(table):
+            for key in (
+                record.species.common_name,
+                record.species.scientific_name,
+                str(record.species.taxonomy_id),
+            ):
+                # first record wins for species with several sequences
+                self._lookup.setdefault(key.lower(), i)
+        self.reference = self.resolve(reference)
+        logger.info(
+            "Indexing %d records against %s",
+            len(table),
+            table[self.reference].species.common_name,
+        )
+        self.reference_distances = self._distances_from(self.reference)
+        self.candidates = candidates
+        if candidates is not None and sketch is None:
+            sketch = SketchIndex.build(self._sequences)
+        self.sketch = sketch
+
+        self._distance = lru_cache(maxsize=cache_size)(self._distance_uncached)
+        self._closest = lru_cache(maxsize=cache_size)(self._closest_uncached)
+        self._mask = lru_cache(maxsize=cache_size)(self._mask_uncached)
+
+    @classmethod
+    def from_path(cls, path: Path, **kwargs) -> SimilarityIndex:
+        """
+        Load the record store at *path* (CSV, Parquet or Arrow).
+
+        The sketches are persisted next to the store and reused while the
+        records are unchanged.
+        """
+        table = store.load_table(path)
+        if kwargs.get("candidates", CANDIDATES) is not None:
+            kwargs.setdefault(
+                "sketch", SketchIndex.for_records(table, sketch_path(path))
+            )
+        return cls(table, **kwargs)
+
+    # ------------------------------------------------------------------ #
+    # Lookup                                                             #
+    # ------------------------------------------------------------------ #
+
+    def resolve(self, species: Union[str, int]) -> int:
+        """Row of *species*, given a common or scientific name or taxonomy ID."""
+        try:
+            return self._lookup[str(species).strip().lower()]
+        except KeyError:
+            raise UnknownSpecies(species) from None
+
+    def describe(self, row: int) -> dict:
+        species = self.table[row].species
+        return {
+            "name": species.common_name,
+            "scientific_name": species.scientific_name,
+            "taxonomy_id": species.taxonomy_id,
+        }
+
+    def _distances_from(
+        self, row: int, rows: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Distances from *row* to *rows* (default: every row), on all cores."""
+        seqs = self._sequences
+        return process.cdist(
+            [seqs[row]],
+            seqs if rows is None else [seqs[i] for i in rows.tolist()],
+            scorer=Levenshtein.distance,
+            dtype="int32",
+            workers=-1,
+        )[0]
+
+    def _candidates(self, row: int, k: int) -> Optional[np.ndarray]:
+        """Sketch shortlist for *row*, in table order; ``None`` means all rows."""
+        size = max(k + 1, self.candidates or 0)
+        if self.sketch is None or size >= len(self._sequences):
+            return None
+        shortlist = self.sketch.query(self._sequences[row], top_k=size)
+        return np.unique([i for i, _ in shortlist])
+
+    # ------------------------------------------------------------------ #
+    # Queries                                                            #
+    # ------------------------------------------------------------------ #
+
+    def distance(self, a: Union[str, int], b: Union[str, int]) -> int:
+        """Levenshtein distance between species *a* and *b*."""
+        i, j = sorted((self.resolve(a), self.resolve(b)))
+        return self._distance(i, j)
+
+    def _distance_uncached(self, i: int, j: int) -> int:
+        if i == self.reference:
+            return int(self.reference_distances[j])
+        if j == self.reference:
+            return int(self.reference_distances[i])
+        return Levenshtein.distance(self._sequences[i], self._sequences[j])
+
+    def closest(self, species: Union[str, int], k: int = 10) -> list[dict]:
+        """
+        The *k* species closest to *species* (itself excluded), nearest first.
+
+        Ties are broken by table order.  Queries for the reference use the
+        precomputed distances.  Any other species is aligned against the
+        ``candidates`` rows with the most similar sketches only, so a
+        distant match with few shared k-mers may be missed.
+        """
+        if k < 1:
+            raise ValueError("k must be positive")
+        return self._closest(self.resolve(species), k)
+
+    def _closest_uncached(self, row: int, k: int) -> list[dict]:
+        if row == self.reference:
+            rows, dists = None, self.reference_distances
+        else:
+            rows = self._candidates(row, k)
+            dists = self._distances_from(row, rows)
+        if rows is None:
+            rows = np.arange(len(dists))
+        keep = rows != row
+        rows, dists = rows[keep], dists[keep]
+        order = np.argsort(dists, kind="stable")[:k]
+        return [
+            {**self.describe(i), "distance": d}
+            for i, d in zip(rows[order].tolist(), dists[order].tolist())
+        ]
+
+    def mask(
+        self, species: Union[str, int], reference: Union[str, int, None] = None
+    ) -> dict:
+        """
+        Distance and run-length encoded difference mask of *species* against
+        *reference* (the index reference by default).
+        """
+        ref = self.reference if reference is None else self.resolve(reference)
+        return self._mask(self.resolve(species), ref)
+
+    def _mask_uncached(self, row: int, ref: int) -> dict:
+        alignment = align(self._sequences[ref], self._sequences[row])
+        return {
+            "distance": alignment.distance,
+            "mask": encode_mask(alignment.mask),
+        }
+
+    def cache_info(self) -> dict[str, dict]:
+        """Hit/miss counters of the result caches."""
+        return {
+            name: getattr(self, f"_{name}").cache_info()._asdict()
+            for name in ("distance", "closest", "mask")
+        }
+
+
+# --------------------------------------------------------------------- #
+#  HTTP front-end                                                       #
+# --------------------------------------------------------------------- #
+
+
+def create_app(
+    index: SimilarityIndex,
+    workers: int = POOL_WORKERS,
+    timeout: float = QUERY_TIMEOUT,
+) -> flask.Flask:
+    """
+    Flask app answering queries from *index*.
+
+    Routes (all ``GET``, all returning JSON)::
+
+        /distance?a=<species>&b=<species>
+        /closest?species=<species>&k=<int>
+        /mask?species=<species>[&reference=<species>]
+        /stats
+
+    Species are given by common name, scientific name or taxonomy ID.
+    Unknown species answer 404, malformed parameters 400.
+    """
+    app = flask.Flask(__name__)
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="query")
+    app.extensions["species_similarity"] = {"index": index, "pool": pool}
+
+    def run(fn: Callable[..., T], *args) -> T:
+        return pool.submit(fn, *args).result(timeout=timeout)
+
+    def arg(name: str) -> str:
+        value = flask.request.args.get(name, "").strip()
+        if not value:
+            flask.abort(400, f"Missing query parameter '{name}'")
+        return value
+
+    @app.errorhandler(UnknownSpecies)
+    def unknown_species(exc: UnknownSpecies):
+        return {"error": f"Unknown species {exc.args[0]!r}"}, 404
+
+    @app.errorhandler(400)
+    def bad_request(exc):
+        return {"error": exc.description}, 400
+
+    @app.get("/distance")
+    def distance():
+        a, b = arg("a"), arg("b")
+        return {"a": a, "b": b, "distance": run(index.distance, a, b)}
+
+    @app.get("/closest")
+    def closest():
+        species = arg("species")
+        k = flask.request.args.get("k", "10")
+        if not k.isdigit() or not 1 <= int(k) <= MAX_K:
+            flask.abort(400, f"k must be between 1 and {MAX_K}")
+        return {"species": species, "closest": run(index.closest, species, int(k))}
+
+    @app.get("/mask")
+    def mask():
+        species = arg("species")
+        reference = flask.request.args.get("reference") or None
+        return {
+            "species": species,
+            "reference": reference or index.table[index.reference].species.common_name,
+            **run(index.mask, species, reference),
+        }
+
+    @app.get("/stats")
+    def stats():
+        return {
+            "records": len(index.table),
+            "reference": index.describe(index.reference),
+            "cache": index.cache_info(),
+        }
+
+    return app
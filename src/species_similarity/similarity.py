@@ -3,22 +3,65 @@ Core similarity logic: Hamming distance + diff mask utilities.
 """
 
 from __future__ import annotations
-from rapidfuzz.distance import Levenshtein
+from rapidfuzz import process
+from rapidfuzz.distance import Editops, Hamming, Indel, Levenshtein
 
 
-from typing import Iterable
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Final,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
 import logging
-from tqdm.auto import tqdm
+import re
 
 from .config import SequenceRecord
 
+if TYPE_CHECKING:
+    import numpy as np
+
+# numpy (via `kernels`) and tqdm are imported by the functions that need
+# them, so the scalar helpers load with rapidfuzz alone.
+
 __all__ = [
     "hamming",
     "edit_distance",
     "difference_mask",
+    "encode_mask",
+    "decode_mask",
+    "mask_runs",
+    "mask_run_lengths",
+    "Alignment",
+    "align",
     "compute_distances",
+    "compute_alignments",
+    "reference_distances",
+    "distance_matrix",
+    "METRICS",
 ]
 
+# Scorers understood by `distance_matrix`, keyed by the public metric name.
+METRICS: Final[dict[str, Callable[..., int]]] = {
+    "levenshtein": Levenshtein.distance,
+    "indel": Indel.distance,
+    "hamming": Hamming.distance,
+}
+
+
+def _metric(name: str) -> Callable[..., int]:
+    """Scorer registered in ``METRICS`` under *name*."""
+    try:
+        return METRICS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown metric '{name}', expected one of {sorted(METRICS)}"
+        ) from None
+
 
 def hamming(a: str, b: str) -> int:
     """
@@ -31,11 +74,18 @@ def hamming(a: str, b: str) -> int:
     """
     if len(a) != len(b):
         raise ValueError("Sequences must be equal length")
-    return sum(c1 != c2 for c1, c2 in zip(a, b))
+    return Hamming.distance(a, b)
 
 
-def edit_distance(a: str, b: str) -> int:
-    return Levenshtein.distance(a, b)  # substitutions + indels
+def edit_distance(a: str, b: str, max_distance: Optional[int] = None) -> int:
+    """
+    Levenshtein distance (substitutions + indels) between *a* and *b*.
+
+    With *max_distance* set, rapidfuzz only explores a band of that width
+    around the diagonal and stops early once the cutoff cannot be met; any
+    distance beyond the cutoff is then reported as ``max_distance + 1``.
+    """
+    return Levenshtein.distance(a, b, score_cutoff=max_distance)
 
 
 def difference_mask(ref: str, other: str) -> str:
@@ -60,26 +110,193 @@ def difference_mask(ref: str, other: str) -> str:
     >>> difference_mask("ACGT", "ACGTA")      # insertion at end
     '00001'
     >>> difference_mask("ACGT", "AGT")        # deletion of 'C'
-    '001'        # only 'G','T' considered; 'A' and 'G' match, 'T' differs
+    '000'        # 'A','G','T' all align; the deleted 'C' has no position
     """
+    return _mask_from_editops(Levenshtein.editops(ref, other), len(other))
+
+
+def _mask_from_editops(ops: Editops, length: int) -> str:
     # Initialise all positions in `other` as matches
-    mask = ["0"] * len(other)
+    mask = bytearray(b"0" * length)
 
-    # Levenshtein.editops gives a minimal edit script
     # Types: "replace", "delete", "insert"
-    for op in Levenshtein.editops(ref, other):
-        if op.tag in ("replace", "insert"):
+    for tag, _, dest_pos in ops.as_list():
+        if tag != "delete":
             # For replace/insert the destination index refers to `other`
-            mask[op.dest_pos] = "1"
+            mask[dest_pos] = 0x31  # "1"
         # "delete" touches only `ref`; nothing to mark in `other`
 
-    return "".join(mask)
+    return mask.decode("ascii")
+
+
+# --------------------------------------------------------------------- #
+#  Compact mask encoding                                                #
+# --------------------------------------------------------------------- #
+
+# Prefix that tells an encoded mask apart from a plain '0'/'1' string.  It
+# must not start with "=", "+", "-" or "@", which spreadsheet programs read
+# as a formula when the CSV store is opened.
+_RLE_PREFIX: Final[str] = "rle:"
+# Prefix written by earlier versions; still read, rewritten by `encode_mask`
+_LEGACY_PREFIX: Final[str] = "="
+_RUN: Final[re.Pattern[str]] = re.compile("0+|1+")
+
+
+def encode_mask(mask: str) -> str:
+    """
+    Run-length encode a `difference_mask` for storage.
+
+    The result is ``"rle:"`` followed by comma-separated run lengths that
+    alternate between matches and mismatches, starting with matches.
+    Already encoded masks are returned unchanged, and masks encoded with
+    the older ``"="`` prefix are given the current one.
+
+    Examples
+    --------
+    >>> encode_mask("0001100")
+    'rle:3,2,2'
+    >>> encode_mask("1000")
+    'rle:0,1,3'
+    """
+    if mask.startswith(_RLE_PREFIX):
+        return mask
+    if mask.startswith(_LEGACY_PREFIX):
+        return _RLE_PREFIX + mask[len(_LEGACY_PREFIX) :]
+    lengths = [str(run.end() - run.start()) for run in _RUN.finditer(mask)]
+    if mask.startswith("1"):
+        lengths.insert(0, "0")
+    return _RLE_PREFIX + ",".join(lengths)
+
+
+def mask_run_lengths(mask: str) -> Optional[list[int]]:
+    """
+    Alternating match/mismatch run lengths of an encoded *mask* (starting
+    with matches), or ``None`` if *mask* is a plain '0'/'1' string.
+
+    Examples
+    --------
+    >>> mask_run_lengths("rle:3,2,2")
+    [3, 2, 2]
+    >>> mask_run_lengths("0001100") is None
+    True
+    """
+    for prefix in (_RLE_PREFIX, _LEGACY_PREFIX):
+        if mask.startswith(prefix):
+            body = mask[len(prefix) :]
+            return list(map(int, body.split(","))) if body else []
+    return None
+
+
+def decode_mask(mask: str) -> str:
+    """
+    Return the plain '0'/'1' form of *mask*, encoded or not.
+
+    Examples
+    --------
+    >>> decode_mask("rle:3,2,2")
+    '0001100'
+    """
+    runs = mask_run_lengths(mask)
+    if runs is None:
+        return mask
+    return "".join("01"[i & 1] * n for i, n in enumerate(runs))
+
+
+def mask_runs(mask: str) -> Iterator[tuple[int, int]]:
+    """
+    Yield ``(start, stop)`` of every mismatch run in *mask*, encoded or not,
+    without decoding it.
+
+    Examples
+    --------
+    >>> list(mask_runs("rle:3,2,2,1"))
+    [(3, 5), (7, 8)]
+    """
+    runs = mask_run_lengths(mask)
+    if runs is None:
+        for run in _RUN.finditer(mask):
+            if mask[run.start()] == "1":
+                yield run.span()
+        return
+    pos = 0
+    for i, n in enumerate(runs):
+        if i & 1 and n:
+            yield pos, pos + n
+        pos += n
+
+
+class Alignment(NamedTuple):
+    """Result of aligning one sequence against a reference."""
+
+    distance: int
+    mask: str
+    editops: Optional[Editops] = None
+
+
+def align(
+    ref: str,
+    other: str,
+    with_editops: bool = False,
+    max_distance: Optional[int] = None,
+) -> Optional[Alignment]:
+    """
+    Align *other* to *ref* once and derive both the Levenshtein distance and
+    the `difference_mask` from the same minimal edit script.
+
+    With unit costs the length of the minimal edit script *is* the
+    Levenshtein distance, so no second alignment is needed.  With
+    *max_distance* set, a cheap banded distance check runs first and
+    ``None`` is returned for pairs beyond the cutoff without building the
+    edit script.
+
+    Examples
+    --------
+    >>> align("ACGT", "AGT")
+    Alignment(distance=1, mask='000', editops=None)
+    >>> align("ACGT", "TTTTTT", max_distance=2) is None
+    True
+    """
+    if (
+        max_distance is not None
+        and edit_distance(ref, other, max_distance) > max_distance
+    ):
+        return None
+    ops = Levenshtein.editops(ref, other)
+    return Alignment(
+        len(ops), _mask_from_editops(ops, len(other)), ops if with_editops else None
+    )
+
+
+def _progress(items: Sequence, desc: str) -> Iterable:
+    from tqdm.auto import tqdm
+
+    return tqdm(items, desc=desc, unit="seq", leave=False)
+
+
+def _reference_sequence(records: Sequence[SequenceRecord], common_name: str) -> str:
+    try:
+        return next(
+            r.sequence
+            for r in records
+            if r.species.common_name.lower() == common_name.lower()
+        )
+    except StopIteration as exc:  # pragma: no cover
+        logging.getLogger(__name__).error(
+            "Reference '%s' not present in record set", common_name
+        )
+        raise ValueError(f"Reference species '{common_name}' not present") from exc
+
+
+def _within(dist: int, max_distance: Optional[int]) -> Optional[int]:
+    return None if max_distance is not None and dist > max_distance else dist
 
 
 def compute_distances(
     records: Iterable[SequenceRecord],
     reference_common_name: str = "Human",
-) -> list[tuple[SequenceRecord, int]]:
+    metric: str = "levenshtein",
+    max_distance: Optional[int] = None,
+) -> list[tuple[SequenceRecord, Optional[int]]]:
     """Return distances from each record to the reference species.
 
     Parameters
@@ -89,36 +306,171 @@ def compute_distances(
     reference_common_name
         The ``common_name`` of the species to which all distances should be
         computed.  Defaults to ``"Human"`` for backwards compatibility.
+    metric
+        One of ``METRICS``.  ``"hamming"`` compares all records of the
+        reference's length in one vectorised pass (see `kernels`).
+    max_distance
+        Optional cutoff.  Records further than this from the reference are
+        reported "far" with a distance of ``None``; for edit distances the
+        exact value is never computed for them.
 
     Raises
     ------
     ValueError
-        If the reference species is not present in ``records``.
+        If the reference species is not present in ``records`` or
+        ``metric`` is unknown.
     """
     logger = logging.getLogger(__name__)
 
     recs = list(records)
-    try:
-        ref_seq = next(
-            r.sequence
-            for r in recs
-            if r.species.common_name.lower() == reference_common_name.lower()
-        )
-    except StopIteration as exc:  # pragma: no cover
-        logger.error("Reference '%s' not present in record set", reference_common_name)
-        raise ValueError(
-            f"Reference species '{reference_common_name}' not present"
-        ) from exc
+    ref_seq = _reference_sequence(recs, reference_common_name)
+    scorer = _metric(metric)
+    if metric == "hamming":
+        from . import kernels
 
-    distances: list[tuple[SequenceRecord, int]] = []
-    for rec in tqdm(recs, desc="Computing distances", unit="seq", leave=False):
-        dist = edit_distance(rec.sequence, ref_seq)
+        dists = kernels.hamming_to_reference(ref_seq, [r.sequence for r in recs])
+        return [(rec, _within(d, max_distance)) for rec, d in zip(recs, dists.tolist())]
+    if metric != "levenshtein":
+        return [
+            (
+                rec,
+                _within(
+                    scorer(rec.sequence, ref_seq, score_cutoff=max_distance),
+                    max_distance,
+                ),
+            )
+            for rec in recs
+        ]
+
+    distances: list[tuple[SequenceRecord, Optional[int]]] = []
+    for rec in _progress(recs, "Computing distances"):
+        dist = _within(edit_distance(rec.sequence, ref_seq, max_distance), max_distance)
         logger.debug(
-            "Distance to %s for %s: %d",
+            "Distance to %s for %s: %s",
             reference_common_name,
             rec.species.common_name,
-            dist,
+            "far" if dist is None else dist,
         )
         distances.append((rec, dist))
 
     return distances
+
+
+def compute_alignments(
+    records: Iterable[SequenceRecord],
+    reference_common_name: str = "Human",
+    with_editops: bool = False,
+    max_distance: Optional[int] = None,
+) -> list[tuple[SequenceRecord, Optional[Alignment]]]:
+    """Return one fused `Alignment` per record against the reference species.
+
+    Equivalent to `compute_distances` followed by `difference_mask` for every
+    record, but each pair is aligned only once.  Records beyond
+    *max_distance* get ``None`` instead of an alignment.
+
+    Raises
+    ------
+    ValueError
+        If the reference species is not present in ``records``.
+    """
+    recs = list(records)
+    ref_seq = _reference_sequence(recs, reference_common_name)
+    return [
+        (rec, align(ref_seq, rec.sequence, with_editops, max_distance))
+        for rec in _progress(recs, "Aligning")
+    ]
+
+
+def reference_distances(
+    records: Sequence[SequenceRecord],
+    references: Sequence[str],
+    metric: str = "levenshtein",
+    max_distance: Optional[int] = None,
+    workers: int = -1,
+) -> np.ndarray:
+    """Return the distances from every record to each of several references.
+
+    All R reference sequences are scored against the N records in a single
+    batched ``process.cdist`` call, so rapidfuzz prepares the record
+    sequences once and spreads the R×N comparisons over *workers* threads,
+    instead of one `compute_distances` pass per reference.
+
+    Parameters
+    ----------
+    records
+        Sequence of ``SequenceRecord`` instances (or `table.SequenceTable`).
+    references
+        Common names of the reference species, all present in *records*.
+    metric
+        One of ``METRICS``.
+    max_distance
+        Optional cutoff; distances beyond it are reported as
+        ``max_distance + 1`` without being computed exactly.
+    workers
+        Number of threads used by rapidfuzz; ``-1`` uses every core.
+
+    Returns
+    -------
+    np.ndarray
+        ``(R, N)`` ``int32`` array; row ``i`` holds the distances to
+        ``references[i]``.
+
+    Raises
+    ------
+    ValueError
+        If a reference species is not present in ``records`` or ``metric``
+        is unknown.
+    """
+    logger = logging.getLogger(__name__)
+    scorer = _metric(metric)
+
+    seqs = [r.sequence for r in records]
+    ref_seqs = [_reference_sequence(records, name) for name in references]
+    logger.info(
+        "Computing %s distances of %d records to %d references",
+        metric,
+        len(seqs),
+        len(ref_seqs),
+    )
+    return process.cdist(
+        ref_seqs,
+        seqs,
+        scorer=scorer,
+        dtype="int32",
+        workers=workers,
+        score_cutoff=max_distance,
+    )
+
+
+def distance_matrix(
+    records: Sequence[SequenceRecord],
+    metric: str = "levenshtein",
+    workers: int = -1,
+) -> np.ndarray:
+    """Return the symmetric N×N distance matrix between all ``records``.
+
+    The work is handed to rapidfuzz's batched ``process.cdist``.  Because the
+    same sequence list is passed as both *queries* and *choices*, rapidfuzz
+    only evaluates the upper triangle and mirrors it.
+
+    Parameters
+    ----------
+    records
+        Sequence of ``SequenceRecord`` instances; row/column ``i`` of the
+        result corresponds to ``records[i]``.
+    metric
+        One of ``METRICS`` (``"levenshtein"``, ``"indel"`` or ``"hamming"``).
+    workers
+        Number of threads used by rapidfuzz; ``-1`` uses every core.
+
+    Raises
+    ------
+    ValueError
+        If ``metric`` is unknown.
+    """
+    logger = logging.getLogger(__name__)
+    scorer = _metric(metric)
+
+    seqs = [r.sequence for r in records]
+    logger.info("Computing %dx%d %s distance matrix", len(seqs), len(seqs), metric)
+    return process.cdist(seqs, seqs, scorer=scorer, dtype="int32", workers=workers)
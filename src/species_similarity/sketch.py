@@ -0,0 +1,205 @@
+"""
+MinHash sketch index for approximate nearest-species search.
+
+Every sequence is reduced to ``num_hashes`` minimum hash values over its
+k-mers.  The fraction of equal minima between two sketches estimates the
+Jaccard similarity of their k-mer sets, which converts to an approximate
+identity via the Mash distance.  Querying compares one sketch against the
+whole ``(N, num_hashes)`` matrix at once.  Only the shortlisted candidates
+are then confirmed with an exact `similarity.edit_distance`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from pathlib import Path
+from typing import Final, Sequence
+
+import numpy as np
+
+from .config import SequenceRecord
+from .similarity import edit_distance
+
+__all__ = ["SketchIndex", "sketch_path"]
+
+_EMPTY: Final[np.uint64] = np.uint64(np.iinfo(np.uint64).max)
+_FORMAT_VERSION: Final[int] = 1
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    """Vectorised SplitMix64 finaliser (wrap-around uint64 arithmetic)."""
+    x = x + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _kmer_codes(sequence: str, k: int) -> np.ndarray:
+    """Pack every k-mer of *sequence* into one ``uint64`` (8 bits/residue)."""
+    raw = np.frombuffer(sequence.encode("latin-1"), dtype=np.uint8)
+    n = len(raw) - k + 1
+    if n <= 0:
+        return np.empty(0, dtype=np.uint64)
+    codes = np.zeros(n, dtype=np.uint64)
+    for j in range(k):
+        codes = (codes << np.uint64(8)) | raw[j : j + n].astype(np.uint64)
+    return np.unique(codes)
+
+
+def _minhash(sequence: str, k: int, seeds: np.ndarray) -> np.ndarray:
+    """Per-seed minimum k-mer hash of *sequence* (all ``_EMPTY`` if too short)."""
+    codes = _kmer_codes(sequence, k)
+    if not codes.size:
+        return np.full(len(seeds), _EMPTY, dtype=np.uint64)
+    return _splitmix64(codes[:, None] ^ seeds[None, :]).min(axis=0)
+
+
+def _fingerprint(sequences: Sequence[str]) -> str:
+    h = hashlib.sha256()
+    for seq in sequences:
+        h.update(seq.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def sketch_path(records_path: Path) -> Path:
+    """Where the sketch index of the record store at *records_path* lives."""
+    return records_path.with_name(records_path.stem + ".sketch.npz")
+
+
+class SketchIndex:
+    """
+    MinHash sketches of a record set, row-aligned with that set.
+
+    Parameters
+    ----------
+    sketches
+        ``(N, num_hashes)`` ``uint64`` matrix of per-seed k-mer minima.
+    k
+        k-mer length; at most 8.
+    seeds
+        One ``uint64`` seed per hash function.
+    fingerprint
+        Digest of the indexed sequences, used to detect stale indices.
+    """
+
+    def __init__(
+        self, sketches: np.ndarray, k: int, seeds: np.ndarray, fingerprint: str
+    ) -> None:
+        self.sketches = sketches
+        self.k = k
+        self.seeds = seeds
+        self.fingerprint = fingerprint
+        self._empty = (sketches == _EMPTY).all(axis=1)
+
+    # ------------------------------------------------------------------ #
+    # Construction & persistence                                         #
+    # ------------------------------------------------------------------ #
+
+    @classmethod
+    def build(
+        cls,
+        sequences: Sequence[str],
+        k: int = 5,
+        num_hashes: int = 128,
+        seed: int = 0,
+    ) -> SketchIndex:
+        if not 1 <= k <= 8:
+            raise ValueError("k must be between 1 and 8")
+        logger = logging.getLogger(__name__)
+        logger.info(
+            "Sketching %d sequences (k=%d, %d hashes)", len(sequences), k, num_hashes
+        )
+        seeds = np.random.default_rng(seed).integers(
+            0, np.iinfo(np.uint64).max, size=num_hashes, dtype=np.uint64
+        )
+        sketches = np.empty((len(sequences), num_hashes), dtype=np.uint64)
+        for row, seq in enumerate(sequences):
+            sketches[row] = _minhash(seq, k, seeds)
+        return cls(sketches, k, seeds, _fingerprint(sequences))
+
+    def save(self, path: Path) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as fh:
+            np.savez_compressed(
+                fh,
+                version=_FORMAT_VERSION,
+                sketches=self.sketches,
+                k=self.k,
+                seeds=self.seeds,
+                fingerprint=self.fingerprint,
+            )
+        return path
+
+    @classmethod
+    def load(cls, path: Path) -> SketchIndex:
+        with np.load(path) as data:
+            if int(data["version"]) != _FORMAT_VERSION:
+                raise ValueError(f"Unsupported sketch index version in {path}")
+            return cls(
+                data["sketches"],
+                int(data["k"]),
+                data["seeds"],
+                str(data["fingerprint"]),
+            )
+
+    @classmethod
+    def for_records(
+        cls, records: Sequence[SequenceRecord], path: Path, **build_kwargs
+    ) -> SketchIndex:
+        """Load the index at *path* if it matches *records*, else rebuild it."""
+        sequences = [r.sequence for r in records]
+        if path.exists():
+            index = cls.load(path)
+            if index.fingerprint == _fingerprint(sequences):
+                return index
+            logging.getLogger(__name__).info("Sketch index %s is stale", path)
+        index = cls.build(sequences, **build_kwargs)
+        index.save(path)
+        return index
+
+    # ------------------------------------------------------------------ #
+    # Queries                                                            #
+    # ------------------------------------------------------------------ #
+
+    def jaccard(self, sequence: str) -> np.ndarray:
+        """Estimated k-mer Jaccard similarity of *sequence* to every row."""
+        sketch = _minhash(sequence, self.k, self.seeds)
+        est = (self.sketches == sketch).mean(axis=1)
+        est[self._empty] = 0.0
+        return est
+
+    def identity(self, sequence: str) -> np.ndarray:
+        """Estimated identity (0–1) of *sequence* to every row (Mash distance)."""
+        j = self.jaccard(sequence)
+        with np.errstate(divide="ignore"):
+            mash = -np.log(2 * j / (1 + j)) / self.k
+        return np.clip(1.0 - mash, 0.0, 1.0)
+
+    def query(self, sequence: str, top_k: int = 10) -> list[tuple[int, float]]:
+        """Return ``(row, estimated identity)`` of the *top_k* closest rows."""
+        ident = self.identity(sequence)
+        top_k = min(top_k, len(ident))
+        rows = np.argpartition(-ident, top_k - 1)[:top_k] if top_k else []
+        rows = sorted(rows, key=lambda i: -ident[i])
+        return [(int(i), float(ident[i])) for i in rows]
+
+    def nearest(
+        self,
+        records: Sequence[SequenceRecord],
+        sequence: str,
+        top_k: int = 5,
+        candidates: int = 50,
+    ) -> list[tuple[SequenceRecord, int]]:
+        """
+        Return the *top_k* records closest to *sequence* by exact edit
+        distance, aligning only the *candidates* best sketch matches.
+        """
+        shortlist = self.query(sequence, max(top_k, candidates))
+        exact = [
+            (records[row], edit_distance(records[row].sequence, sequence))
+            for row, _ in shortlist
+        ]
+        exact.sort(key=lambda pair: pair[1])
+        return exact[:top_k]
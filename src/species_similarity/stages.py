@@ -0,0 +1,81 @@
+"""
+Content-hashed bookkeeping for incremental pipeline runs.
+
+Each pipeline stage is identified by a *key*: a digest of everything it
+reads (input file contents, parameters, code version).  A `StageManifest`
+remembers the key each stage last ran with and which files it produced, so
+a stage whose key is unchanged and whose outputs still exist can be
+skipped.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Final, Iterable
+
+__all__ = ["digest", "file_digest", "StageManifest"]
+
+_READ_CHUNK: Final[int] = 1 << 20
+
+
+def digest(*parts: object) -> str:
+    """Return a SHA-256 hex digest of *parts* (JSON-encoded, order matters)."""
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def file_digest(path: Path) -> str:
+    """Return the SHA-256 hex digest of the bytes stored at *path*."""
+    h = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(_READ_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class StageManifest:
+    """
+    JSON file mapping ``stage → {"key": ..., "outputs": [...]}``.
+
+    Parameters
+    ----------
+    path
+        Location of the manifest; created on the first `record` call.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        try:
+            self._stages: dict[str, dict] = json.loads(path.read_text("utf-8"))
+        except (FileNotFoundError, ValueError):
+            self._stages = {}
+
+    def is_fresh(self, stage: str, key: str, outputs: Iterable[Path]) -> bool:
+        """True when *stage* last ran with *key* and all *outputs* exist."""
+        entry = self._stages.get(stage)
+        fresh = (
+            entry is not None
+            and entry["key"] == key
+            and entry["outputs"] == [str(p) for p in outputs]
+            and all(Path(p).exists() for p in entry["outputs"])
+        )
+        logging.getLogger(__name__).debug(
+            "Stage %s is %s", stage, "fresh" if fresh else "stale"
+        )
+        return fresh
+
+    def outputs(self, stage: str) -> list[Path]:
+        """Outputs *stage* recorded last time (empty if it never ran)."""
+        entry = self._stages.get(stage)
+        return [Path(p) for p in entry["outputs"]] if entry else []
+
+    def record(self, stage: str, key: str, outputs: Iterable[Path]) -> None:
+        """Remember that *stage* produced *outputs* for *key* and persist."""
+        self._stages[stage] = {"key": key, "outputs": [str(p) for p in outputs]}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".part")
+        tmp.write_text(json.dumps(self._stages, indent=2), encoding="utf-8")
+        tmp.replace(self.path)
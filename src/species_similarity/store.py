@@ -0,0 +1,252 @@
+"""
+On-disk storage for record tables.
+
+Tables are written as CSV (always available), Parquet or Arrow IPC; the
+format is picked from the file suffix.  The columnar formats need the
+optional ``pyarrow`` package (``pip install species_similarity[columnar]``)
+and support reading only a subset of columns; Arrow IPC files are
+memory-mapped on read.  Without ``pyarrow`` everything falls back to CSV.
+"""
+
+from __future__ import annotations
+
+import csv
+import logging
+from pathlib import Path
+from typing import Final, Iterable, Optional, Sequence
+
+import pandas as pd
+
+from .config import SequenceRecord, Species
+from .table import SequenceTable
+
+__all__ = [
+    "FORMATS",
+    "RECORD_COLUMNS",
+    "has_pyarrow",
+    "default_format",
+    "with_format",
+    "write_table",
+    "read_table",
+    "write_records",
+    "load_records",
+    "load_table",
+]
+
+# format name → canonical file suffix
+FORMATS: Final[dict[str, str]] = {
+    "csv": ".csv",
+    "parquet": ".parquet",
+    "arrow": ".arrow",
+}
+_SUFFIX_TO_FORMAT: Final[dict[str, str]] = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+}
+
+RECORD_COLUMNS: Final[tuple[str, ...]] = (
+    "common_name",
+    "scientific_name",
+    "taxonomy_id",
+    "sequence",
+)
+
+# Rows buffered per Parquet row group / Arrow record batch while streaming
+_BATCH_ROWS: Final[int] = 10_000
+
+
+# --------------------------------------------------------------------------- #
+#  Format selection                                                           #
+# --------------------------------------------------------------------------- #
+
+
+def has_pyarrow() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def default_format() -> str:
+    """Parquet when ``pyarrow`` is installed, CSV otherwise."""
+    return "parquet" if has_pyarrow() else "csv"
+
+
+def with_format(path: Path, fmt: str) -> Path:
+    """Return *path* with the suffix belonging to *fmt*."""
+    try:
+        return path.with_suffix(FORMATS[fmt])
+    except KeyError as exc:
+        raise ValueError(
+            f"Unknown storage format '{fmt}', expected one of {sorted(FORMATS)}"
+        ) from exc
+
+
+def _format_of(path: Path) -> str:
+    fmt = _SUFFIX_TO_FORMAT.get(path.suffix.lower(), "csv")
+    if fmt != "csv" and not has_pyarrow():
+        raise ImportError(f"Reading/writing {path.name} requires pyarrow")
+    return fmt
+
+
+# --------------------------------------------------------------------------- #
+#  DataFrames                                                                 #
+# --------------------------------------------------------------------------- #
+
+
+def write_table(df: pd.DataFrame, path: Path) -> Path:
+    """Write *df* to *path* in the format implied by its suffix."""
+    fmt = _format_of(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "parquet":
+        df.to_parquet(path, index=False)
+    elif fmt == "arrow":
+        df.reset_index(drop=True).to_feather(path)
+    else:
+        df.to_csv(path, index=False)
+    return path
+
+
+def read_table(path: Path, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Read the table at *path*, optionally projecting to *columns*.
+
+    Columnar formats skip the other columns entirely; for CSV only the
+    requested columns are converted.
+    """
+    fmt = _format_of(path)
+    cols = list(columns) if columns is not None else None
+    if fmt == "parquet":
+        return pd.read_parquet(path, columns=cols)
+    if fmt == "arrow":
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+
+        with pa.memory_map(str(path)) as source:
+            table = ipc.open_file(source).read_all()
+            if cols is not None:
+                table = table.select(cols)
+            return table.to_pandas()
+    return pd.read_csv(path, usecols=cols)
+
+
+# --------------------------------------------------------------------------- #
+#  SequenceRecord streams                                                     #
+# --------------------------------------------------------------------------- #
+
+
+def _record_row(r: SequenceRecord) -> tuple:
+    return (
+        r.species.common_name,
+        r.species.scientific_name,
+        r.species.taxonomy_id,
+        r.sequence,
+    )
+
+
+def _write_records_csv(recs: Iterable[SequenceRecord], path: Path) -> int:
+    count = 0
+    with path.open("w", newline="", encoding="utf-8") as fh:
+        writer = csv.writer(fh, lineterminator="\n")
+        writer.writerow(RECORD_COLUMNS)
+        for r in recs:
+            writer.writerow(_record_row(r))
+            count += 1
+    return count
+
+
+def _write_records_arrow(recs: Iterable[SequenceRecord], path: Path, fmt: str) -> int:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [
+            ("common_name", pa.string()),
+            ("scientific_name", pa.string()),
+            ("taxonomy_id", pa.int64()),
+            ("sequence", pa.string()),
+        ]
+    )
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(str(path), schema)
+    else:
+        writer = ipc.new_file(str(path), schema)
+
+    count = 0
+    batch: list[tuple] = []
+
+    def flush() -> None:
+        columns = list(zip(*batch)) if batch else [[] for _ in RECORD_COLUMNS]
+        writer.write_table(pa.Table.from_arrays(list(columns), schema=schema))
+        batch.clear()
+
+    try:
+        for r in recs:
+            batch.append(_record_row(r))
+            count += 1
+            if len(batch) >= _BATCH_ROWS:
+                flush()
+        if batch or count == 0:
+            flush()
+    finally:
+        writer.close()
+    return count
+
+
+def write_records(recs: Iterable[SequenceRecord], path: Path) -> int:
+    """
+    Stream *recs* to *path* without materialising them.
+
+    CSV rows are written one by one; Parquet/Arrow rows are buffered into
+    batches of ``_BATCH_ROWS``.  The file is assembled next to *path* and
+    only moved into place once complete; it is removed if writing fails.
+
+    Returns
+    -------
+    int
+        Number of records written.
+    """
+    fmt = _format_of(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".part")
+    try:
+        if fmt == "csv":
+            count = _write_records_csv(recs, tmp)
+        else:
+            count = _write_records_arrow(recs, tmp, fmt)
+        tmp.replace(path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return count
+
+
+def load_records(path: Path) -> list[SequenceRecord]:
+    """Recreate ``SequenceRecord`` objects from a stored record table."""
+    logging.getLogger(__name__).debug("Loading records from %s", path)
+    df = read_table(path, RECORD_COLUMNS)
+    return [
+        SequenceRecord(Species(common, scientific, int(taxon)), seq)
+        for common, scientific, taxon, seq in zip(
+            df["common_name"].tolist(),
+            df["scientific_name"].tolist(),
+            df["taxonomy_id"].tolist(),
+            df["sequence"].tolist(),
+        )
+    ]
+
+
+def load_table(path: Path) -> SequenceTable:
+    """Load a stored record table straight into a `SequenceTable`."""
+    logging.getLogger(__name__).debug("Loading table from %s", path)
+    df = read_table(path, RECORD_COLUMNS)
+    return SequenceTable(
+        df["common_name"].tolist(),
+        df["scientific_name"].tolist(),
+        df["taxonomy_id"].tolist(),
+        df["sequence"].tolist(),
+    )
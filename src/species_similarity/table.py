@@ -0,0 +1,170 @@
+"""
+Compact, array-backed collection of sequence records.
+
+`SequenceTable` keeps one concatenated buffer per string column (names and
+residues) plus NumPy offset arrays instead of one dataclass and one ``str``
+per record.  Indexing yields lightweight `RecordView` objects that expose
+the same ``.species.common_name`` / ``.sequence`` attributes as
+`config.SequenceRecord`, so existing callers keep working unchanged.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Iterator, Sequence
+
+import numpy as np
+
+from .config import SequenceRecord, Species
+
+__all__ = ["SequenceTable", "RecordView", "SpeciesView"]
+
+
+def _pack(strings: Sequence[str]) -> tuple[str, np.ndarray]:
+    """Concatenate *strings* into one buffer plus ``len + 1`` offsets."""
+    offsets = np.zeros(len(strings) + 1, dtype=np.int64)
+    np.cumsum([len(s) for s in strings], out=offsets[1:])
+    return "".join(strings), offsets
+
+
+class SpeciesView:
+    """Read-only view of the species columns of one table row."""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: SequenceTable, index: int) -> None:
+        self._table = table
+        self._index = index
+
+    @property
+    def common_name(self) -> str:
+        return self._table._slice("_common", self._index)
+
+    @property
+    def scientific_name(self) -> str:
+        return self._table._slice("_scientific", self._index)
+
+    @property
+    def taxonomy_id(self) -> int:
+        return int(self._table._taxonomy_ids[self._index])
+
+    def to_species(self) -> Species:
+        return Species(self.common_name, self.scientific_name, self.taxonomy_id)
+
+    def __repr__(self) -> str:
+        return f"SpeciesView({self.common_name!r}, {self.scientific_name!r})"
+
+
+class RecordView:
+    """Read-only stand-in for `config.SequenceRecord` backed by a table row."""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: SequenceTable, index: int) -> None:
+        self._table = table
+        self._index = index
+
+    @property
+    def species(self) -> SpeciesView:
+        return SpeciesView(self._table, self._index)
+
+    @property
+    def sequence(self) -> str:
+        return self._table._slice("_residues", self._index)
+
+    def to_record(self) -> SequenceRecord:
+        return SequenceRecord(self.species.to_species(), self.sequence)
+
+    def __repr__(self) -> str:
+        return f"RecordView({self.species.common_name!r}, len={len(self.sequence)})"
+
+
+class SequenceTable:
+    """
+    Column store for many sequence records.
+
+    Parameters
+    ----------
+    common_names, scientific_names, taxonomy_ids, sequences
+        Equal-length columns; row ``i`` describes one record.
+    """
+
+    def __init__(
+        self,
+        common_names: Sequence[str],
+        scientific_names: Sequence[str],
+        taxonomy_ids: Sequence[int],
+        sequences: Sequence[str],
+    ) -> None:
+        n = len(sequences)
+        if not (len(common_names) == len(scientific_names) == len(taxonomy_ids) == n):
+            raise ValueError("All columns must have the same length")
+        self._common = _pack(common_names)
+        self._scientific = _pack(scientific_names)
+        self._residues = _pack(sequences)
+        self._taxonomy_ids = np.asarray(taxonomy_ids, dtype=np.int64)
+
+    @classmethod
+    def from_records(cls, records: Iterable[SequenceRecord]) -> SequenceTable:
+        common: list[str] = []
+        scientific: list[str] = []
+        taxa: list[int] = []
+        seqs: list[str] = []
+        for r in records:
+            common.append(r.species.common_name)
+            scientific.append(r.species.scientific_name)
+            taxa.append(r.species.taxonomy_id)
+            seqs.append(r.sequence)
+        return cls(common, scientific, taxa, seqs)
+
+    # ------------------------------------------------------------------ #
+    # Column access                                                      #
+    # ------------------------------------------------------------------ #
+
+    def _slice(self, column: str, index: int) -> str:
+        buffer, offsets = getattr(self, column)
+        return buffer[offsets[index] : offsets[index + 1]]
+
+    @property
+    def taxonomy_ids(self) -> np.ndarray:
+        return self._taxonomy_ids
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """Sequence length of every row."""
+        return np.diff(self._residues[1])
+
+    def sequences(self) -> list[str]:
+        """Materialise the sequence column (e.g. for batched rapidfuzz calls)."""
+        buffer, offsets = self._residues
+        bounds = offsets.tolist()
+        return [buffer[a:b] for a, b in zip(bounds, bounds[1:])]
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate payload size: string buffers plus offset arrays."""
+        total = self._taxonomy_ids.nbytes
+        for buffer, offsets in (self._common, self._scientific, self._residues):
+            total += len(buffer.encode("utf-8")) + offsets.nbytes
+        return total
+
+    # ------------------------------------------------------------------ #
+    # Sequence protocol                                                  #
+    # ------------------------------------------------------------------ #
+
+    def __len__(self) -> int:
+        return len(self._taxonomy_ids)
+
+    def __getitem__(self, index: int) -> RecordView:
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("SequenceTable index out of range")
+        return RecordView(self, index)
+
+    def __iter__(self) -> Iterator[RecordView]:
+        return (RecordView(self, i) for i in range(len(self)))
+
+    def to_records(self) -> list[SequenceRecord]:
+        """Materialise every row as a `config.SequenceRecord`."""
+        return [view.to_record() for view in self]
@@ -3,6 +3,11 @@ Shared fixtures & helpers for the test-suite.
 """
 
 from __future__ import annotations
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import urlsplit
+import threading
+
 import pytest
 
 
@@ -34,3 +39,42 @@ def sample_uniprot_payload() -> dict:
             },
         ]
     }
+
+
+@pytest.fixture()
+def stub_http_server():
+    """
+    Local HTTP server replaying canned responses.
+
+    Register responses with ``server.routes[path] = [(status, body, headers),
+    ...]``; successive requests to *path* consume the list in order and the
+    last entry is repeated.  Every requested path (with query string) is
+    appended to ``server.requests``.
+    """
+    routes: dict[str, list[tuple[int, bytes, dict[str, str]]]] = {}
+    requests: list[str] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:  # noqa: N802 - http.server API
+            requests.append(self.path)
+            queue = routes.get(urlsplit(self.path).path, [(404, b"", {})])
+            status, body, headers = queue.pop(0) if len(queue) > 1 else queue[0]
+            self.send_response(status)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    host, port = httpd.server_address[:2]
+    yield SimpleNamespace(url=f"http://{host}:{port}", routes=routes, requests=requests)
+    httpd.shutdown()
+    httpd.server_close()
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from species_similarity.cache import KeyValueCache
+
+
+def test_round_trip_and_counters(tmp_path: Path) -> None:
+    cache = KeyValueCache(tmp_path / "kv.sqlite")
+    cache.set_many({"a": "1", "b": None})
+    assert cache.get_many(["a", "b", "c", "a"]) == {"a": "1", "b": None}
+    assert cache.stats() == {"hits": 2, "misses": 1, "hit_rate": 2 / 3}
+
+    # persisted across instances
+    reopened = KeyValueCache(tmp_path / "kv.sqlite")
+    assert reopened.get_many(["a"]) == {"a": "1"}
+
+
+def test_negative_entries_expire_separately(tmp_path: Path) -> None:
+    cache = KeyValueCache(tmp_path / "kv.sqlite", ttl=None, negative_ttl=0)
+    cache.set_many({"hit": "url", "miss": None})
+    assert cache.get_many(["hit", "miss"]) == {"hit": "url"}
+
+
+def _write_batches(path: Path, worker: int) -> int:
+    cache = KeyValueCache(path, ttl=None)
+    for batch in range(50):
+        cache.set_many({f"{worker}:{batch}:{i}": "x" * 100 for i in range(200)})
+    cache.close()
+    return worker
+
+
+def test_worker_processes_share_one_cache(tmp_path: Path) -> None:
+    path = tmp_path / "kv.sqlite"
+    KeyValueCache(path).close()
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        assert sorted(pool.map(_write_batches, [path, path], [0, 1])) == [0, 1]
+
+    cache = KeyValueCache(path, ttl=None)
+    keys = [f"{w}:{b}:{i}" for w in (0, 1) for b in range(50) for i in range(200)]
+    assert len(cache.get_many(keys)) == len(keys)
+    mode = cache._conn.execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
@@ -1,4 +1,10 @@
-from species_similarity.similarity import difference_mask
+import random
+
+import pytest
+
+from species_similarity import diff
+from species_similarity.diff import html_colorise, html_colorise_many
+from species_similarity.similarity import difference_mask, encode_mask
 
 
 def test_mask_length_matches_input() -> None:
@@ -8,3 +14,67 @@ def test_mask_length_matches_input() -> None:
     mask = difference_mask(human, other)
     assert len(mask) == len(human)
     assert mask == "1000"
+
+
+def test_html_colorise_merges_adjacent_mismatches() -> None:
+    assert html_colorise("TTGT", "ACGT") == '<span style="color:red">TT</span>GT'
+    assert html_colorise("ACGT", "ACGT") == "ACGT"
+
+
+def test_html_colorise_many_reuses_masks(mocker) -> None:
+    spy = mocker.spy(diff, "difference_mask")
+    out = html_colorise_many(
+        ["TCGT", "ACGA", "ACGA", "AAAA"],
+        "ACGT",
+        masks=["1000", None, None, "0111"],
+    )
+    assert out == [
+        '<span style="color:red">T</span>CGT',
+        'ACG<span style="color:red">A</span>',
+        'ACG<span style="color:red">A</span>',
+        'A<span style="color:red">AAA</span>',
+    ]
+    # only the duplicated sequence without a mask is aligned, once
+    assert spy.call_count == 1
+
+
+def test_html_colorise_many_matches_single() -> None:
+    rng = random.Random(0)
+    ref = "".join(rng.choices("ACDEFGHIK", k=60))
+    seqs = [
+        "".join(c if rng.random() > 0.4 else rng.choice("ACDEFGHIK") for c in ref)
+        for _ in range(20)
+    ] + ["", ref, "ÄCDE"]
+    assert html_colorise_many(seqs, ref) == [html_colorise(s, ref) for s in seqs]
+    assert html_colorise_many([], ref) == []
+
+
+def test_html_colorise_many_rejects_bad_masks() -> None:
+    with pytest.raises(ValueError):
+        html_colorise_many(["ACGT"], "ACGT", masks=["01"])
+    with pytest.raises(ValueError):
+        html_colorise_many(["ACGT", "ACGA"], "ACGT", masks=["0000"])
+
+
+def test_html_colorise_accepts_encoded_masks() -> None:
+    mask = difference_mask("ACGTAC", "TCGAAC")
+    encoded = encode_mask(mask)
+    assert html_colorise("TCGAAC", "ACGTAC", mask=encoded) == html_colorise(
+        "TCGAAC", "ACGTAC"
+    )
+    assert html_colorise_many(["TCGAAC"], "ACGTAC", [encoded]) == [
+        html_colorise("TCGAAC", "ACGTAC")
+    ]
+
+
+def test_html_colorise_many_mixes_plain_and_encoded_masks() -> None:
+    rng = random.Random(1)
+    ref = "".join(rng.choices("ACDEFGHIK", k=40))
+    seqs = [
+        "".join(c if rng.random() > 0.5 else rng.choice("ACDEFGHIK") for c in ref)
+        for _ in range(12)
+    ] + [""]
+    masks = [difference_mask(ref, s) for s in seqs]
+    mixed = [encode_mask(m) if i % 2 else m for i, m in enumerate(masks)]
+    expected = [html_colorise(s, ref, mask=m) for s, m in zip(seqs, masks)]
+    assert html_colorise_many(seqs, ref, mixed) == expected
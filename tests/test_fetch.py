@@ -1,23 +1,42 @@
 from __future__ import annotations
 
 from types import SimpleNamespace
+from urllib.parse import urlsplit
 import json
-from species_similarity import fetch
+
+import pytest
+
+from species_similarity import config, fetch
 
 
 class _DummyResponse(SimpleNamespace):
     """
     Stand-in for `requests.Response` that satisfies only the attributes
-    `json()` and `headers` and a no-op `raise_for_status()`.
+    `json()`, `content` and `headers` and a no-op `raise_for_status()`.
     """
 
     def json(self):
         return self._payload
 
+    @property
+    def content(self) -> bytes:
+        return json.dumps(self._payload).encode()
+
     def raise_for_status(self):
         pass
 
 
+@pytest.fixture(autouse=True)
+def _no_real_http_cache(monkeypatch, tmp_path):
+    """Keep stub responses out of the user's UniProt cache in ``data/raw``."""
+    monkeypatch.setattr(config, "DATA_RAW", tmp_path)
+    monkeypatch.setattr(fetch, "_install_http_cache", lambda: None)
+    clear = fetch._session.cache_clear
+    clear()
+    yield
+    clear()
+
+
 def test_fetch_gene_sequences(monkeypatch, sample_uniprot_payload):
     """Ensure the fetch layer converts the UniProt payload into SequenceRecords."""
 
@@ -30,9 +49,9 @@ def test_fetch_gene_sequences(monkeypatch, sample_uniprot_payload):
 
     monkeypatch.setattr(
         fetch,
-        "requests",
-        SimpleNamespace(get=fake_get),  # attribute value
-        raising=False,  # do not fail if attr was missing
+        "_session",
+        lambda *_, **__: SimpleNamespace(get=fake_get),  # attribute value
+        raising=True,
     )
 
     # ――― 2) execute & assert
@@ -41,3 +60,61 @@ def test_fetch_gene_sequences(monkeypatch, sample_uniprot_payload):
     assert records[0].sequence == "ACGT"
     # caching layer shouldn’t interfere
     assert all(hasattr(r, "sequence") for r in records)
+
+
+def _page(*rows: dict, next_url: str | None = None) -> tuple:
+    headers = {"Content-Type": "application/json"}
+    if next_url:
+        headers["Link"] = f'<{next_url}>; rel="next"'
+    return 200, json.dumps({"results": list(rows)}).encode(), headers
+
+
+def test_iter_gene_sequences_follows_cursor(
+    monkeypatch, stub_http_server, sample_uniprot_payload
+):
+    """Pages are fetched in cursor order and parsed as they stream in."""
+    human, mouse = sample_uniprot_payload["results"]
+    base = stub_http_server.url
+    stub_http_server.routes["/search"] = [_page(human, next_url=f"{base}/p2")]
+    stub_http_server.routes["/p2"] = [_page(mouse, next_url=f"{base}/p3")]
+    stub_http_server.routes["/p3"] = [_page(human)]
+    monkeypatch.setattr(fetch, "UNIPROT_URL", f"{base}/search")
+
+    stream = fetch.iter_gene_sequences("STREAM", page_size=1, prefetch=1)
+    assert next(stream).species.common_name == "Human"
+    assert [r.species.common_name for r in stream] == ["Mouse", "Human"]
+    assert [urlsplit(p).path for p in stub_http_server.requests] == [
+        "/search",
+        "/p2",
+        "/p3",
+    ]
+    assert "size=1" in stub_http_server.requests[0]
+
+
+def test_iter_uniprot_pages_retries_transient_errors(
+    monkeypatch, stub_http_server, sample_uniprot_payload
+):
+    stub_http_server.routes["/search"] = [
+        (503, b"busy", {}),
+        _page(*sample_uniprot_payload["results"]),
+    ]
+    monkeypatch.setattr(fetch, "UNIPROT_URL", f"{stub_http_server.url}/search")
+
+    pages = list(
+        fetch._iter_uniprot_pages(
+            "gene:RETRY", session=fetch._session(retries=2, backoff=0)
+        )
+    )
+    assert len(stub_http_server.requests) == 2
+    assert [len(p) for p in pages] == [2]
+
+
+def test_prefetch_propagates_errors() -> None:
+    def pages():
+        yield b"1"
+        raise RuntimeError("boom")
+
+    stream = fetch._prefetch(pages(), depth=2)
+    assert next(stream) == b"1"
+    with pytest.raises(RuntimeError):
+        next(stream)
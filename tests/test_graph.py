@@ -11,3 +11,11 @@ def test_build_distance_graph() -> None:
     g = pipeline.build_distance_graph(distances)
     assert set(g.nodes) == {"Human", "Mouse"}
     assert g.edges["Human", "Mouse"]["weight"] == 1
+
+
+def test_build_distance_graph_other_reference() -> None:
+    human = SequenceRecord(Species("Human", "Homo sapiens", 9606), "ACGT")
+    mouse = SequenceRecord(Species("Mouse", "Mus musculus", 10090), "ACGA")
+    g = pipeline.build_distance_graph([(human, 1), (mouse, 0)], reference="mouse")
+    assert g.graph["reference"] == "Mouse"
+    assert list(g.edges(data="weight")) == [("Mouse", "Human", 1)]
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from species_similarity import graph_export
+
+
+def test_binary_round_trip(tmp_path: Path) -> None:
+    g = nx.Graph()
+    g.add_edge("Human", "Mouse", weight=3)
+    g.add_edge("Human", "Carpe", weight=7)
+    pos = {"Human": (0.0, 0.0), "Mouse": (3.0, 0.0), "Carpe": (0.0, -7.0)}
+    out = graph_export.write_binary(g, pos, tmp_path / "graph.bin")
+
+    loaded = graph_export.read_binary(out)
+    assert loaded.labels == ["Human", "Mouse", "Carpe"]
+    np.testing.assert_array_equal(loaded.positions, [[0, 0], [3, 0], [0, -7]])
+    np.testing.assert_array_equal(loaded.edges, [[0, 1], [0, 2]])
+    np.testing.assert_array_equal(loaded.weights, [3, 7])
+
+
+def test_read_rejects_other_files(tmp_path: Path) -> None:
+    path = tmp_path / "graph.bin"
+    path.write_bytes(b"\0" * 32)
+    with pytest.raises(ValueError):
+        graph_export.read_binary(path)
@@ -3,17 +3,30 @@ from __future__ import annotations
 import importlib
 from pathlib import Path
 import sys
+import time
 import types
 
+import pytest
+
 import species_similarity.config as config
+from species_similarity import images as _images
+from species_similarity.cache import KeyValueCache
+
+
+@pytest.fixture(autouse=True)
+def _no_real_http_cache(monkeypatch, tmp_path: Path) -> None:
+    """Keep stub lookups out of the user's iNaturalist cache in ``data/raw``."""
+    monkeypatch.setattr(config, "DATA_RAW", tmp_path)
+    monkeypatch.setattr(_images, "_install_http_cache", lambda: None)
 
 
 def test_install_cache_called(monkeypatch, tmp_path: Path) -> None:
     calls: dict[str, object] = {}
 
-    def fake_install_cache(name: str, expire_after: int) -> None:
+    def fake_install_cache(name: str, expire_after: int, **kwargs) -> None:
         calls["name"] = name
         calls["expire"] = expire_after
+        calls["wal"] = kwargs.get("wal")
 
     monkeypatch.setattr(config, "DATA_RAW", tmp_path, raising=False)
     monkeypatch.setitem(
@@ -24,7 +37,69 @@ def test_install_cache_called(monkeypatch, tmp_path: Path) -> None:
 
     images = importlib.import_module("species_similarity.images")
     importlib.reload(images)
+    assert calls == {}  # importing has no side effects
 
+    images._install_http_cache()
+    images._install_http_cache()
     expected = str(tmp_path / "inat_cache")
     assert calls["name"] == expected
     assert calls["expire"] == 86400
+    assert calls["wal"] is True
+
+
+def test_image_urls_dedupes_and_caches(monkeypatch, tmp_path: Path) -> None:
+    images = importlib.import_module("species_similarity.images")
+    calls: list[str] = []
+
+    def fake_get_observations(taxon_name: str, per_page: int):
+        calls.append(taxon_name)
+        if taxon_name == "Nothing":
+            return []  # no observations for this taxon
+        return [{"photos": [{"medium_url": f"https://img/{taxon_name}"}]}]
+
+    monkeypatch.setattr(images, "get_observations", fake_get_observations)
+    cache = KeyValueCache(tmp_path / "urls.sqlite")
+    monkeypatch.setattr(images, "_cache", lambda: cache)
+
+    names = ["Homo sapiens", "Mus musculus", "Homo sapiens", "Nothing"]
+    urls = images.image_urls(names, max_workers=4, rate_limit=None)
+    assert urls == {
+        "Homo sapiens": "https://img/Homo sapiens",
+        "Mus musculus": "https://img/Mus musculus",
+        "Nothing": None,
+    }
+    assert sorted(calls) == ["Homo sapiens", "Mus musculus", "Nothing"]
+
+    # per-name wrapper is answered from the persistent cache, as is the
+    # negative result
+    assert images.image_url("Mus musculus") == "https://img/Mus musculus"
+    assert images.image_url("Nothing") is None
+    assert len(calls) == 3
+    assert cache.stats()["hits"] == 2
+
+
+def test_image_urls_does_not_cache_failures(monkeypatch, tmp_path: Path) -> None:
+    images = importlib.import_module("species_similarity.images")
+
+    def broken(taxon_name: str, per_page: int):
+        raise ConnectionError("offline")
+
+    monkeypatch.setattr(images, "get_observations", broken)
+    cache = KeyValueCache(tmp_path / "urls.sqlite")
+    monkeypatch.setattr(images, "_cache", lambda: cache)
+
+    failed: set[str] = set()
+    assert images.image_urls(["Homo sapiens"], rate_limit=None, failed=failed) == {
+        "Homo sapiens": None
+    }
+    assert cache.get_many(["Homo sapiens"]) == {}
+    assert failed == {"Homo sapiens"}
+
+
+def test_rate_limiter_spaces_calls() -> None:
+    images = importlib.import_module("species_similarity.images")
+    limiter = images._RateLimiter(rate=50)
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.wait()
+    assert time.monotonic() - start >= 4 / 50 * 0.9
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+HEAVY = ("networkx", "pandas", "jinja2", "requests_cache", "pyinaturalist", "tqdm")
+# Cumulative import time allowed for a light entry point (-X importtime)
+BUDGET_US = 300_000
+
+
+def _python(*args: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": str(ROOT / "src")}
+    return subprocess.run(
+        [sys.executable, *args],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=ROOT,
+        env=env,
+    )
+
+
+def _import_times(stderr: str) -> dict[str, int]:
+    """Map module → cumulative µs from ``-X importtime`` output."""
+    times = {}
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line[len("import time:") :].split("|")
+            if cumulative.strip().isdigit():
+                times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "species_similarity",
+        "species_similarity.config",
+        "species_similarity.similarity",
+        "species_similarity.fetch",
+        "species_similarity.images",
+        "species_similarity.layout",
+    ],
+)
+def test_light_modules_skip_heavy_dependencies(module: str) -> None:
+    code = (
+        f"import json, sys, {module}; "
+        f"print(json.dumps([m for m in {HEAVY!r} if m in sys.modules]))"
+    )
+    assert json.loads(_python("-c", code).stdout) == []
+
+
+def test_similarity_import_budget() -> None:
+    times = _import_times(
+        _python("-X", "importtime", "-c", "import species_similarity.similarity").stderr
+    )
+    assert times["species_similarity.similarity"] < BUDGET_US
+
+
+def test_cli_help_does_not_load_pipeline() -> None:
+    result = _python("-X", "importtime", "scripts/run.py", "--help")
+    assert "--layout" in result.stdout
+    times = _import_times(result.stderr)
+    assert "species_similarity.pipeline" not in times
+    assert not set(HEAVY) & set(times)
+
+
+def test_package_exposes_nx_vis_lazily() -> None:
+    code = (
+        "import sys, species_similarity as s; "
+        "assert 'species_similarity.nx_vis' not in sys.modules; "
+        "assert s.nx_vis.render_html"
+    )
+    _python("-c", code)
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from species_similarity import kernels
+from species_similarity.similarity import hamming
+
+
+def test_encode_rejects_ragged() -> None:
+    assert kernels.encode(["AC", "GT"]).shape == (2, 2)
+    with pytest.raises(ValueError):
+        kernels.encode(["AC", "G"])
+
+
+def test_batched_kernels_match_scalar_hamming() -> None:
+    ref = "GATTACA"
+    seqs = ["GATTACA", "GACTATA", "CTAATGT"]
+    assert kernels.hamming_many(ref, seqs).tolist() == [hamming(ref, s) for s in seqs]
+    np.testing.assert_allclose(
+        kernels.identity_many(ref, seqs), [100.0, 100 * 5 / 7, 0.0]
+    )
+    assert kernels.mismatches(ref, seqs)[1].nonzero()[0].tolist() == [2, 5]
+
+
+def test_hamming_to_reference_mixed_lengths() -> None:
+    dists = kernels.hamming_to_reference("ACGT", ["ACGA", "ACG", "ACGTT"])
+    assert dists.tolist() == [1, 1, 1]
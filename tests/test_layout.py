@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import math
+from pathlib import Path
+
+import networkx as nx
+import pytest
+
+from species_similarity import layout
+
+
+def _star(weights: dict[str, int]) -> nx.Graph:
+    g = nx.Graph()
+    g.add_node("Human")
+    for node, w in weights.items():
+        g.add_edge("Human", node, weight=w)
+    return g
+
+
+def test_radial_radius_is_distance() -> None:
+    g = _star({"Mouse": 3, "Chicken": 7})
+    pos = layout.compute_layout(g, "radial")
+    assert pos["Human"] == (0.0, 0.0)
+    assert math.hypot(*pos["Mouse"]) == pytest.approx(3)
+    assert math.hypot(*pos["Chicken"]) == pytest.approx(7)
+
+
+def test_unknown_engine() -> None:
+    with pytest.raises(ValueError):
+        layout.compute_layout(_star({"Mouse": 1}), "barnes-hut")
+
+
+def test_auto_switches_to_radial(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(layout, "SPRING_MAX_NODES", 2)
+    g = _star({"Mouse": 3, "Chicken": 7})
+    assert layout.compute_layout(g) == layout.radial_layout(g, "Human")
+
+
+def test_spring_cache_keeps_unchanged_nodes(tmp_path: Path) -> None:
+    cache = tmp_path / "positions.json"
+    first = layout.compute_layout(
+        _star({"Mouse": 3, "Chicken": 7}), "spring", cache_path=cache
+    )
+    second = layout.compute_layout(
+        _star({"Mouse": 3, "Chicken": 5, "Frog": 9}), "spring", cache_path=cache
+    )
+    assert second["Mouse"] == pytest.approx(first["Mouse"])
+    assert second["Chicken"] != pytest.approx(first["Chicken"])
+    assert "Frog" in second
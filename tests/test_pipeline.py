@@ -1,10 +1,14 @@
 from __future__ import annotations
 from pathlib import Path
+import json
+import time
 
 import pandas as pd
 import pytest
 
-from species_similarity import pipeline, fetch, images, config
+from species_similarity import pipeline, fetch, config
+from species_similarity.cache import KeyValueCache
+from species_similarity.config import SequenceRecord, Species
 
 
 @pytest.fixture()
@@ -24,10 +28,30 @@ def isolated_data_dirs(tmp_path, monkeypatch):
     monkeypatch.setattr(
         pipeline, "GRAPH_HTML", processed / "edit_distance_graph.html", raising=False
     )
+    monkeypatch.setattr(
+        pipeline, "GRAPH_JSON", processed / "force" / "force.json", raising=False
+    )
+    alignments = KeyValueCache(raw / "alignments.sqlite", ttl=None)
+    monkeypatch.setattr(pipeline, "_alignment_cache", lambda: alignments)
 
     return processed
 
 
+@pytest.fixture()
+def aligned(monkeypatch) -> list[str]:
+    """Common names of the records `pipeline.compute_alignments` aligns."""
+    names: list[str] = []
+    compute = pipeline.compute_alignments
+
+    def spy(records, reference_common_name="Human", **kwargs):
+        records = list(records)
+        names.extend(r.species.common_name for r in records[1:])
+        return compute(records, reference_common_name, **kwargs)
+
+    monkeypatch.setattr(pipeline, "compute_alignments", spy)
+    return names
+
+
 def test_run_pipeline_no_network(
     monkeypatch, isolated_data_dirs, sample_uniprot_payload
 ):
@@ -58,11 +82,16 @@ def test_run_pipeline_no_network(
         fetch, "fetch_gene_sequences", lambda *_: fake_fetch(), raising=True
     )
     monkeypatch.setattr(
-        pipeline, "fetch_gene_sequences", lambda *_: fake_fetch(), raising=True
+        pipeline, "iter_gene_sequences", lambda *_: iter(fake_fetch()), raising=True
     )
 
     # 2) stub image resolution
-    monkeypatch.setattr(images, "image_url", lambda *_: None, raising=True)
+    monkeypatch.setattr(
+        pipeline,
+        "image_urls",
+        lambda names, **_: {n: None for n in names},
+        raising=True,
+    )
 
     # 3) run
     html_out: Path = pipeline.run(
@@ -84,3 +113,288 @@ def test_run_pipeline_no_network(
     df = pd.read_csv(isolated_data_dirs / "close.csv")
     print(df.head())
     assert set(df["scientific_name"]) == {"Homo sapiens", "Mus musculus"}
+
+
+def test_save_records_streams_and_round_trips(tmp_path):
+    from species_similarity.config import SequenceRecord, Species
+
+    def gen():
+        yield SequenceRecord(Species("Human", "Homo sapiens", 9606), "ACGT")
+        yield SequenceRecord(Species("Mouse, house", "Mus musculus", 10090), "ACGA")
+
+    path = tmp_path / "all.csv"
+    assert pipeline._save_records(gen(), path) == 2
+    assert not (tmp_path / "all.csv.part").exists()
+    loaded = pipeline._load_records(path)
+    assert [r.species.common_name for r in loaded] == ["Human", "Mouse, house"]
+    assert loaded[1].species.taxonomy_id == 10090
+    assert loaded[1].sequence == "ACGA"
+
+
+def test_run_migrates_legacy_csv_cache(monkeypatch, isolated_data_dirs):
+    pytest.importorskip("pyarrow")
+    from species_similarity.config import SequenceRecord, Species
+
+    legacy = isolated_data_dirs / "all.csv"
+    pipeline._save_records(
+        [
+            SequenceRecord(Species("Human", "Homo sapiens", 9606), "ACGT"),
+            SequenceRecord(Species("Mouse", "Mus musculus", 10090), "ACGA"),
+        ],
+        legacy,
+    )
+
+    def no_fetch(*_):
+        raise AssertionError("cache should have been migrated, not re-fetched")
+
+    monkeypatch.setattr(pipeline, "iter_gene_sequences", no_fetch)
+    monkeypatch.setattr(
+        pipeline, "image_urls", lambda names, **_: {n: None for n in names}
+    )
+
+    pipeline.run(
+        csv_all=isolated_data_dirs / "all.parquet",
+        csv_close=isolated_data_dirs / "close.parquet",
+        html_out=isolated_data_dirs / "report.html",
+    )
+    assert len(pipeline._load_records(isolated_data_dirs / "all.parquet")) == 2
+    assert (isolated_data_dirs / "close.parquet").exists()
+
+
+def _human_mouse() -> list[SequenceRecord]:
+    return [
+        SequenceRecord(Species("Human", "Homo sapiens", 9606), "ACGT"),
+        SequenceRecord(Species("Mouse", "Mus musculus", 10090), "ACGA"),
+    ]
+
+
+def test_rerun_skips_unchanged_stages(monkeypatch, isolated_data_dirs):
+    paths = dict(
+        csv_all=isolated_data_dirs / "all.csv",
+        csv_close=isolated_data_dirs / "close.csv",
+        html_out=isolated_data_dirs / "report.html",
+    )
+    pipeline._save_records(_human_mouse(), paths["csv_all"])
+    monkeypatch.setattr(
+        pipeline, "image_urls", lambda names, **_: {n: None for n in names}
+    )
+    pipeline.run(**paths)
+    first = json.loads(
+        (isolated_data_dirs / "report.run.json").read_text(encoding="utf-8")
+    )
+    align = next(s for s in first["stages"] if s["stage"] == "align")
+    assert align["records"] == 2
+    assert align["cache"]["misses"] == 2
+
+    def fail(*_, **__):
+        raise AssertionError("stage should have been skipped")
+
+    for name in ("compute_alignments", "image_urls", "render_report"):
+        monkeypatch.setattr(pipeline, name, fail)
+    monkeypatch.setattr(pipeline.nx_vis, "render_html", fail)
+
+    start = time.perf_counter()
+    assert pipeline.run(**paths) == paths["html_out"]
+    assert time.perf_counter() - start < 1.0
+
+    report = json.loads(
+        (isolated_data_dirs / "report.run.json").read_text(encoding="utf-8")
+    )
+    assert [s["stage"] for s in report["stages"]] == [
+        "fetch",
+        "align",
+        "images",
+        "close_table",
+        "layout",
+        "graph",
+        "report",
+    ]
+    assert all("skipped" in s for s in report["stages"][1:])
+
+
+def test_failed_image_lookups_are_retried(monkeypatch, isolated_data_dirs):
+    paths = dict(
+        csv_all=isolated_data_dirs / "all.csv",
+        csv_close=isolated_data_dirs / "close.csv",
+        html_out=isolated_data_dirs / "report.html",
+    )
+    pipeline._save_records(_human_mouse(), paths["csv_all"])
+    online = False
+
+    def flaky_image_urls(names, failed=None, **_):
+        names = list(names)
+        if not online:
+            failed.update(names)
+            return {n: None for n in names}
+        return {n: f"https://img/{n}" for n in names}
+
+    monkeypatch.setattr(pipeline, "image_urls", flaky_image_urls)
+    pipeline.run(**paths)
+    assert pd.read_csv(paths["csv_close"])["image_url"].isna().all()  # "N/A"
+
+    online = True
+    pipeline.run(**paths)
+    df = pd.read_csv(paths["csv_close"]).set_index("name")
+    assert df.loc["Mouse", "image_url"] == "https://img/Mus musculus"
+
+
+def test_rerun_aligns_only_new_records(monkeypatch, isolated_data_dirs, aligned):
+    paths = dict(
+        csv_all=isolated_data_dirs / "all.csv",
+        csv_close=isolated_data_dirs / "close.csv",
+        html_out=isolated_data_dirs / "report.html",
+    )
+    monkeypatch.setattr(
+        pipeline, "image_urls", lambda names, **_: {n: None for n in names}
+    )
+
+    pipeline._save_records(_human_mouse(), paths["csv_all"])
+    pipeline.run(**paths)
+    assert aligned == ["Human", "Mouse"]
+
+    rat = SequenceRecord(Species("Rat", "Rattus norvegicus", 10116), "ACGG")
+    pipeline._save_records([*_human_mouse(), rat], paths["csv_all"])
+    aligned.clear()
+    pipeline.run(**paths)
+    assert aligned == ["Rat"]
+    df = pd.read_csv(paths["csv_close"])
+    assert df.set_index("name")["hamming_distance"].to_dict() == {
+        "Human": 0,
+        "Mouse": 1,
+        "Rat": 1,
+    }
+    # masks are stored run-length encoded
+    assert df.set_index("name")["different"].to_dict() == {
+        "Human": "rle:4",
+        "Mouse": "rle:3,1",
+        "Rat": "rle:3,1",
+    }
+
+
+def test_max_distance_drops_far_species(monkeypatch, isolated_data_dirs):
+    paths = dict(
+        csv_all=isolated_data_dirs / "all.csv",
+        csv_close=isolated_data_dirs / "close.csv",
+        html_out=isolated_data_dirs / "report.html",
+    )
+    far = SequenceRecord(Species("Fly", "Drosophila melanogaster", 7227), "TTTTTT")
+    pipeline._save_records([*_human_mouse(), far], paths["csv_all"])
+    monkeypatch.setattr(
+        pipeline, "image_urls", lambda names, **_: {n: None for n in names}
+    )
+
+    pipeline.run(max_distance=2, **paths)
+    assert set(pd.read_csv(paths["csv_close"])["name"]) == {"Human", "Mouse"}
+
+    # widening the cutoff re-examines the cached "far" verdict
+    pipeline.run(max_distance=10, **paths)
+    df = pd.read_csv(paths["csv_close"]).set_index("name")
+    assert df.loc["Fly", "hamming_distance"] == 5
+
+
+def test_run_many_writes_per_gene_artifacts_and_summary(
+    monkeypatch, isolated_data_dirs
+):
+    monkeypatch.setattr(pipeline, "DATA_PROCESSED", isolated_data_dirs)
+    monkeypatch.setattr(
+        pipeline, "iter_gene_sequences", lambda *_: iter(_human_mouse())
+    )
+    looked_up: list[list[str]] = []
+
+    def fake_image_urls(names, **_):
+        names = list(names)
+        looked_up.append(names)
+        return {n: None for n in names}
+
+    monkeypatch.setattr(pipeline, "image_urls", fake_image_urls)
+
+    summary_path = pipeline.run_many(
+        ["HBA1", "CYTB", "HBA1"],
+        workers=1,
+        store_format="csv",
+        summary_path=isolated_data_dirs / "summary.json",
+    )
+    summary = json.loads(summary_path.read_text())
+    assert [row["gene"] for row in summary] == ["HBA1", "CYTB"]
+    assert all(row["status"] == "ok" for row in summary)
+    assert summary[0]["nearest"] == "Mouse"
+    assert summary[0]["nearest_distance"] == 1
+    for gene in ("HBA1", "CYTB"):
+        assert (isolated_data_dirs / f"{gene}_close_to_human.html").exists()
+        assert (isolated_data_dirs / "force" / f"{gene}_force.json").exists()
+        assert (isolated_data_dirs / "force" / f"{gene}_force.bin").exists()
+    # one deduplicated lookup for the whole batch
+    assert looked_up[0] == ["Homo sapiens", "Mus musculus"]
+
+
+def test_run_references_writes_per_reference_artifacts(
+    monkeypatch, isolated_data_dirs, aligned
+):
+    monkeypatch.setattr(pipeline, "DATA_PROCESSED", isolated_data_dirs)
+    fly = SequenceRecord(Species("Fly", "Drosophila melanogaster", 7227), "TTTTTT")
+    monkeypatch.setattr(
+        pipeline, "iter_gene_sequences", lambda *_: iter([*_human_mouse(), fly])
+    )
+    monkeypatch.setattr(
+        pipeline, "image_urls", lambda names, **_: {n: None for n in names}
+    )
+
+    loads: list[Path] = []
+    load_table = pipeline._load_table
+
+    def counting_load_table(path):
+        loads.append(path)
+        return load_table(path)
+
+    monkeypatch.setattr(pipeline, "_load_table", counting_load_table)
+
+    reports = pipeline.run_references(
+        ["Human", "Mouse"], gene="HBA1", store_format="csv", max_distance=2
+    )
+    assert reports == {
+        "Human": isolated_data_dirs / "HBA1_close_to_human.html",
+        "Mouse": isolated_data_dirs / "HBA1_close_to_mouse.html",
+    }
+    # the store is read once; the batched pass ruled the fly out and
+    # spared aligning each reference against itself
+    assert len(loads) == 1
+    assert aligned == ["Mouse", "Human"]
+    assert (isolated_data_dirs / "force" / "HBA1_force_mouse.json").exists()
+    close = pd.read_csv(isolated_data_dirs / "HBA1_close_to_mouse.csv")
+    assert close.set_index("name")["hamming_distance"].to_dict() == {
+        "Human": 1,
+        "Mouse": 0,
+    }
+    matrix = pd.read_csv(isolated_data_dirs / "HBA1_reference_distances.csv")
+    assert matrix["Human"].tolist()[:2] == [0, 1]
+    assert matrix["Mouse"].isna().tolist() == [False, False, True]
+
+
+def test_alignment_cache_follows_data_raw(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "DATA_RAW", tmp_path / "a")
+    first = pipeline._alignment_cache()
+    assert pipeline._alignment_cache() is first
+    monkeypatch.setattr(config, "DATA_RAW", tmp_path / "b")
+    assert pipeline._alignment_cache().path == tmp_path / "b" / "alignments.sqlite"
+
+
+def test_missing_report_page_reruns_report(monkeypatch, isolated_data_dirs):
+    paths = dict(
+        csv_all=isolated_data_dirs / "all.csv",
+        csv_close=isolated_data_dirs / "close.csv",
+        html_out=isolated_data_dirs / "report.html",
+    )
+    rat = SequenceRecord(Species("Rat", "Rattus norvegicus", 10116), "ACGG")
+    pipeline._save_records([*_human_mouse(), rat], paths["csv_all"])
+    monkeypatch.setattr(
+        pipeline, "image_urls", lambda names, **_: {n: None for n in names}
+    )
+    pipeline.run(report_page_size=1, **paths)
+    page = isolated_data_dirs / "report_pages" / "page_0001.html"
+    page.unlink()
+
+    pipeline.run(report_page_size=1, **paths)
+    assert page.exists()
+
+    pipeline.run(report_page_size=None, **paths)
+    assert not (isolated_data_dirs / "report_pages").exists()
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import json
+import time
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from species_similarity import profiling
+
+
+def test_stage_records_time_and_counters(tmp_path: Path) -> None:
+    prof = profiling.RunProfile(trace_memory=True)
+    with prof.stage("work") as stats:
+        data = [bytes(1024) for _ in range(1024)]
+        time.sleep(0.01)
+        stats["items"] = len(data)
+    prof.skip("render")
+
+    path = prof.write(profiling.report_path(tmp_path / "report.html"))
+    assert path == tmp_path / "report.run.json"
+    report = json.loads(path.read_text(encoding="utf-8"))
+    work, render = report["stages"]
+    assert work["stage"] == "work"
+    assert work["items"] == 1024
+    assert work["wall_s"] >= 0.01
+    assert work["cpu_s"] >= 0
+    assert work["peak_traced_mb"] >= 1
+    assert render == {"stage": "render", "skipped": "up to date"}
+    assert report["total"]["wall_s"] >= work["wall_s"]
+
+
+def test_cache_delta() -> None:
+    before = {"hits": 2, "misses": 1, "hit_rate": 2 / 3}
+    after = {"hits": 5, "misses": 2, "hit_rate": 5 / 7}
+    assert profiling.cache_delta(before, after) == {
+        "hits": 3,
+        "misses": 1,
+        "hit_rate": 0.75,
+    }
+
+
+def test_tracing_stops_when_a_stage_raises() -> None:
+    assert not tracemalloc.is_tracing()
+    with pytest.raises(RuntimeError):
+        with profiling.RunProfile(trace_memory=True) as prof:
+            with prof.stage("boom"):
+                raise RuntimeError("stage failed")
+    assert not tracemalloc.is_tracing()
+    assert prof.stages[0]["stage"] == "boom"
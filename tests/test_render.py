@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import json
+import math
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from species_similarity import render
+
+
+def _frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "name": ["Human", "Mouse", "Rat", "Chicken"],
+            "hamming_distance": [0, 2, 2, 5],
+            "image_url": ["human.png", "", "", "chicken.png"],
+        }
+    )
+
+
+def test_positions_are_lazy_and_ringed() -> None:
+    human, others = render._prepare_positions(_frame(), size=400, ring_spacing=100)
+    assert human["name"] == "Human"
+    assert isinstance(others, Iterator)
+    rows = list(others)
+    assert [r["name"] for r in rows] == ["Mouse", "Rat", "Chicken"]
+    radii = [math.hypot(r["x"] - 200, r["y"] - 200) for r in rows]
+    assert radii == pytest.approx([100, 100, 200])
+
+
+def test_other_reference_at_centre(tmp_path: Path) -> None:
+    centre, others = render._prepare_positions(
+        _frame(), size=400, ring_spacing=100, reference="chicken"
+    )
+    assert centre["name"] == "Chicken"
+    assert [r["name"] for r in others] == ["Human", "Mouse", "Rat"]
+    with pytest.raises(ValueError):
+        render._prepare_positions(_frame(), 400, 100, reference="Dodo")
+
+
+def test_render_concentric_streams_to_file(tmp_path: Path) -> None:
+    out = render.render_concentric(_frame(), tmp_path / "sub" / "report.html")
+    content = out.read_text(encoding="utf-8")
+    assert content.rstrip().endswith("</html>")
+    for name in ("Mouse", "Rat", "Chicken", "chicken.png"):
+        assert name in content
+
+
+def test_crowded_ring_wraps_into_subrings() -> None:
+    df = pd.DataFrame(
+        {
+            "name": ["Human"] + [f"Species {i}" for i in range(40)],
+            "hamming_distance": [0] + [1] * 40,
+            "image_url": [""] * 41,
+        }
+    )
+    _, others = render._prepare_positions(df, size=400, ring_spacing=100)
+    radii = {round(math.hypot(r["x"] - 200, r["y"] - 200), 6) for r in others}
+    # 2π·100 / MIN_ARC → 15 per ring, so three sub-rings inside [100, 200)
+    assert len(radii) == 3
+    assert min(radii) == pytest.approx(100)
+    assert max(radii) < 200
+
+
+def test_bands_break_on_distance_changes() -> None:
+    dist = np.array([1, 1, 2, 2, 2, 3, 4, 4, 4, 4, 4, 4, 4])
+    assert render._bands(dist, page_size=4) == [
+        (0, 2),
+        (2, 6),
+        (6, 10),
+        (10, 13),
+    ]
+
+
+def test_render_paged_writes_bounded_pages(tmp_path: Path) -> None:
+    df = pd.DataFrame(
+        {
+            "name": ["Human"] + [f"Species {i}" for i in range(10)],
+            "hamming_distance": [0] + [1, 1, 1, 2, 2, 2, 3, 3, 3, 3],
+            "image_url": ["human.png"] + ["x.png"] * 10,
+        }
+    )
+    out = tmp_path / "report.html"
+    written = render.render_report(df, out, page_size=4)
+    assert written[:2] == [out, tmp_path / "report.json"]
+
+    index = json.loads((tmp_path / "report.json").read_text(encoding="utf-8"))
+    assert index["species"] == 10
+    assert [(p["min_distance"], p["max_distance"]) for p in index["pages"]] == [
+        (1, 1),
+        (2, 2),
+        (3, 3),
+    ]
+    for page in index["pages"]:
+        assert page["species"] <= 4
+        html = (tmp_path / page["page"]).read_text(encoding="utf-8")
+        assert "human.png" in html
+        assert 'loading="lazy"' in html
+        assert page["page"] in out.read_text(encoding="utf-8")
+
+
+def test_single_page_replaces_paged_output(tmp_path: Path) -> None:
+    out = tmp_path / "report.html"
+    render.render_report(_frame(), out, page_size=1)
+    assert (tmp_path / "report_pages").is_dir()
+
+    assert render.render_report(_frame(), out, page_size=10) == [out]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["report.html"]
+
+
+@pytest.mark.parametrize("page_size", [0, -1])
+def test_page_size_must_be_positive(tmp_path: Path, page_size: int) -> None:
+    with pytest.raises(ValueError):
+        render.render_report(_frame(), tmp_path / "report.html", page_size)
+    with pytest.raises(ValueError):
+        render.render_paged(_frame(), tmp_path / "report.html", page_size)
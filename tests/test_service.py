@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import pytest
+
+from species_similarity import store
+from species_similarity.config import SequenceRecord, Species
+from species_similarity.service import SimilarityIndex, UnknownSpecies, create_app
+from species_similarity.similarity import encode_mask
+from species_similarity.sketch import sketch_path
+from species_similarity.table import SequenceTable
+
+_RECORDS = [
+    SequenceRecord(Species("Human", "Homo sapiens", 9606), "ACGTACGT"),
+    SequenceRecord(Species("Mouse", "Mus musculus", 10090), "ACGAACGT"),
+    SequenceRecord(Species("Chicken", "Gallus gallus", 9031), "TTGAACGA"),
+    SequenceRecord(Species("Zebrafish", "Danio rerio", 7955), "ACG"),
+]
+
+
+@pytest.fixture()
+def index() -> SimilarityIndex:
+    return SimilarityIndex(SequenceTable.from_records(_RECORDS))
+
+
+@pytest.fixture()
+def client(index):
+    return create_app(index, workers=2).test_client()
+
+
+def test_index_queries(index: SimilarityIndex) -> None:
+    assert index.reference_distances.tolist() == [0, 1, 4, 5]
+    assert index.distance("Mouse", "Chicken") == 3
+    assert index.distance("gallus gallus", 9606) == 4
+    assert [r["name"] for r in index.closest("Human", k=2)] == ["Mouse", "Chicken"]
+    assert index.closest("Chicken", k=1)[0]["distance"] == 3
+    assert index.mask("Mouse") == {"distance": 1, "mask": encode_mask("00010000")}
+    with pytest.raises(UnknownSpecies):
+        index.distance("Human", "Dodo")
+
+
+def test_results_are_cached_by_row(index: SimilarityIndex) -> None:
+    index.distance("Mouse", "Chicken")
+    index.distance("Gallus gallus", "mouse")
+    assert index.cache_info()["distance"]["hits"] == 1
+
+
+def test_from_path(tmp_path: Path) -> None:
+    path = tmp_path / "records.csv"
+    store.write_records(_RECORDS, path)
+    index = SimilarityIndex.from_path(path, reference="Mouse")
+    assert index.closest("Mouse", k=1)[0]["name"] == "Human"
+    assert sketch_path(path).exists()
+
+
+def test_closest_aligns_sketch_candidates_only() -> None:
+    rng = random.Random(3)
+    base = "".join(rng.choices("ACDEFGHIKLMNPQRSTVWY", k=200))
+    records = [SequenceRecord(Species("Human", "Homo sapiens", 9606), base)]
+    for i in range(40):
+        seq = "".join(
+            rng.choice("ACDEFGHIKLMNPQRSTVWY") if rng.random() < i / 40 else c
+            for c in base
+        )
+        records.append(SequenceRecord(Species(f"S{i}", f"Genus s{i}", i + 1), seq))
+    table = SequenceTable.from_records(records)
+    exact = SimilarityIndex(table, candidates=None)
+    approx = SimilarityIndex(table, candidates=8)
+    assert exact.sketch is None
+    assert approx._candidates(approx.resolve("S1"), k=3).size == 8
+    assert approx.closest("S1", k=3) == exact.closest("S1", k=3)
+
+
+def test_http_routes(client) -> None:
+    resp = client.get("/distance?a=Human&b=Zebrafish")
+    assert resp.status_code == 200
+    assert resp.get_json()["distance"] == 5
+
+    closest = client.get("/closest?species=9606&k=3").get_json()["closest"]
+    assert [r["taxonomy_id"] for r in closest] == [10090, 9031, 7955]
+
+    body = client.get("/mask?species=Chicken&reference=Mouse").get_json()
+    assert body["reference"] == "Mouse"
+    assert body["distance"] == 3
+
+    stats = client.get("/stats").get_json()
+    assert stats["records"] == 4
+    assert stats["reference"]["name"] == "Human"
+
+
+def test_http_errors(client) -> None:
+    assert client.get("/distance?a=Human&b=Dodo").status_code == 404
+    assert client.get("/distance?a=Human").status_code == 400
+    assert client.get("/closest?species=Human&k=0").status_code == 400
+    assert client.get("/closest?species=Human&k=many").status_code == 400
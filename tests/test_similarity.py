@@ -4,6 +4,14 @@ from species_similarity.similarity import (
     hamming,
     difference_mask,
     compute_distances,
+    distance_matrix,
+    edit_distance,
+    align,
+    compute_alignments,
+    decode_mask,
+    encode_mask,
+    mask_runs,
+    reference_distances,
 )
 from species_similarity.config import SequenceRecord, Species
 
@@ -39,3 +47,106 @@ def test_compute_distances_missing_reference() -> None:
     ]
     with pytest.raises(ValueError):
         compute_distances(records, reference_common_name="Cat")
+
+
+def test_distance_matrix_symmetric() -> None:
+    records = [
+        SequenceRecord(Species("Human", "Homo sapiens", 9606), "ACGT"),
+        SequenceRecord(Species("Mouse", "Mus musculus", 10090), "ACGA"),
+        SequenceRecord(Species("Fly", "Drosophila melanogaster", 7227), "TTG"),
+    ]
+    matrix = distance_matrix(records, workers=1)
+    assert matrix.shape == (3, 3)
+    assert (matrix == matrix.T).all()
+    assert (matrix.diagonal() == 0).all()
+    for i, a in enumerate(records):
+        for j, b in enumerate(records):
+            assert matrix[i, j] == edit_distance(a.sequence, b.sequence)
+
+
+def test_distance_matrix_unknown_metric() -> None:
+    records = [SequenceRecord(Species("Human", "Homo sapiens", 9606), "ACGT")]
+    with pytest.raises(ValueError):
+        distance_matrix(records, metric="cosine")
+
+
+@pytest.mark.parametrize(
+    ("ref", "other"),
+    [("ACGT", "ACGA"), ("ACGT", "ACGTA"), ("ACGT", "AGT"), ("GATTACA", "")],
+)
+def test_align_matches_separate_calls(ref: str, other: str) -> None:
+    aln = align(ref, other, with_editops=True)
+    assert aln.distance == edit_distance(ref, other)
+    assert aln.mask == difference_mask(ref, other)
+    assert len(aln.editops) == aln.distance
+
+
+def test_compute_alignments_against_reference() -> None:
+    records = [
+        SequenceRecord(Species("Human", "Homo sapiens", 9606), "ACGT"),
+        SequenceRecord(Species("Mouse", "Mus musculus", 10090), "ACGA"),
+    ]
+    result = compute_alignments(records)
+    assert [(a.distance, a.mask) for _, a in result] == [(0, "0000"), (1, "0001")]
+    assert result[1][1].editops is None
+
+
+def test_compute_distances_hamming_metric() -> None:
+    records = [
+        SequenceRecord(Species("Human", "Homo sapiens", 9606), "ACGT"),
+        SequenceRecord(Species("Mouse", "Mus musculus", 10090), "TCGA"),
+        SequenceRecord(Species("Fly", "Drosophila melanogaster", 7227), "ACG"),
+    ]
+    distances = compute_distances(records, metric="hamming")
+    assert [d for _, d in distances] == [0, 2, 1]
+
+
+def test_max_distance_reports_far_records() -> None:
+    records = [
+        SequenceRecord(Species("Human", "Homo sapiens", 9606), "ACGT"),
+        SequenceRecord(Species("Mouse", "Mus musculus", 10090), "ACGA"),
+        SequenceRecord(Species("Fly", "Drosophila melanogaster", 7227), "TTTTTTTT"),
+    ]
+    assert edit_distance("ACGT", "TTTTTTTT", max_distance=2) == 3
+    distances = compute_distances(records, max_distance=2)
+    assert [d for _, d in distances] == [0, 1, None]
+    aligned = compute_alignments(records, max_distance=2)
+    assert aligned[1][1].mask == "0001"
+    assert aligned[2][1] is None
+
+
+@pytest.mark.parametrize("mask", ["", "0", "1", "0001100", "1110", "0101", "111"])
+def test_mask_encoding_round_trip(mask: str) -> None:
+    encoded = encode_mask(mask)
+    assert decode_mask(encoded) == mask
+    assert encode_mask(encoded) == encoded
+    assert list(mask_runs(encoded)) == list(mask_runs(mask))
+
+
+def test_encoded_mask_is_compact() -> None:
+    mask = "0" * 500 + "1" * 3 + "0" * 497
+    assert encode_mask(mask) == "rle:500,3,497"
+    assert list(mask_runs(encode_mask(mask))) == [(500, 503)]
+
+
+def test_legacy_encoded_masks_are_read() -> None:
+    # Earlier versions used "=", which spreadsheets read as a formula
+    assert decode_mask("=3,2") == "00011"
+    assert list(mask_runs("=3,2")) == [(3, 5)]
+    assert encode_mask("=3,2") == "rle:3,2"
+
+
+def test_reference_distances_batches_references() -> None:
+    records = [
+        SequenceRecord(Species("Human", "Homo sapiens", 9606), "ACGT"),
+        SequenceRecord(Species("Mouse", "Mus musculus", 10090), "ACGA"),
+        SequenceRecord(Species("Fly", "Drosophila melanogaster", 7227), "TTTTTT"),
+    ]
+    matrix = reference_distances(records, ["Human", "fly"])
+    for row, ref in zip(matrix.tolist(), ["Human", "Fly"]):
+        assert row == [d for _, d in compute_distances(records, ref)]
+    assert reference_distances(records, ["Mouse"], max_distance=2).tolist() == [
+        [1, 0, 3]
+    ]
+    with pytest.raises(ValueError):
+        reference_distances(records, ["Dodo"])
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+import pytest
+
+from species_similarity.config import SequenceRecord, Species
+from species_similarity.sketch import SketchIndex, sketch_path
+
+
+def _mutate(seq: str, rate: float, rng: random.Random) -> str:
+    return "".join(
+        rng.choice("ACDEFGHIKLMNPQRSTVWY") if rng.random() < rate else c for c in seq
+    )
+
+
+@pytest.fixture()
+def records() -> list[SequenceRecord]:
+    rng = random.Random(1)
+    base = "".join(rng.choices("ACDEFGHIKLMNPQRSTVWY", k=300))
+    out = [SequenceRecord(Species("Human", "Homo sapiens", 9606), base)]
+    for i, rate in enumerate((0.02, 0.1, 0.3, 0.6)):
+        out.append(
+            SequenceRecord(Species(f"S{i}", f"Genus s{i}", i), _mutate(base, rate, rng))
+        )
+    out.append(SequenceRecord(Species("Short", "Genus brevis", 99), "AC"))
+    return out
+
+
+def test_query_ranks_by_similarity(records) -> None:
+    index = SketchIndex.build([r.sequence for r in records])
+    query = records[0].sequence
+    ranked = [row for row, _ in index.query(query, top_k=len(records))]
+    assert ranked[:4] == [0, 1, 2, 3]
+    assert ranked[-1] == 5  # too short to contain a k-mer
+    assert index.query(query, top_k=1)[0][1] == pytest.approx(1.0)
+
+
+def test_nearest_confirms_with_exact_distance(records) -> None:
+    index = SketchIndex.build([r.sequence for r in records])
+    hits = index.nearest(records, records[1].sequence, top_k=2, candidates=3)
+    assert hits[0] == (records[1], 0)
+    assert hits[1][0] is records[0]
+
+
+def test_for_records_persists_and_detects_staleness(records, tmp_path: Path) -> None:
+    path = sketch_path(tmp_path / "all.parquet")
+    assert path.name == "all.sketch.npz"
+    built = SketchIndex.for_records(records, path)
+    loaded = SketchIndex.for_records(records, path)
+    assert (loaded.sketches == built.sketches).all()
+    assert loaded.fingerprint == built.fingerprint
+
+    rebuilt = SketchIndex.for_records(records[:3], path)
+    assert len(rebuilt.sketches) == 3
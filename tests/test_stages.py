@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from species_similarity.stages import StageManifest, digest, file_digest
+
+
+def test_digest_is_order_sensitive() -> None:
+    assert digest("a", 1) == digest("a", 1)
+    assert digest("a", 1) != digest(1, "a")
+
+
+def test_manifest_tracks_keys_and_outputs(tmp_path: Path) -> None:
+    out = tmp_path / "out.txt"
+    out.write_text("x")
+    manifest = StageManifest(tmp_path / "stages.json")
+    key = digest(file_digest(out))
+    assert not manifest.is_fresh("render", key, [out])
+
+    manifest.record("render", key, [out])
+    reloaded = StageManifest(tmp_path / "stages.json")
+    assert reloaded.is_fresh("render", key, [out])
+    assert not reloaded.is_fresh("render", digest("other"), [out])
+
+    out.unlink()
+    assert not reloaded.is_fresh("render", key, [out])
+
+
+def test_manifest_remembers_outputs(tmp_path: Path) -> None:
+    manifest = StageManifest(tmp_path / "stages.json")
+    assert manifest.outputs("render") == []
+    manifest.record("render", digest(1), [tmp_path / "a", tmp_path / "b"])
+    reloaded = StageManifest(tmp_path / "stages.json")
+    assert reloaded.outputs("render") == [tmp_path / "a", tmp_path / "b"]
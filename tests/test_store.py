@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from species_similarity import store
+from species_similarity.config import SequenceRecord, Species
+
+_RECORDS = [
+    SequenceRecord(Species("Human", "Homo sapiens", 9606), "ACGT"),
+    SequenceRecord(Species("Mouse, house", "Mus musculus", 10090), "ACGA"),
+]
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet", ".arrow"])
+def test_records_round_trip(tmp_path: Path, suffix: str) -> None:
+    if suffix != ".csv":
+        pytest.importorskip("pyarrow")
+    path = tmp_path / f"records{suffix}"
+    assert store.write_records(iter(_RECORDS), path) == 2
+    assert not path.with_name(path.name + ".part").exists()
+    assert store.load_records(path) == _RECORDS
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet", ".arrow"])
+def test_failed_write_leaves_no_partial_file(tmp_path: Path, suffix: str) -> None:
+    if suffix != ".csv":
+        pytest.importorskip("pyarrow")
+
+    def interrupted():
+        yield _RECORDS[0]
+        raise ConnectionError("fetch interrupted")
+
+    path = tmp_path / f"records{suffix}"
+    with pytest.raises(ConnectionError):
+        store.write_records(interrupted(), path)
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet", ".arrow"])
+def test_read_table_projects_columns(tmp_path: Path, suffix: str) -> None:
+    if suffix != ".csv":
+        pytest.importorskip("pyarrow")
+    path = tmp_path / f"table{suffix}"
+    store.write_table(
+        pd.DataFrame({"taxonomy_id": [1, 2], "sequence": ["A", "C"], "x": [0, 0]}),
+        path,
+    )
+    df = store.read_table(path, columns=["sequence", "taxonomy_id"])
+    assert sorted(df.columns) == ["sequence", "taxonomy_id"]
+    assert df["sequence"].tolist() == ["A", "C"]
+
+
+def test_with_format_rejects_unknown(tmp_path: Path) -> None:
+    assert store.with_format(tmp_path / "a.csv", "arrow").name == "a.arrow"
+    with pytest.raises(ValueError):
+        store.with_format(tmp_path / "a.csv", "xlsx")
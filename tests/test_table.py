@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import pytest
+
+from species_similarity.config import SequenceRecord, Species
+from species_similarity.pipeline import build_distance_graph
+from species_similarity.similarity import compute_distances
+from species_similarity.table import SequenceTable
+
+_RECORDS = [
+    SequenceRecord(Species("Human", "Homo sapiens", 9606), "ACGT"),
+    SequenceRecord(Species("Mouse", "Mus musculus", 10090), "ACGA"),
+    SequenceRecord(Species("Zebrafish", "Danio rerio", 7955), "AC"),
+]
+
+
+def test_views_match_records() -> None:
+    table = SequenceTable.from_records(_RECORDS)
+    assert len(table) == 3
+    assert table[1].species.common_name == "Mouse"
+    assert table[-1].sequence == "AC"
+    assert table[2].species.taxonomy_id == 7955
+    assert table.lengths.tolist() == [4, 4, 2]
+    assert table.sequences() == ["ACGT", "ACGA", "AC"]
+    assert table.to_records() == _RECORDS
+    with pytest.raises(IndexError):
+        table[3]
+
+
+def test_existing_callers_accept_views() -> None:
+    table = SequenceTable.from_records(_RECORDS)
+    distances = compute_distances(table)
+    assert [d for _, d in distances] == [0, 1, 2]
+    graph = build_distance_graph(distances)
+    assert graph.edges["Human", "Zebrafish"]["weight"] == 2
+
+
+def test_mismatched_columns_rejected() -> None:
+    with pytest.raises(ValueError):
+        SequenceTable(["a"], ["b"], [1, 2], ["A"])